@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+
+# Scripts de medición de rendimiento. Ejecutar desde la raíz del proyecto:
+#   python -m benchmarks.<nombre_del_script>
@@ -0,0 +1,66 @@
+# benchmarks/bench_batch.py
+#
+# Re-etalonado sin conexión de muchos frames: bucle con apply_custom_pipeline
+# (lo que hacían los trabajos hasta ahora), bucle con run_compiled ya
+# compilado y process_batch (etapas de color apiladas en una sola
+# llamada por bloque y el resto repartido entre hilos).
+#
+#   python -m benchmarks.bench_batch
+
+import time
+import numpy as np
+from processing.batch import process_batch
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import make_frame
+
+REGRADE = [
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.1, "beta": 6}},
+    {"name": "sepia_tint", "params": {"strength": 0.3}},
+    {"name": "adjust_saturation", "params": {"factor": 1.2, "preserve_hue": 0}},
+]
+WITH_BLUR = REGRADE + [{"name": "apply_gaussian_blur", "params": {"ksize": 5}}]
+SIZES = {"240p": (240, 320), "720p": (720, 1280)}
+FRAMES = {"240p": 2000, "720p": 200}
+
+
+def custom_pipeline(processor, pipeline, stack) -> float:
+    start = time.perf_counter()
+    for frame in stack:
+        processor.apply_custom_pipeline(frame, pipeline)
+    return (time.perf_counter() - start) * 1000.0 / len(stack)
+
+
+def per_frame(stages, stack) -> float:
+    start = time.perf_counter()
+    for frame in stack:
+        run_compiled(stages, frame)
+    return (time.perf_counter() - start) * 1000.0 / len(stack)
+
+
+def batched(stages, stack) -> float:
+    start = time.perf_counter()
+    for _ in process_batch(stages, stack):
+        pass
+    return (time.perf_counter() - start) * 1000.0 / len(stack)
+
+
+def main():
+    processor = ImageProcessor()
+    processor.set_stage_cache_budget(0)
+    for pipeline_name, pipeline in (("color", REGRADE), ("color+blur", WITH_BLUR)):
+        stages = compile_pipeline(pipeline)
+        for label, (rows, cols) in SIZES.items():
+            frame = make_frame(rows, cols)
+            stack = np.repeat(frame[None], FRAMES[label], axis=0)
+            custom = custom_pipeline(processor, pipeline, stack)
+            loop, batch = per_frame(stages, stack), batched(stages, stack)
+            print(
+                f"{pipeline_name:>10} {label:>5} x{len(stack)} | apply_custom_pipeline "
+                f"{custom:6.2f} | run_compiled {loop:6.2f} | process_batch "
+                f"{batch:6.2f} ms/frame"
+            )
+
+
+if __name__ == "__main__":
+    main()
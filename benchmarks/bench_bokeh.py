@@ -0,0 +1,39 @@
+# benchmarks/bench_bokeh.py
+#
+# bokeh_effect anterior (copia, círculo nuevo por frame, máscara expandida a 3
+# canales y np.where) frente a la máscara cacheada con borde difuminado, el
+# desenfoque por pirámide y la mezcla en el sitio dentro del ROI.
+#
+#   python -m benchmarks.bench_bokeh
+
+import cv2
+import numpy as np
+from processing.filters import apply_bokeh_effect
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+
+def bokeh_legacy(image, blur_strength=15, center_x=0.5, center_y=0.5, radius=0.2):
+    output_image = image.copy()
+    h, w = output_image.shape[:2]
+    mask = np.zeros((h, w), dtype=np.uint8)
+    center = (int(w * center_x), int(h * center_y))
+    cv2.circle(mask, center, int(min(h, w) * radius), 255, -1)
+    blurred = cv2.GaussianBlur(output_image, (blur_strength, blur_strength), 0)
+    mask = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
+    return np.where(mask == 255, output_image, blurred)
+
+
+def main():
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        for ksize in (9, 15, 31, 49):
+            t_old = time_call(lambda: bokeh_legacy(frame, ksize), repeat=10)
+            t_new = time_call(lambda: apply_bokeh_effect(frame, ksize), repeat=10)
+            print(
+                f"{label:>6} k={ksize:<3} | anterior {t_old:6.1f} ms | "
+                f"nuevo {t_new:6.1f} ms | x{t_old / t_new:4.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
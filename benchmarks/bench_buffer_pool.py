@@ -0,0 +1,64 @@
+# benchmarks/bench_buffer_pool.py
+#
+# Pipeline de cinco etapas con `dst`, con el camino antiguo (frame.copy() y
+# un array nuevo por etapa) frente a ImageProcessor con BufferPool. Se mide
+# el tiempo por frame, las reservas del pool en régimen estacionario y el
+# pico de memoria transitoria por frame (tracemalloc ve las reservas de numpy).
+#
+#   python -m benchmarks.bench_buffer_pool
+
+import tracemalloc
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINE = [
+    {"name": "apply_gaussian_blur", "params": {"ksize": 5}},
+    {"name": "sepia_tint", "params": {"strength": 0.6}},
+    {"name": "apply_median_blur", "params": {"ksize": 5}},
+    {"name": "invert_colors", "params": {}},
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 4}},
+]
+
+
+def peak_mb(func, frames: int = 5) -> float:
+    func()
+    tracemalloc.start()
+    peak = 0
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def main():
+    stages = compile_pipeline(PIPELINE)
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        processor = ImageProcessor()
+        processor.set_pipeline([dict(e, params=dict(e["params"])) for e in PIPELINE])
+
+        def legacy():
+            run_compiled(stages, frame.copy())
+
+        def pooled():
+            processor.release_frame(processor.process_frame(frame))
+
+        t_old = time_call(legacy, repeat=20)
+        t_new = time_call(pooled, repeat=20)
+        warm = processor.buffer_pool.allocations
+        for _ in range(20):
+            pooled()
+        steady = (processor.buffer_pool.allocations - warm) / 20
+        print(
+            f"{label:>6} | copy {t_old:6.1f} ms, {peak_mb(legacy):6.1f} MB/frame"
+            f" | pool {t_new:6.1f} ms, {peak_mb(pooled):6.1f} MB/frame,"
+            f" {steady:.1f} reservas/frame ({warm} en el arranque)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/bench_channel_layout.py
+#
+# Cadena "en gris" (Sobel -> blur -> Laplaciano -> mediana -> brillo) con la
+# disposición de canales histórica (cada etapa devuelve BGR y la siguiente lo
+# vuelve a convertir) frente al seguimiento de disposición de run_compiled,
+# que mantiene el gris de un canal y solo expande a BGR a la salida.
+#
+#   python -m benchmarks.bench_channel_layout
+
+from processing.buffer_pool import BufferPool
+from processing.frame_context import FrameContext
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINE = [
+    {"name": "apply_sobel_edge_detection", "params": {"dx": 1, "dy": 1}},
+    {"name": "apply_gaussian_blur", "params": {"ksize": 5}},
+    {"name": "apply_laplacian_sharpen", "params": {"kernel_size": 3, "scale": 0.5}},
+    {"name": "apply_median_blur", "params": {"ksize": 5}},
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 4}},
+]
+
+
+def run(stages, frame, pool):
+    context = FrameContext(pool.copy_of(frame))
+    return run_compiled(stages, context.image, context, pool)
+
+
+def main():
+    legacy = compile_pipeline(PIPELINE, track_layout=False)
+    tracked = compile_pipeline(PIPELINE)
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        pools = BufferPool(), BufferPool()
+        t_old = time_call(lambda: run(legacy, frame, pools[0]), repeat=20)
+        t_new = time_call(lambda: run(tracked, frame, pools[1]), repeat=20)
+        print(
+            f"{label:>6} | BGR entre etapas {t_old:6.1f} ms"
+            f" | gris hasta la salida {t_new:6.1f} ms | x{t_old / t_new:4.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_dirty_tiles.py
+#
+# Pipeline local (desenfoque, nitidez, sepia, mediana) con una "mano" que se
+# mueve en una esquina del frame: frame entero frente a modo por teselas.
+#
+#   python -m benchmarks.bench_dirty_tiles
+
+import time
+from processing.dirty_tiles import DirtyTileRunner
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame
+
+PIPELINE = [
+    {"name": "apply_gaussian_blur", "params": {"ksize": 9}},
+    {"name": "apply_laplacian_sharpen", "params": {}},
+    {"name": "sepia_tint", "params": {"strength": 0.6}},
+    {"name": "apply_median_blur", "params": {"ksize": 5}},
+]
+FRAMES = 30
+
+
+def moving_hand(frame, count, size):
+    """Frames con un bloque que avanza por la esquina inferior derecha."""
+    rows, cols = frame.shape[:2]
+    frames = []
+    for i in range(count):
+        moved = frame.copy()
+        y, x = rows - size - 2 * i, cols - size - 3 * i
+        moved[y : y + size, x : x + size] = 255 - moved[y : y + size, x : x + size]
+        frames.append(moved)
+    return frames
+
+
+def per_frame_ms(func, frames):
+    func(frames[0])
+    start = time.perf_counter()
+    for frame in frames:
+        func(frame)
+    return (time.perf_counter() - start) * 1000.0 / len(frames)
+
+
+def main():
+    stages = compile_pipeline(PIPELINE)
+    for label in ("720p", "1080p", "4K"):
+        rows, cols = RESOLUTIONS[label]
+        frames = moving_hand(make_frame(rows, cols), FRAMES, rows // 6)
+        full = per_frame_ms(lambda f: run_compiled(stages, f.copy()), frames)
+        runner = DirtyTileRunner()
+        tiled = per_frame_ms(lambda f: runner.run(stages, f), frames)
+        print(
+            f"{label:>6} | entero {full:6.1f} ms | teselas {tiled:6.1f} ms"
+            f" | teselas recalculadas {runner.last_dirty_fraction:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
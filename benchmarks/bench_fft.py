@@ -0,0 +1,42 @@
+# benchmarks/bench_fft.py
+#
+# apply_lowpass_fft anterior (fft2 compleja, fftshift/ifftshift y círculo
+# redibujado en cada frame) frente al motor de processing/frequency_filters.py
+# (DFT real de OpenCV con relleno óptimo y máscara cacheada).
+#
+#   python -m benchmarks.bench_fft
+
+import cv2
+import numpy as np
+from processing.filters import apply_bandpass_fft, apply_lowpass_fft
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+
+def lowpass_fft_legacy(image: np.ndarray, cutoff: float = 0.1) -> np.ndarray:
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    fshift = np.fft.fftshift(np.fft.fft2(gray))
+    rows, cols = gray.shape
+    mask = np.zeros_like(gray, dtype=np.uint8)
+    cv2.circle(mask, (cols // 2, rows // 2), int(min(rows, cols) * cutoff), 1, -1)
+    back = np.abs(np.fft.ifft2(np.fft.ifftshift(fshift * mask)))
+    return cv2.cvtColor(np.clip(back, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+
+def main():
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        repeat = 5 if label == "4K" else 10
+        t_old = time_call(lambda: lowpass_fft_legacy(frame), repeat=repeat)
+        t_new = time_call(lambda: apply_lowpass_fft(frame), repeat=repeat)
+        t_gauss = time_call(lambda: apply_lowpass_fft(frame, profile=1), repeat=repeat)
+        t_color = time_call(lambda: apply_lowpass_fft(frame, per_channel=1), repeat=repeat)
+        t_band = time_call(lambda: apply_bandpass_fft(frame, profile=2), repeat=repeat)
+        print(
+            f"{label:>6} | anterior {t_old:7.1f} ms | real+caché {t_new:6.1f} ms | "
+            f"gauss {t_gauss:6.1f} ms | por canal {t_color:6.1f} ms | "
+            f"banda butterworth {t_band:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
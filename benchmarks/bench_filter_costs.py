@@ -0,0 +1,48 @@
+# benchmarks/bench_filter_costs.py
+#
+# Mide el coste real (ms por megapíxel, 1080p, parámetros por defecto y
+# algunas variantes) de cada filtro registrado y lo compara con el "cost"
+# declarado en FILTER_METADATA. Sirve para recalibrar el modelo de coste en
+# otra máquina: si la columna "ratio" se aleja mucho de 1, hay que ajustarlo.
+#
+#   python -m benchmarks.bench_filter_costs
+
+from processing.filters import (
+    FILTER_METADATA,
+    estimate_filter_cost,
+    get_default_filter_params,
+)
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+VARIANTS = {
+    "apply_gaussian_blur": [{"ksize": 15}, {"ksize": 41}],
+    "apply_median_blur": [{"ksize": 3}, {"ksize": 9, "pyramid_threshold": 0}],
+    "adjust_saturation": [{"preserve_hue": 0}],
+    "bokeh_effect": [{"blur_strength": 5}],
+    "apply_lowpass_fft": [{"per_channel": 1}],
+    "non_local_means_denoising": [{"search_window_size": 11}],
+}
+
+
+def main():
+    shape = RESOLUTIONS["1080p"]
+    frame = make_frame(*shape)
+    megapixels = shape[0] * shape[1] / 1e6
+    print(f"{'filtro':<46} {'declarado':>10} {'medido':>10} {'ratio':>6}  (ms/MP)")
+    for name, info in FILTER_METADATA.items():
+        for overrides in [{}] + VARIANTS.get(name, []):
+            params = get_default_filter_params(name)
+            params.update(overrides)
+            repeat = 2 if name == "non_local_means_denoising" else 10
+            measured = time_call(
+                lambda: info["function"](frame, **params), repeat=repeat, warmup=1
+            )
+            measured /= megapixels
+            declared = estimate_filter_cost(name, params, shape) / megapixels
+            label = name + (f" {overrides}" if overrides else "")
+            ratio = f"{declared / measured:6.2f}" if measured > 0.01 else "     -"
+            print(f"{label:<46} {declared:10.2f} {measured:10.2f} {ratio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/bench_frame_context.py
+#
+# Pipeline + histograma en gris por frame, sin FrameContext (cada etapa y el
+# histograma reconvierten la imagen; el histograma con np.mean) frente a la
+# pipeline con contexto, que reutiliza el gris entre etapas y para el panel.
+#
+#   python -m benchmarks.bench_frame_context
+
+import numpy as np
+from processing.frame_context import FrameContext
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+# Sobel -> Laplaciano: el Laplaciano recibe el gris que dejó Sobel y el
+# histograma el que dejó el Laplaciano (ambas salidas son GRAY2BGR).
+PIPELINE = [
+    {"name": "apply_sobel_edge_detection", "params": {"dx": 1, "dy": 1}},
+    {"name": "apply_laplacian_sharpen", "params": {"kernel_size": 3, "scale": 0.5}},
+]
+
+
+def legacy(stages, frame):
+    processed = run_compiled(stages, frame.copy())
+    if processed.ndim == 3:
+        gray = np.mean(processed, axis=2).astype(np.uint8)
+    else:
+        gray = processed
+    return np.histogram(gray, bins=256, range=(0, 256))
+
+
+def with_context(stages, frame):
+    context = FrameContext(frame.copy())
+    run_compiled(stages, context.image, context)
+    return np.histogram(context.gray(), bins=256, range=(0, 256))
+
+
+def main():
+    stages = compile_pipeline(PIPELINE)
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        t_old = time_call(lambda: legacy(stages, frame), repeat=20)
+        t_new = time_call(lambda: with_context(stages, frame), repeat=20)
+        print(f"{label:>6} | sin contexto {t_old:6.1f} ms | con contexto {t_new:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_logging.py
+#
+# Coste de los mensajes en las rutas calientes: un print por frame o por
+# movimiento de slider (lo de antes) frente al registro con límite por clave
+# y formato perezoso de config/logging_config.py. Los print van a la salida
+# real: ejecutar con la consola a la vista para medir lo que cuesta de verdad.
+#
+#   python -m benchmarks.bench_logging
+
+import sys
+from config.logging_config import get_logger
+from processing.image_processor import ImageProcessor
+from benchmarks.common import time_call
+
+PIPELINE = [
+    {"name": "apply_median_blur", "params": {"ksize": 5}},
+    {"name": "sepia_tint", "params": {"strength": 0.6}},
+    {"name": "adjust_saturation", "params": {"factor": 1.3}},
+    {"name": "apply_laplacian_sharpen", "params": {}},
+]
+CALLS = 200
+
+log = get_logger("Bench")
+
+
+def per_frame_error(use_print: bool):
+    error = RuntimeError("ksize fuera de rango")
+    for _ in range(CALLS):
+        if use_print:
+            print(f"[❌] Error en filtro 'apply_median_blur': {error}")
+        else:
+            log.error(
+                "Error en filtro '%s': %s",
+                "apply_median_blur",
+                error,
+                extra={"key": "apply_median_blur"},
+            )
+
+
+def main():
+    processor = ImageProcessor()
+    config = [dict(e, params=dict(e["params"])) for e in PIPELINE]
+
+    def slider_tick(use_print):
+        processor.set_pipeline(config)
+        if use_print:
+            print(f"[✓] Pipeline configurado: {processor.pipeline}")
+
+    results = {
+        "set_pipeline + print": time_call(lambda: slider_tick(True), repeat=50),
+        "set_pipeline + log": time_call(lambda: slider_tick(False), repeat=50),
+        f"{CALLS} errores con print": time_call(lambda: per_frame_error(True), 10),
+        f"{CALLS} errores con log": time_call(lambda: per_frame_error(False), 10),
+    }
+    sys.stdout.flush()
+    for label, ms in results.items():
+        print(f"{label:>26} | {ms:8.3f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/bench_lut3d.py
+#
+# Cadena de filtros de color ejecutada filtro a filtro frente a la misma
+# cadena horneada en una LUT 3D. Muestra también el coste de horneado y el
+# error frente a la cadena exacta.
+#
+#   python -m benchmarks.bench_lut3d
+
+import time
+import numpy as np
+from processing.pipeline_compiler import _baked_table, compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINE = [
+    {"name": "sepia_tint", "params": {"strength": 0.6}},
+    {"name": "adjust_saturation", "params": {"factor": 1.4}},
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.1, "beta": 5}},
+]
+
+
+def main():
+    exact = compile_pipeline(PIPELINE)
+    for size in (17, 33, 65):
+        _baked_table.cache_clear()
+        start = time.perf_counter()
+        baked = compile_pipeline(PIPELINE, bake_luts=True, lut_size=size)
+        bake_ms = (time.perf_counter() - start) * 1000.0
+        print(f"LUT {size}: horneado {bake_ms:.1f} ms")
+        for label in ("720p", "1080p"):
+            frame = make_frame(*RESOLUTIONS[label])
+            t_exact = time_call(lambda: run_compiled(exact, frame), repeat=10)
+            t_baked = time_call(lambda: run_compiled(baked, frame), repeat=10)
+            diff = np.abs(
+                run_compiled(baked, frame).astype(np.int16)
+                - run_compiled(exact, frame).astype(np.int16)
+            )
+            print(
+                f"  {label:>6} | exacto {t_exact:7.2f} ms | LUT 3D {t_baked:7.2f} ms | "
+                f"x{t_exact / t_baked:4.1f} | error medio {diff.mean():.2f}, "
+                f"p99 {np.percentile(diff, 99):.0f}, máx {diff.max()}"
+            )
+
+
+if __name__ == "__main__":
+    main()
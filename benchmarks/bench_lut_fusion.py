@@ -0,0 +1,47 @@
+# benchmarks/bench_lut_fusion.py
+#
+# Compara rachas de filtros puntuales ejecutadas etapa a etapa frente a la
+# versión fusionada por el compilador (una sola pasada: convertScaleAbs si la
+# composición es afín exacta, cv2.LUT en caso contrario).
+#
+#   python -m benchmarks.bench_lut_fusion
+
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINES = {
+    "invert + brillo/contraste": [
+        {"name": "invert_colors", "params": {}},
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 1.5, "beta": 30}},
+    ],
+    "contraste + invert + brillo": [
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 2.0, "beta": 0}},
+        {"name": "invert_colors", "params": {}},
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 0.7, "beta": 9}},
+    ],
+    "4 etapas puntuales": [
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 10}},
+        {"name": "invert_colors", "params": {}},
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 0.9, "beta": -5}},
+        {"name": "invert_colors", "params": {}},
+    ],
+}
+
+
+def main():
+    for label in ("1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        for name, pipeline in PIPELINES.items():
+            plain = compile_pipeline(pipeline, fuse=False)
+            fused = compile_pipeline(pipeline)
+            t_plain = time_call(lambda: run_compiled(plain, frame), repeat=40)
+            t_fused = time_call(lambda: run_compiled(fused, frame), repeat=40)
+            kind = fused[0].name.split("(")[0]
+            print(
+                f"{label:>6} | {name:<28} | por etapa {t_plain:7.2f} ms | "
+                f"{kind:<13} {t_fused:7.2f} ms | x{t_plain / t_fused:4.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
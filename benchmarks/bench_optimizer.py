@@ -0,0 +1,47 @@
+# benchmarks/bench_optimizer.py
+#
+# Pipeline con trabajo inútil típico de presets y del generador LLM (brillo
+# neutro, sepia a 0, saturación a 1, gris repetido, color antes de Canny),
+# compilada sin optimizar frente a optimizada (tolerancia 0 y la de vivo).
+#
+#   python -m benchmarks.bench_optimizer
+
+from processing.image_processor import LIVE_OPTIMIZER_TOLERANCE
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINE = [
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.0, "beta": 0}},
+    {"name": "adjust_saturation", "params": {"factor": 1.0}},
+    {"name": "sepia_tint", "params": {"strength": 0.0}},
+    {"name": "apply_gaussian_blur", "params": {"ksize": 5}},
+    {"name": "convert_to_grayscale", "params": {}},
+    {"name": "convert_to_grayscale", "params": {}},
+    {"name": "apply_canny_edge_detection", "params": {}},
+]
+
+
+def main():
+    variants = {
+        "sin optimizar": None,
+        "tol 0": 0,
+        f"tol {LIVE_OPTIMIZER_TOLERANCE}": LIVE_OPTIMIZER_TOLERANCE,
+    }
+    for tolerance in variants.values():
+        explain = []
+        stages = compile_pipeline(PIPELINE, tolerance=tolerance, explain=explain)
+        print(f"tolerancia {tolerance}: {[s.name for s in stages]}")
+        for step in explain:
+            print(f"    {step.explain()}")
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        times = []
+        for tolerance in variants.values():
+            stages = compile_pipeline(PIPELINE, tolerance=tolerance)
+            times.append(time_call(lambda: run_compiled(stages, frame.copy())))
+        row = " | ".join(f"{name} {t:6.1f} ms" for name, t in zip(variants, times))
+        print(f"{label:>6} | {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/bench_parallel_strips.py
+#
+# Escalado del modo por franjas con 1, 2, 4 y 8 hilos. OpenCV se limita a un
+# hilo para que solo cuente nuestro reparto (en el modo normal OpenCV ya
+# paraleliza algunas funciones por su cuenta). Los resultados dependen de los
+# núcleos del equipo: con menos núcleos que hilos no hay mejora.
+#
+#   python -m benchmarks.bench_parallel_strips
+
+import os
+import cv2
+from processing.parallel_strips import StripRunner
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINE = [
+    {"name": "apply_gaussian_blur", "params": {"ksize": 7}},
+    {"name": "apply_laplacian_sharpen", "params": {}},
+    {"name": "sepia_tint", "params": {"strength": 0.6}},
+    {"name": "apply_sobel_edge_detection", "params": {"ksize": 3}},
+]
+WORKERS = (1, 2, 4, 8)
+
+
+def main():
+    print(f"núcleos disponibles: {os.cpu_count()}")
+    stages = compile_pipeline(PIPELINE)
+    opencv_threads = cv2.getNumThreads()
+    cv2.setNumThreads(1)
+    try:
+        for label in ("720p", "1080p", "4K"):
+            frame = make_frame(*RESOLUTIONS[label])
+            base = time_call(lambda: run_compiled(stages, frame.copy()), repeat=10)
+            cells = []
+            for workers in WORKERS:
+                runner = StripRunner(workers)
+                elapsed = time_call(lambda: runner.run(stages, frame), repeat=10)
+                runner.shutdown()
+                cells.append(f"{workers} hilos {elapsed:6.1f} ms (x{base / elapsed:.1f})")
+            print(f"{label:>6} | una pasada {base:6.1f} ms | " + " | ".join(cells))
+    finally:
+        cv2.setNumThreads(opencv_threads)
+
+
+if __name__ == "__main__":
+    main()
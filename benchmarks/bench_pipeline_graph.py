@@ -0,0 +1,49 @@
+# benchmarks/bench_pipeline_graph.py
+#
+# Dos variantes de un mismo ajuste (prefijo común de desenfoque y contraste,
+# y luego invertir o pasar a gris): dos pipelines lineales por separado
+# frente a un grafo con las dos salidas, en secuencia y con ramas en hilos.
+#
+#   python -m benchmarks.bench_pipeline_graph
+
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.pipeline_graph import GraphRunner, compile_graph, run_graph
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PREFIX = [
+    {"name": "apply_gaussian_blur", "params": {"ksize": 9}},
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 5}},
+]
+VARIANTS = {
+    "a": {"name": "invert_colors", "params": {}},
+    "b": {"name": "apply_canny_edge_detection", "params": {}},
+}
+
+
+def graph_config():
+    nodes = [dict(PREFIX[0], id="blur", inputs=["input"])]
+    nodes.append(dict(PREFIX[1], id="contrast", inputs=["blur"]))
+    for name, variant in VARIANTS.items():
+        nodes.append(dict(variant, id=name, inputs=["contrast"]))
+    return {"nodes": nodes, "output": list(VARIANTS)}
+
+
+def main():
+    linear = [compile_pipeline(PREFIX + [v]) for v in VARIANTS.values()]
+    graph = compile_graph(graph_config())
+    runner = GraphRunner()
+    print(f"hilos del GraphRunner: {runner.workers}")
+    for label, (rows, cols) in RESOLUTIONS.items():
+        frame = make_frame(rows, cols)
+        separate = time_call(lambda: [run_compiled(s, frame) for s in linear])
+        shared = time_call(lambda: run_graph(graph, frame))
+        threaded = time_call(lambda: runner.run(graph, frame))
+        print(
+            f"{label:>6} | 2 lineales {separate:7.2f} | grafo {shared:7.2f} | "
+            f"grafo en hilos {threaded:7.2f} ms"
+        )
+    runner.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_process_pipeline.py
+#
+# Rendimiento (frames/s) de una pipeline pesada en un solo hilo frente a la
+# cadena de procesos por tramos con 2 y 3 procesos. Solo mejora con tantos
+# núcleos libres como tramos; la copia a/desde memoria compartida va incluida.
+#
+#   python -m benchmarks.bench_process_pipeline
+
+import os
+import time
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.process_pipeline import ProcessPipeline
+from benchmarks.common import RESOLUTIONS, make_frame
+
+PIPELINE = [
+    {"name": "apply_median_blur", "params": {"ksize": 5}},
+    {"name": "apply_laplacian_sharpen", "params": {}},
+    {"name": "adjust_saturation", "params": {"factor": 1.4}},
+    {"name": "apply_lowpass_fft", "params": {}},
+]
+FRAMES = 40
+
+
+def single_process_fps(frame) -> float:
+    stages = compile_pipeline(PIPELINE, live=True)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        run_compiled(stages, frame.copy())
+    return FRAMES / (time.perf_counter() - start)
+
+
+def process_pipeline_fps(frame, groups: int) -> float:
+    with ProcessPipeline(PIPELINE, groups=groups) as pipeline:
+        # Arranque de los procesos fuera de la medida.
+        while pipeline.submit(frame) is None or not pipeline.results(timeout=0.5):
+            pass
+        start, sent, done = time.perf_counter(), 0, 0
+        while done < FRAMES:
+            if sent < FRAMES and pipeline.submit(frame) is not None:
+                sent += 1
+            done += len(pipeline.results(timeout=0.001))
+        return FRAMES / (time.perf_counter() - start)
+
+
+def main():
+    print(f"núcleos disponibles: {os.cpu_count()}")
+    for label in ("720p", "1080p"):
+        frame = make_frame(*RESOLUTIONS[label])
+        cells = [f"1 hilo {single_process_fps(frame):5.1f} fps"]
+        for groups in (2, 3):
+            fps = process_pipeline_fps(frame, groups)
+            cells.append(f"{groups} procesos {fps:5.1f} fps")
+        print(f"{label:>6} | " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_pyramid_blur.py
+#
+# Coste y error de la aproximación por pirámide (pyrDown -> kernel equivalente
+# más pequeño -> pyrUp) frente a cv2.GaussianBlur / cv2.medianBlur exactos.
+# El error se da en niveles de gris (0-255) sobre el frame sintético de
+# benchmarks/common.py: media y percentil 99 de |aprox - exacto|.
+#
+# Para la mediana se mide además el caso para el que existe, ruido impulsivo
+# (10 % de sal y pimienta): error medio y máximo frente a la mediana exacta
+# de la imagen limpia. La reducción de la mediana (mediana 3x3 + un píxel de
+# cada 2x2) no reparte los impulsos como haría pyrDown.
+#
+#   python -m benchmarks.bench_pyramid_blur
+
+import cv2
+import numpy as np
+from processing.filters import apply_gaussian_blur, apply_median_blur
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+
+def report(label, name, ksize, exact_fn, approx_fn):
+    t_exact = time_call(exact_fn, repeat=5)
+    t_approx = time_call(approx_fn, repeat=5)
+    error = np.abs(approx_fn().astype(np.int16) - exact_fn())
+    print(
+        f"{label:>6} {name:>8} k={ksize:<3} | exacto {t_exact:7.1f} ms | "
+        f"pirámide {t_approx:6.1f} ms | error medio {error.mean():4.2f} "
+        f"p99 {np.percentile(error, 99):5.1f}"
+    )
+
+
+def salt_and_pepper(frame, amount=0.1, seed=1):
+    rng = np.random.default_rng(seed)
+    mask = rng.random(frame.shape[:2])
+    noisy = frame.copy()
+    noisy[mask < amount / 2] = 0
+    noisy[mask > 1 - amount / 2] = 255
+    return noisy
+
+
+def report_impulse(label, ksize, frame):
+    noisy = salt_and_pepper(frame)
+    clean = cv2.medianBlur(frame, ksize).astype(np.int16)
+    exact = np.abs(cv2.medianBlur(noisy, ksize) - clean)
+    approx = np.abs(apply_median_blur(noisy, ksize, pyramid_threshold=1) - clean)
+    print(
+        f"{label:>6} s&p 10% k={ksize:<3} | exacto medio {exact.mean():4.2f} "
+        f"máx {exact.max():3d} | pirámide medio {approx.mean():4.2f} "
+        f"máx {approx.max():3d}"
+    )
+
+
+def main():
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        for k in (21, 31, 51, 99):
+            report(
+                label,
+                "gauss",
+                k,
+                lambda: cv2.GaussianBlur(frame, (k, k), 0),
+                lambda: apply_gaussian_blur(frame, k, pyramid_threshold=1),
+            )
+        for k in (7, 15, 31):
+            report(
+                label,
+                "mediana",
+                k,
+                lambda: cv2.medianBlur(frame, k),
+                lambda: apply_median_blur(frame, k, pyramid_threshold=1),
+            )
+            report_impulse(label, k, frame)
+
+
+if __name__ == "__main__":
+    main()
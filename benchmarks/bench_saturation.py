@@ -0,0 +1,38 @@
+# benchmarks/bench_saturation.py
+#
+# adjust_saturation: versión anterior (split/merge y multiplicación en
+# float64) frente a la LUT sobre el canal S y la matriz BGR sin ida y vuelta
+# a HSV.
+#
+#   python -m benchmarks.bench_saturation
+
+import cv2
+import numpy as np
+from processing.filters import adjust_saturation
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+
+def adjust_saturation_split_merge(image: np.ndarray, factor: float) -> np.ndarray:
+    h, s, v = cv2.split(cv2.cvtColor(image, cv2.COLOR_BGR2HSV))
+    s = np.clip(s * factor, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(cv2.merge([h, s, v]), cv2.COLOR_HSV2BGR)
+
+
+def main():
+    factor = 1.5
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        t_old = time_call(lambda: adjust_saturation_split_merge(frame, factor), repeat=10)
+        t_lut = time_call(lambda: adjust_saturation(frame, factor), repeat=10)
+        t_mat = time_call(lambda: adjust_saturation(frame, factor, preserve_hue=0), repeat=10)
+        exact = np.array_equal(
+            adjust_saturation(frame, factor), adjust_saturation_split_merge(frame, factor)
+        )
+        print(
+            f"{label:>6} | split/merge {t_old:7.2f} ms | LUT S {t_lut:7.2f} ms "
+            f"(idéntico: {exact}) | matriz BGR {t_mat:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
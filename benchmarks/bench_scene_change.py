@@ -0,0 +1,55 @@
+# benchmarks/bench_scene_change.py
+#
+# Cámara apuntando a una escena quieta (ruido de sensor): procesar todos los
+# frames frente a saltar los que no cambian. También el coste del detector.
+#
+#   python -m benchmarks.bench_scene_change
+
+import time
+import numpy as np
+from processing.image_processor import ImageProcessor
+from processing.scene_change import StaticSceneDetector
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINE = [
+    {"name": "apply_median_blur", "params": {"ksize": 5}},
+    {"name": "sepia_tint", "params": {"strength": 0.6}},
+    {"name": "apply_laplacian_sharpen", "params": {}},
+]
+FRAMES = 60
+
+
+def noisy_sequence(frame, count):
+    rng = np.random.default_rng(0)
+    base = frame.astype(np.int16)
+    return [
+        np.clip(base + rng.integers(-6, 7, frame.shape), 0, 255).astype(np.uint8)
+        for _ in range(count)
+    ]
+
+
+def run(processor, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        processor.process_frame_context(frame)
+    return (time.perf_counter() - start) * 1000.0 / len(frames)
+
+
+def main():
+    for label in ("720p", "1080p", "4K"):
+        frames = noisy_sequence(make_frame(*RESOLUTIONS[label]), FRAMES)
+        detect = time_call(lambda: StaticSceneDetector().should_skip(frames[0]))
+        times = []
+        for skip in (False, True):
+            processor = ImageProcessor()
+            processor.set_pipeline([dict(e) for e in PIPELINE])
+            processor.set_static_frame_skipping(skip)
+            times.append(run(processor, frames))
+        print(
+            f"{label:>6} | todos {times[0]:6.1f} ms/frame | con salto {times[1]:6.1f}"
+            f" ms/frame | detector {detect:4.1f} ms | {processor.scene_detector.summary()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
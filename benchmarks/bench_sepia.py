@@ -0,0 +1,41 @@
+# benchmarks/bench_sepia.py
+#
+# sepia_tint en punto fijo sobre uint8 frente a la implementación anterior en
+# float32 (conversión, /255, transform, clip, *255, cast).
+#
+#   python -m benchmarks.bench_sepia
+
+import cv2
+import numpy as np
+from processing.filters import _SEPIA_MATRIX, sepia_tint
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+
+def sepia_tint_float(image: np.ndarray, strength: float = 0.8) -> np.ndarray:
+    """Implementación anterior, como referencia."""
+    final_matrix = (1.0 - strength) * np.eye(3).T + strength * _SEPIA_MATRIX
+    image_float = image.astype(np.float32) / 255.0
+    tinted_image = cv2.transform(image_float, final_matrix)
+    tinted_image = np.clip(tinted_image, 0.0, 1.0) * 255.0
+    return tinted_image.astype(np.uint8)
+
+
+def main():
+    for label in ("720p", "1080p", "4K"):
+        frame = make_frame(*RESOLUTIONS[label])
+        for strength in (0.3, 0.8, 1.0):
+            t_float = time_call(lambda: sepia_tint_float(frame, strength), repeat=10)
+            t_fixed = time_call(lambda: sepia_tint(frame, strength), repeat=10)
+            diff = np.abs(
+                sepia_tint(frame, strength).astype(np.int16)
+                - sepia_tint_float(frame, strength).astype(np.int16)
+            )
+            print(
+                f"{label:>6} | strength {strength:.1f} | float {t_float:7.2f} ms | "
+                f"uint8 {t_fixed:6.2f} ms | x{t_float / t_fixed:5.1f} | "
+                f"máx ±{diff.max()} LSB, {100 * np.count_nonzero(diff) / diff.size:.1f}% distintos"
+            )
+
+
+if __name__ == "__main__":
+    main()
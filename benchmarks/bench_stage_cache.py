@@ -0,0 +1,44 @@
+# benchmarks/bench_stage_cache.py
+#
+# Ajuste de la última etapa de una pipeline cara sobre una imagen fija (cámara
+# en pausa): recalcular todo frente a reutilizar el prefijo de la caché.
+#
+#   python -m benchmarks.bench_stage_cache
+
+import copy
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.stage_cache import StageCache, prefix_keys, run_incremental
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+PIPELINE = [
+    {"name": "non_local_means_denoising", "params": {"h": 10}},
+    {"name": "bokeh_effect", "params": {"blur_strength": 15}},
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 0}},
+]
+
+
+def main():
+    for label in ("720p", "1080p"):
+        frame = make_frame(*RESOLUTIONS[label])
+        cache = StageCache()
+        tuned = copy.deepcopy(PIPELINE)
+        state = {"alpha": 1.0}
+
+        def tweak_last():
+            state["alpha"] += 0.01
+            tuned[-1]["params"]["alpha"] = state["alpha"]
+            stages = compile_pipeline(tuned)
+            return run_incremental(stages, prefix_keys(stages), frame, cache, "still")
+
+        stages = compile_pipeline(PIPELINE)
+        full = time_call(lambda: run_compiled(stages, frame.copy()), repeat=3)
+        tweak_last()  # llena la caché con el prefijo
+        incremental = time_call(tweak_last)
+        print(
+            f"{label:>6} | completa {full:7.1f} ms | incremental {incremental:6.1f} ms"
+            f" | caché {cache.nbytes / 2**20:5.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+# benchmarks/bench_temporal_denoise.py
+#
+# Coste por frame de non_local_means_denoising en la pipeline en vivo: NLM
+# completo en cada frame frente al modo temporal (refresco NLM en segundo
+# plano + media temporal compensada en movimiento entre refrescos).
+#
+#   python -m benchmarks.bench_temporal_denoise
+
+import time
+import numpy as np
+from processing.filters import apply_denoising_nlm
+from processing.temporal_denoise import TemporalDenoiser
+from benchmarks.common import RESOLUTIONS, make_frame, time_call
+
+
+def main():
+    for label in ("720p", "1080p"):
+        frames = [make_frame(*RESOLUTIONS[label], seed=i) for i in range(8)]
+        # Movimiento de cámara de 2 px/frame para que se use el flujo óptico.
+        frames = [np.roll(f, 2 * i, axis=1) for i, f in enumerate(frames)]
+        t_full = time_call(lambda: apply_denoising_nlm(frames[0]), repeat=1, warmup=0)
+
+        denoiser = TemporalDenoiser(apply_denoising_nlm)
+        samples = []
+        for i in range(60):
+            start = time.perf_counter()
+            denoiser(frames[i % len(frames)], refresh_interval=15)
+            samples.append((time.perf_counter() - start) * 1000.0)
+        denoiser.wait()
+        print(
+            f"{label:>6} | NLM por frame {t_full:7.1f} ms | tiempo real: mediana "
+            f"{np.median(samples):5.1f} ms, máx {max(samples):5.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# benchmarks/common.py
+
+import time
+from typing import Callable, Dict, Tuple
+import numpy as np
+
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "720p": (720, 1280),
+    "1080p": (1080, 1920),
+    "4K": (2160, 3840),
+}
+
+
+def make_frame(height: int, width: int, seed: int = 0) -> np.ndarray:
+    """Frame BGR sintético con gradientes y ruido (más realista que un color plano)."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[..., 0] = (xx * 255 // max(width - 1, 1)).astype(np.uint8)
+    frame[..., 1] = (yy * 255 // max(height - 1, 1)).astype(np.uint8)
+    frame[..., 2] = ((xx + yy) % 256).astype(np.uint8)
+    noise = rng.integers(-12, 13, size=frame.shape, dtype=np.int16)
+    return np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def time_call(func: Callable[[], object], repeat: int = 20, warmup: int = 2) -> float:
+    """Devuelve la mediana en milisegundos de `repeat` ejecuciones de func()."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(samples))
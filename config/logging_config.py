@@ -0,0 +1,181 @@
+# config/logging_config.py
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Hashable, Optional
+
+# Registro compartido por processing, llm, video_capture y config. Sustituye a
+# los print de las rutas calientes: los mensajes se formatean solo si se van a
+# mostrar (log.info("... %s", valor)). Los avisos y errores, y cualquier
+# mensaje con extra={"key": ...} (las llamadas por frame), se limitan a
+# RATE_LIMIT_BURST apariciones por clave cada RATE_LIMIT_INTERVAL segundos; el
+# resto se cuenta y se resume en el siguiente mensaje con esa clave que sí se
+# muestra. Los INFO/DEBUG sin clave (acciones puntuales) pasan siempre.
+
+ROOT_LOGGER = "pdi"
+# Nivel por defecto (DEBUG, INFO, WARNING, ERROR), p. ej. PDI_LOG_LEVEL=DEBUG.
+LOG_LEVEL_ENV = "PDI_LOG_LEVEL"
+RATE_LIMIT_INTERVAL = 10.0
+RATE_LIMIT_BURST = 3
+
+
+class RateLimiter:
+    """
+    Deja pasar como mucho `burst` mensajes por clave cada `interval`
+    segundos. La clave es extra={"key": ...} si se da, o el logger y la
+    plantilla del mensaje (sin formatear): "Error en filtro %s" con distintos
+    argumentos cuenta como el mismo mensaje.
+
+    suppressed acumula, por clave, cuántos mensajes se han descartado.
+    """
+
+    def __init__(
+        self,
+        interval: float = RATE_LIMIT_INTERVAL,
+        burst: int = RATE_LIMIT_BURST,
+        clock=time.monotonic,
+    ):
+        self.interval = interval
+        self.burst = burst
+        self.clock = clock
+        self.suppressed: Counter = Counter()
+        # clave -> [inicio de la ventana, mostrados en ella, suprimidos sin avisar]
+        self._windows: Dict[Hashable, list] = {}
+        self._lock = threading.Lock()
+
+    def admit(self, key: Hashable) -> Optional[int]:
+        """
+        None si el mensaje se descarta; si pasa, cuántos de su clave se
+        descartaron desde el último que pasó (para avisarlo con él).
+        """
+        now = self.clock()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                self._windows[key] = [now, 1, 0]
+                return window[2] if window else 0
+            if window[1] < self.burst:
+                window[1] += 1
+                return 0
+            window[2] += 1
+            self.suppressed[key] += 1
+            return None
+
+    def reset(self):
+        with self._lock:
+            self._windows.clear()
+            self.suppressed.clear()
+
+
+class RateLimitedLogger(logging.LoggerAdapter):
+    """
+    Logger con límite por clave para avisos, errores y mensajes con
+    extra={"key": ...}. Se decide antes de crear el LogRecord: un mensaje
+    descartado cuesta una consulta al diccionario, no un registro.
+    """
+
+    def __init__(self, logger: logging.Logger, limiter: RateLimiter):
+        super().__init__(logger, None)
+        self.limiter = limiter
+
+    def log(self, level, msg, *args, **kwargs):
+        if not self.logger.isEnabledFor(level):
+            return
+        extra = kwargs.get("extra") or {}
+        key = extra.get("key")
+        if key is None:
+            if level < logging.WARNING:
+                self.logger.log(level, msg, *args, **kwargs)
+                return
+            key = (self.logger.name, msg)
+        suppressed = self.limiter.admit(key)
+        if suppressed is None:
+            return
+        kwargs["extra"] = dict(extra, suppressed=suppressed)
+        self.logger.log(level, msg, *args, **kwargs)
+
+
+class _ConsoleFormatter(logging.Formatter):
+    """Mismo aspecto que los print de antes: "[⚠️] ...", "[ImageProcessor] ..."."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if record.levelno >= logging.ERROR:
+            tag = "❌"
+        elif record.levelno >= logging.WARNING:
+            tag = "⚠️"
+        else:
+            tag = record.name.rpartition(".")[2]
+        text = f"[{tag}] {record.getMessage()}"
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" (+{suppressed} repeticiones suprimidas)"
+        if record.exc_info:
+            text += "\n" + self.formatException(record.exc_info)
+        return text
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """Escribe en el sys.stdout de cada momento, como print."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_rate_limit: Optional[RateLimiter] = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging(
+    level=None, interval: float = None, burst: int = None
+) -> logging.Logger:
+    """
+    Prepara el logger raíz del proyecto (una vez) y ajusta nivel y límites.
+    level acepta un número o un nombre; por defecto, PDI_LOG_LEVEL o INFO.
+    """
+    global _rate_limit
+    root = logging.getLogger(ROOT_LOGGER)
+    with _configure_lock:
+        if _rate_limit is None:
+            _rate_limit = RateLimiter()
+            handler = _ConsoleHandler()
+            handler.setFormatter(_ConsoleFormatter())
+            root.addHandler(handler)
+            root.propagate = False
+            if level is None:
+                level = os.environ.get(LOG_LEVEL_ENV, "INFO")
+        if level is not None:
+            root.setLevel(level.upper() if isinstance(level, str) else level)
+        if interval is not None:
+            _rate_limit.interval = float(interval)
+        if burst is not None:
+            _rate_limit.burst = int(burst)
+    return root
+
+
+def get_logger(name: str) -> RateLimitedLogger:
+    """Logger del componente `name` (la etiqueta que se muestra entre corchetes)."""
+    configure_logging()
+    return RateLimitedLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"), _rate_limit)
+
+
+def suppressed_counts() -> Dict[Hashable, int]:
+    """Registros descartados por el límite, por clave de mensaje."""
+    return dict(_rate_limit.suppressed) if _rate_limit is not None else {}
+
+
+def suppressed_summary() -> str:
+    counts = suppressed_counts()
+    total = sum(counts.values())
+    return f"{total} mensajes repetidos suprimidos ({len(counts)} claves)"
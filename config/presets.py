@@ -3,11 +3,13 @@
 import os
 import json
 from typing import List, Dict, Any, Optional
-from PyQt6.QtWidgets import QFileDialog
+from config.logging_config import get_logger
 
 # Define the default path for the presets file
 PRESETS_FILE = "config/presets.json"
 
+log = get_logger("Presets")
+
 
 def load_presets(file_path: str = PRESETS_FILE) -> Dict[str, List[Dict[str, Any]]]:
     """
@@ -26,21 +28,25 @@ def load_presets(file_path: str = PRESETS_FILE) -> Dict[str, List[Dict[str, Any]
             presets_data = json.load(f)
             # Basic validation: ensure it's a dictionary
             if not isinstance(presets_data, dict):
-                print(
-                    f"Warning: Presets file '{file_path}' does not contain a valid dictionary. Returning empty presets."
+                log.warning(
+                    "Presets file '%s' does not contain a valid dictionary. "
+                    "Returning empty presets.",
+                    file_path,
                 )
                 return {}
             return presets_data
     except FileNotFoundError:
-        print(f"Presets file '{file_path}' not found. Returning empty presets.")
+        log.info("Presets file '%s' not found. Returning empty presets.", file_path)
         return {}
     except json.JSONDecodeError:
-        print(
-            f"Error decoding JSON from '{file_path}'. Check file format. Returning empty presets."
+        log.error(
+            "Error decoding JSON from '%s'. Check file format. "
+            "Returning empty presets.",
+            file_path,
         )
         return {}
     except Exception as e:
-        print(f"An unexpected error occurred while loading presets: {e}")
+        log.error("An unexpected error occurred while loading presets: %s", e)
         return {}
 
 
@@ -58,9 +64,9 @@ def save_presets(
     try:
         with open(file_path, "w", encoding="utf-8") as f:
             json.dump(presets, f, indent=4, ensure_ascii=False)
-        print(f"Presets successfully saved to '{file_path}'.")
+        log.info("Presets successfully saved to '%s'.", file_path)
     except Exception as e:
-        print(f"Error saving presets to '{file_path}': {e}")
+        log.error("Error saving presets to '%s': %s", file_path, e)
 
 
 def add_preset(
@@ -79,7 +85,7 @@ def add_preset(
     presets = load_presets(file_path)
     presets[preset_name] = filter_pipeline
     save_presets(presets, file_path)
-    print(f"Preset '{preset_name}' added/updated.")
+    log.info("Preset '%s' added/updated.", preset_name)
 
 
 def rename_preset(old_name: str, new_name: str, file_path: str = PRESETS_FILE):
@@ -94,15 +100,15 @@ def rename_preset(old_name: str, new_name: str, file_path: str = PRESETS_FILE):
     presets = load_presets(file_path)
 
     if old_name not in presets:
-        print(f"Preset '{old_name}' not found. Cannot rename.")
+        log.warning("Preset '%s' not found. Cannot rename.", old_name)
         return
 
     if new_name in presets:
-        print(f"Preset '{new_name}' already exists. Overwriting.")
+        log.warning("Preset '%s' already exists. Overwriting.", new_name)
 
     presets[new_name] = presets.pop(old_name)
     save_presets(presets, file_path)
-    print(f"Preset renamed from '{old_name}' to '{new_name}'.")
+    log.info("Preset renamed from '%s' to '%s'.", old_name, new_name)
 
 
 def remove_preset(preset_name: str, file_path: str = PRESETS_FILE):
@@ -117,9 +123,9 @@ def remove_preset(preset_name: str, file_path: str = PRESETS_FILE):
     if preset_name in presets:
         del presets[preset_name]
         save_presets(presets, file_path)
-        print(f"Preset '{preset_name}' removed.")
+        log.info("Preset '%s' removed.", preset_name)
     else:
-        print(f"Preset '{preset_name}' not found.")
+        log.warning("Preset '%s' not found.", preset_name)
 
 
 def export_preset_to_json(
@@ -135,16 +141,16 @@ def export_preset_to_json(
     """
     presets = load_presets(file_path)
     if preset_name not in presets:
-        print(f"Preset '{preset_name}' no encontrado.")
+        log.warning("Preset '%s' no encontrado.", preset_name)
         return
 
     export_path = export_path or f"{preset_name}.json"
     try:
         with open(export_path, "w", encoding="utf-8") as f:
             json.dump(presets[preset_name], f, indent=4, ensure_ascii=False)
-        print(f"Preset '{preset_name}' exportado a '{export_path}'.")
+        log.info("Preset '%s' exportado a '%s'.", preset_name, export_path)
     except Exception as e:
-        print(f"Error al exportar preset: {e}")
+        log.error("Error al exportar preset: %s", e)
 
 
 def import_preset_from_json(
@@ -161,6 +167,9 @@ def import_preset_from_json(
         str | None: Nombre del preset importado si fue exitoso, None en caso contrario.
     """
     if not file_path:
+        # Import local: el resto del módulo se usa también sin interfaz gráfica.
+        from PyQt6.QtWidgets import QFileDialog
+
         file_path, _ = QFileDialog.getOpenFileName(
             None,
             "Seleccionar archivo de preset",
@@ -168,15 +177,15 @@ def import_preset_from_json(
             "Archivos JSON (*.json);;Todos los archivos (*)",
         )
         if not file_path:
-            print("Importación cancelada por el usuario.")
+            log.info("Importación cancelada por el usuario.")
             return None
 
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             preset_data = json.load(f)
         if not isinstance(preset_data, list):
-            print(
-                "⚠️ El archivo no contiene una pipeline válida (se esperaba una lista)."
+            log.warning(
+                "El archivo no contiene una pipeline válida (se esperaba una lista)."
             )
             return None
 
@@ -184,9 +193,9 @@ def import_preset_from_json(
         presets = load_presets(target_path)
         presets[preset_name] = preset_data
         save_presets(presets, target_path)
-        print(f"✅ Preset '{preset_name}' importado desde '{file_path}'.")
+        log.info("✅ Preset '%s' importado desde '%s'.", preset_name, file_path)
         return preset_name
 
     except Exception as e:
-        print(f"❌ Error al importar preset: {e}")
+        log.error("Error al importar preset: %s", e)
         return None
@@ -1,5 +1,8 @@
 import json
 import os
+from config.logging_config import get_logger
+
+log = get_logger("Settings")
 
 
 class SettingsManager:
@@ -32,7 +35,7 @@ class SettingsManager:
                     self.settings = json.load(f)
                 self._ensure_keys()
             except (json.JSONDecodeError, IOError) as e:
-                print(f"⚠️ Error al cargar configuración: {e}")
+                log.warning("Error al cargar configuración: %s", e)
                 self.settings = self.DEFAULTS.copy()
                 self.save()
 
@@ -47,7 +50,7 @@ class SettingsManager:
             with open(self.config_path, "w") as f:
                 json.dump(self.settings, f, indent=4)
         except IOError as e:
-            print(f"❌ Error al guardar configuración: {e}")
+            log.error("Error al guardar configuración: %s", e)
 
     def get(self, key, default=None):
         return self.settings.get(key, default)
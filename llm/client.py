@@ -2,6 +2,9 @@
 
 from llama_cpp import Llama
 from typing import Optional, Dict
+from config.logging_config import get_logger
+
+log = get_logger("LLMClient")
 
 
 class LLMClient:
@@ -30,10 +33,10 @@ class LLMClient:
 
     def _load_model(self) -> Optional[Llama]:
         try:
-            print(f"[LLMClient] Cargando modelo desde: {self.model_path}")
+            log.info("Cargando modelo desde: %s", self.model_path)
             return Llama(model_path=self.model_path, **self.config)
         except Exception as e:
-            print(f"[❌] Error al cargar el modelo LLM: {e}")
+            log.error("Error al cargar el modelo LLM: %s", e)
             return None
 
     def chat(
@@ -57,7 +60,7 @@ class LLMClient:
             )
             return response["choices"][0]["message"]["content"].strip()
         except Exception as e:
-            print(f"[❌] Error durante inferencia LLM: {e}")
+            log.error("Error durante inferencia LLM: %s", e)
             return "[ERROR] Fallo en la generación de respuesta."
 
     def reload_model(self, new_model_path: str):
@@ -2,8 +2,11 @@
 
 import json
 from typing import List, Dict, Any, Optional
+from config.logging_config import get_logger
 from processing.validation import validate_filter_params
 
+log = get_logger("Parser")
+
 
 def parse_llm_response(
     raw_response: str, metadata: Dict[str, Any], verbose: bool = True
@@ -20,13 +23,13 @@ def parse_llm_response(
 
         if not raw_response.strip():
             if verbose:
-                print("[Parser] Respuesta vacía del modelo.")
+                log.warning("Respuesta vacía del modelo.")
             return None
 
         if not raw_response.strip().startswith("{"):
             if verbose:
-                print("[Parser] Respuesta no parece ser JSON.")
-                print("Contenido recibido:", raw_response)
+                log.warning("Respuesta no parece ser JSON.")
+                log.debug("Contenido recibido: %s", raw_response)
             return None
 
         parsed_json = json.loads(raw_response)
@@ -34,20 +37,20 @@ def parse_llm_response(
 
         if not isinstance(filters_list, list):
             if verbose:
-                print("[Parser] JSON inválido o campo 'filters_identified' ausente.")
+                log.warning("JSON inválido o campo 'filters_identified' ausente.")
             return None
 
         final_pipeline = []
         for item in filters_list:
             if not isinstance(item, dict) or "name" not in item:
                 if verbose:
-                    print(f"[Parser] Entrada inválida: {item}")
+                    log.warning("Entrada inválida: %s", item)
                 continue
 
             name = item["name"]
             if name not in metadata:
                 if verbose:
-                    print(f"[Parser] Filtro '{name}' no reconocido. Omitido.")
+                    log.warning("Filtro '%s' no reconocido. Omitido.", name)
                 continue
 
             valid_params = validate_filter_params(name, item)
@@ -55,16 +58,16 @@ def parse_llm_response(
 
         if not final_pipeline:
             if verbose:
-                print("[Parser] No se extrajo ningún filtro válido.")
+                log.warning("No se extrajo ningún filtro válido.")
             return None
 
         return final_pipeline
 
     except json.JSONDecodeError as e:
         if verbose:
-            print(f"[Parser] Error de decodificación JSON: {e}")
+            log.warning("Error de decodificación JSON: %s", e)
         return None
     except Exception as e:
         if verbose:
-            print(f"[Parser] Error inesperado: {e}")
+            log.error("Error inesperado: %s", e)
         return None
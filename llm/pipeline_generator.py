@@ -1,6 +1,7 @@
 # llm/pipeline_generator.py
 
 from typing import Optional, List, Dict, Any
+from config.logging_config import get_logger
 from processing.semantic_classifier import classify_style
 from processing.filters import FILTER_METADATA
 from llm.prompt_builder import build_prompt
@@ -10,6 +11,8 @@ from llm.utils import get_filtered_metadata
 from processing.predefined_pipelines import get_pipeline_from_rules
 # from processing.validation import validate_filter_params
 
+log = get_logger("PipelineGenerator")
+
 
 class PipelineGenerator:
     def __init__(
@@ -33,20 +36,20 @@ class PipelineGenerator:
         # 1. Reglas predefinidas
         rule_based = get_pipeline_from_rules(user_query)
         if rule_based:
-            print("[PipelineGenerator] 🎯 Pipeline obtenida desde reglas predefinidas.")
+            log.info("🎯 Pipeline obtenida desde reglas predefinidas.")
             self.last_used_fallback = True
             self.last_fallback_style = "regla_directa"
             return rule_based
 
         # 2. Clasificación semántica
         style = classify_style(user_query)
-        print(f"[PipelineGenerator] Estilo detectado: {style}")
+        log.info("Estilo detectado: %s", style)
 
         # 3. Generación con LLM
         try:
             return self._generate_with_llm(user_query, style)
         except Exception as e:
-            print(f"[PipelineGenerator] ❌ Error durante generación con LLM: {e}")
+            log.error("Error durante generación con LLM: %s", e)
             return self._handle_fallback(style)
 
     def _generate_with_llm(
@@ -56,7 +59,7 @@ class PipelineGenerator:
         prompt = build_prompt(user_query, filtered_metadata)
 
         if self.debug:
-            print("🧠 Prompt enviado al modelo:\n", prompt)
+            log.info("🧠 Prompt enviado al modelo:\n%s", prompt)
 
         response = self.llm.chat(
             system_prompt=prompt,
@@ -66,7 +69,7 @@ class PipelineGenerator:
         )
 
         if self.debug:
-            print("📥 Respuesta cruda del modelo:\n", response)
+            log.info("📥 Respuesta cruda del modelo:\n%s", response)
 
         parsed = parse_llm_response(response, filtered_metadata)
 
@@ -76,7 +79,7 @@ class PipelineGenerator:
         return parsed
 
     def _handle_fallback(self, style: str) -> List[Dict[str, Any]]:
-        print("[PipelineGenerator] ⚠️ Fallback activado.")
+        log.warning("Fallback activado (estilo '%s').", style)
         self.last_used_fallback = True
         self.last_fallback_style = style
         return self._fallback_pipeline(style)
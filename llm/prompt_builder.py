@@ -1,6 +1,10 @@
 # llm/prompt_builder.py
 
 from typing import Dict, Any
+from config.logging_config import get_logger
+from processing.filter_capabilities import cost_class, cost_per_megapixel
+
+log = get_logger("PromptBuilder")
 
 EXAMPLES = """
 Ejemplo 1:
@@ -40,6 +44,9 @@ def build_prompt(
         if i >= max_filters:
             break
         desc = meta.get("description", "")
+        if "cost" in meta:
+            defaults = {k: v.get("default") for k, v in meta.get("params", {}).items()}
+            desc = f"{desc} [coste {cost_class(cost_per_megapixel(meta, defaults))}]"
         params = meta.get("params", {})
         param_str = ", ".join(
             f"{k} ({v.get('type', 'valor')})" for k, v in params.items()
@@ -78,7 +85,6 @@ Ahora responde a esta solicitud del usuario:
 """.strip()
 
     if verbose:
-        print("[PromptBuilder] Prompt generado:")
-        print(system_prompt)
+        log.info("Prompt generado:\n%s", system_prompt)
 
     return system_prompt
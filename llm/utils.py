@@ -1,6 +1,9 @@
 # llm/utils.py
 
 from typing import Dict, Any
+from config.logging_config import get_logger
+
+log = get_logger("Utils")
 
 
 def get_filtered_metadata(
@@ -36,16 +39,18 @@ def get_filtered_metadata(
     selected_filters = style_to_filters.get(style_detected, [])
     if not selected_filters:
         if verbose:
-            print(
-                f"[Utils] Estilo '{style_detected}' no tiene filtros definidos. Usando todos."
+            log.info(
+                "Estilo '%s' no tiene filtros definidos. Usando todos.", style_detected
             )
         selected_filters = list(full_metadata.keys())
 
     filtered = {f: full_metadata[f] for f in selected_filters if f in full_metadata}
 
     if verbose:
-        print(
-            f"[Utils] Filtros seleccionados para estilo '{style_detected}': {list(filtered.keys())}"
+        log.info(
+            "Filtros seleccionados para estilo '%s': %s",
+            style_detected,
+            list(filtered),
         )
 
     return filtered
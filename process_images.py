@@ -0,0 +1,80 @@
+# process_images.py
+#
+# Aplica un preset o una pipeline JSON a todas las imágenes de una carpeta
+# (recursivo), en paralelo y sin interfaz gráfica. Las salidas al día se
+# saltan, así que repetir el comando tras una interrupción continúa donde se
+# quedó:
+#
+#   python process_images.py fotos/ salida/ --preset "tono sepia" --log lote.jsonl
+#   python process_images.py fotos/ salida/ --pipeline mi_pipeline.json --check hash
+
+import argparse
+import sys
+from config.presets import PRESETS_FILE
+from processing.predefined_pipelines import resolve_pipeline
+from processing.directory_batch import FILES_PER_TASK, process_directory
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Procesa una carpeta de imágenes con un preset o una pipeline."
+    )
+    parser.add_argument("input", help="Carpeta de entrada")
+    parser.add_argument("output", help="Carpeta de salida (misma estructura)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--preset", help="Nombre de un preset guardado o predefinido")
+    source.add_argument("--pipeline", help="Fichero JSON o texto JSON con la pipeline")
+    parser.add_argument("--presets-file", default=PRESETS_FILE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--files-per-task", type=int, default=FILES_PER_TASK)
+    parser.add_argument(
+        "--check",
+        choices=("mtime", "hash"),
+        default="mtime",
+        help="Cómo saber si una salida está al día (fecha y tamaño, o contenido)",
+    )
+    parser.add_argument("--log", default=None, help="Registro JSONL por fichero")
+    parser.add_argument(
+        "--ext", default=None, help="Extensión de salida (p. ej. .png)"
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        config = resolve_pipeline(args.preset, args.pipeline, args.presets_file)
+    except (ValueError, OSError) as e:
+        print(f"[❌] {e}")
+        return 2
+
+    def report(done, total, record):
+        if record["status"] == "error":
+            print(f"[⚠️] {record['file']}: {record.get('error')}")
+        if done == total or done % 100 == 0:
+            print(f"[process_images] {done}/{total}")
+
+    try:
+        counts = process_directory(
+            args.input,
+            args.output,
+            config,
+            workers=args.workers,
+            files_per_task=args.files_per_task,
+            check=args.check,
+            log_path=args.log,
+            extension=args.ext,
+            progress=report,
+        )
+    except OSError as e:
+        print(f"[❌] {e}")
+        return 1
+    print(
+        f"[process_images] {counts['ok']} procesadas, {counts['skipped']} al día, "
+        f"{counts['error']} con error"
+    )
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# process_video.py
+#
+# Aplica un preset o una pipeline JSON a un vídeo grabado, sin interfaz
+# gráfica ni cámara:
+#
+#   python process_video.py entrada.mp4 salida.mp4 --preset "tono sepia"
+#   python process_video.py entrada.mp4 salida.avi --pipeline mi_pipeline.json
+
+import argparse
+import sys
+from config.presets import PRESETS_FILE
+from processing.predefined_pipelines import resolve_pipeline
+from processing.image_processor import ImageProcessor
+from processing.video_pipeline import VIDEO_QUEUE_SIZE, process_video
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Procesa un vídeo con un preset o una pipeline, sin interfaz."
+    )
+    parser.add_argument("input", help="Vídeo de entrada")
+    parser.add_argument("output", help="Vídeo de salida (.mp4, .avi, .mkv)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--preset", help="Nombre de un preset guardado o predefinido")
+    source.add_argument("--pipeline", help="Fichero JSON o texto JSON con la pipeline")
+    parser.add_argument("--presets-file", default=PRESETS_FILE)
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Usar la pipeline en vivo (más rápida, con estado entre frames)",
+    )
+    parser.add_argument("--queue-size", type=int, default=VIDEO_QUEUE_SIZE)
+    parser.add_argument("--max-frames", type=int, default=None)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        config = resolve_pipeline(args.preset, args.pipeline, args.presets_file)
+    except (ValueError, OSError) as e:
+        print(f"[❌] {e}")
+        return 2
+    processor = ImageProcessor()
+    processor.set_pipeline(config)
+    try:
+        stats = process_video(
+            args.input,
+            args.output,
+            processor,
+            live=args.live,
+            queue_size=args.queue_size,
+            max_frames=args.max_frames,
+        )
+    except IOError as e:
+        print(f"[❌] {e}")
+        return 1
+    print(f"[process_video] {stats.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# processing/batch.py
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from processing.pipeline_compiler import CompiledStage, run_compiled
+
+# Frames por bloque como máximo: bastantes para repartir el coste por llamada
+# de las etapas apiladas...
+BATCH_CHUNK_SIZE = 64
+# ...y sin pasar de estos bytes, para que cada etapa recorra el bloque desde
+# la caché: con bloques de decenas de MB apilar es más lento que ir frame a
+# frame (ver benchmarks/bench_batch.py). Los frames grandes van de uno en uno.
+BATCH_CHUNK_BYTES = 4 * 2**20
+# Bloques que se leen y procesan por adelantado además de los que ocupan los hilos.
+BATCH_PREFETCH = 2
+
+
+def split_stackable(
+    stages: Sequence[CompiledStage],
+) -> List[Tuple[bool, Tuple[CompiledStage, ...]]]:
+    """
+    Agrupa las etapas en tramos (apilable, etapas). Una etapa con radius 0
+    solo mira su propio píxel y no su posición (filtros puntuales, matrices de
+    color, LUTs), así que puede ejecutarse de una vez sobre todos los frames
+    del bloque puestos uno debajo de otro.
+    """
+    segments: List[Tuple[bool, List[CompiledStage]]] = []
+    for stage in stages:
+        stackable = stage.radius == 0
+        if segments and segments[-1][0] == stackable:
+            segments[-1][1].append(stage)
+        else:
+            segments.append((stackable, [stage]))
+    return [(stackable, tuple(run)) for stackable, run in segments]
+
+
+def _chunk_length(frame: np.ndarray, chunk_size: int) -> int:
+    return max(1, min(chunk_size, BATCH_CHUNK_BYTES // max(1, frame.nbytes)))
+
+
+def _iter_chunks(
+    frames: Union[np.ndarray, Iterable[np.ndarray]], chunk_size: int
+) -> Iterator[np.ndarray]:
+    """Bloques (n, H, W[, C]) de frames consecutivos con la misma forma."""
+    if isinstance(frames, np.ndarray):
+        if len(frames):
+            step = _chunk_length(frames[0], chunk_size)
+            for start in range(0, len(frames), step):
+                yield frames[start : start + step]
+        return
+    pending: List[np.ndarray] = []
+    for frame in frames:
+        first = pending[0] if pending else frame
+        if (frame.shape, frame.dtype) != (first.shape, first.dtype):
+            yield np.stack(pending)
+            pending = []
+        pending.append(frame)
+        if len(pending) >= _chunk_length(first, chunk_size):
+            yield np.stack(pending)
+            pending = []
+    if pending:
+        yield np.stack(pending)
+
+
+def _run_chunk(segments, chunk: np.ndarray) -> List[np.ndarray]:
+    count, rows = chunk.shape[:2]
+    frames: Union[np.ndarray, List[np.ndarray]] = chunk
+    for stackable, stages in segments:
+        if stackable:
+            # (n, H, W, C) -> (n*H, W, C): una sola llamada para todo el bloque.
+            stack = frames if isinstance(frames, np.ndarray) else np.stack(frames)
+            tall = stack.reshape((count * rows,) + stack.shape[2:])
+            tall = run_compiled(stages, tall)
+            frames = tall.reshape((count, rows) + tall.shape[1:])
+        else:
+            frames = [run_compiled(stages, frame) for frame in frames]
+    # Las etapas sin efecto devuelven su entrada: no se entregan vistas de ella.
+    return [f.copy() if np.may_share_memory(f, chunk) else f for f in frames]
+
+
+def process_batch(
+    stages: Sequence[CompiledStage],
+    frames: Union[np.ndarray, Iterable[np.ndarray]],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    prefetch: int = BATCH_PREFETCH,
+) -> Iterator[np.ndarray]:
+    """
+    Procesa una pila (N, H, W[, C]) o un iterable de frames y devuelve un
+    generador con los resultados en orden, a medida que salen.
+
+    Los frames se agrupan en bloques de hasta chunk_size frames (y
+    BATCH_CHUNK_BYTES). En cada bloque, los tramos
+    de etapas apilables (ver split_stackable) se ejecutan con una única
+    llamada y el resto frame a frame. Los bloques se reparten entre `workers`
+    hilos (OpenCV y NumPy liberan el GIL) con `prefetch` bloques de
+    adelanto; la entrada se consume solo a ese ritmo.
+    """
+    segments = split_stackable(stages)
+    workers = max(1, workers or os.cpu_count() or 1)
+    with ThreadPoolExecutor(workers, thread_name_prefix="batch") as executor:
+        pending = deque()
+        chunks = _iter_chunks(frames, max(1, chunk_size))
+        for chunk in islice(chunks, workers + prefetch):
+            pending.append(executor.submit(_run_chunk, segments, chunk))
+        while pending:
+            done = pending.popleft().result()
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(_run_chunk, segments, chunk))
+            yield from done
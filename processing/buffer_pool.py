@@ -0,0 +1,62 @@
+# processing/buffer_pool.py
+
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import numpy as np
+
+
+class BufferPool:
+    """
+    Buffers de frame reutilizables, indexados por (forma, dtype).
+
+    acquire() presta un buffer y release() lo devuelve: la propiedad es
+    explícita, el pool nunca adivina si un buffer sigue en uso. Dentro de una
+    pipeline, run_compiled devuelve la entrada de cada etapa en cuanto la
+    siguiente la ha consumido (ping-pong entre dos buffers). Un frame que sale
+    de la pipeline (al visor, a una tarea de histograma, a la caché) solo
+    vuelve al pool si su consumidor llama a release() al terminar; si no, no
+    se presta nunca más y lo libera el recolector cuando deja de usarse.
+    """
+
+    def __init__(self, max_free_per_key: int = 4):
+        self._free: Dict[Tuple, List[np.ndarray]] = defaultdict(list)
+        self._max_free_per_key = max_free_per_key
+        self._lock = threading.Lock()
+        self.allocations = 0
+        self.allocated_bytes = 0
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Buffer sin inicializar de la forma y dtype pedidos."""
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            free = self._free[key]
+            if free:
+                return free.pop()
+            buf = np.empty(key[0], dtype=key[1])
+            self.allocations += 1
+            self.allocated_bytes += buf.nbytes
+        return buf
+
+    def release(self, buf: np.ndarray):
+        """
+        Devuelve `buf` al pool: quien llama garantiza que ya nadie lo usa (ni
+        vistas sobre él). Las vistas y los arrays de solo lectura se ignoran.
+        """
+        if buf.base is not None or not buf.flags.writeable:
+            return
+        with self._lock:
+            free = self._free[(buf.shape, buf.dtype)]
+            if len(free) < self._max_free_per_key and all(b is not buf for b in free):
+                free.append(buf)
+
+    def copy_of(self, frame: np.ndarray) -> np.ndarray:
+        """Copia de `frame` en un buffer del pool (en lugar de frame.copy())."""
+        buf = self.acquire(frame.shape, frame.dtype)
+        np.copyto(buf, frame)
+        return buf
+
+    def clear(self):
+        """Suelta todos los buffers libres (p. ej. al cambiar de resolución)."""
+        with self._lock:
+            self._free.clear()
@@ -0,0 +1,253 @@
+# processing/directory_batch.py
+
+import copy
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+import cv2
+import numpy as np
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.pipeline_graph import compile_graph, is_graph, run_graph
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+# Manifiesto con lo ya procesado, en la carpeta de salida.
+MANIFEST_NAME = ".pdi_manifest.json"
+# Ficheros por tarea enviada al pool: reparte el coste de cada envío entre
+# procesos sin dejar a un proceso con una cola larga al final.
+FILES_PER_TASK = 16
+# Cada cuánto (s) se guarda el manifiesto: una interrupción pierde como mucho
+# este tiempo de trabajo.
+MANIFEST_SAVE_INTERVAL = 5.0
+
+
+def pipeline_digest(pipeline) -> str:
+    """Huella de la pipeline: si cambia, nada de la salida está al día."""
+    if not isinstance(pipeline, Mapping):
+        pipeline = list(pipeline)
+    text = json.dumps(pipeline, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_images(
+    root: str, extensions=IMAGE_EXTENSIONS, exclude: Optional[str] = None
+) -> List[str]:
+    """
+    Rutas relativas (ordenadas) de las imágenes bajo root, sin entrar en la
+    carpeta exclude (la de salida, si está dentro de root).
+    """
+    excluded = os.path.realpath(exclude) if exclude else None
+    found = []
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = sorted(
+            name
+            for name in dirs
+            if os.path.realpath(os.path.join(folder, name)) != excluded
+        )
+        for name in sorted(files):
+            if name.lower().endswith(extensions):
+                found.append(os.path.relpath(os.path.join(folder, name), root))
+    return found
+
+
+def load_manifest(path: str, digest: str) -> Dict[str, Dict[str, Any]]:
+    """Entradas del manifiesto, o {} si no existe o es de otra pipeline."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("pipeline") != digest:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(path: str, digest: str, files: Dict[str, Dict[str, Any]]):
+    """Escritura atómica: un corte a mitad nunca deja un manifiesto roto."""
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump({"pipeline": digest, "files": files}, f)
+    os.replace(temporary, path)
+
+
+_run: Optional[Callable[[np.ndarray], Any]] = None
+_compile_error: Optional[Exception] = None
+
+
+def _init_worker(pipeline):
+    """
+    Compila la pipeline una vez por proceso (validación incluida), con la
+    calidad de process_still. Un error se guarda y se notifica en cada fichero.
+    """
+    global _run, _compile_error
+    try:
+        if is_graph(pipeline):
+            _run = partial(run_graph, compile_graph(pipeline))
+        else:
+            _run = partial(run_compiled, compile_pipeline(pipeline))
+    except Exception as e:
+        _compile_error = e
+
+
+def _process_files(tasks: List[Dict[str, Any]], check_hash: bool) -> List[dict]:
+    records = []
+    for task in tasks:
+        start = time.perf_counter()
+        record = {"file": task["file"], "output": task["output"]}
+        try:
+            stat = os.stat(task["source"])
+            record.update(mtime=stat.st_mtime, size=stat.st_size)
+            if check_hash:
+                record["hash"] = file_digest(task["source"])
+                previous = task.get("previous") or {}
+                if previous.get("hash") == record["hash"] and os.path.exists(
+                    task["destination"]
+                ):
+                    record["status"] = "skipped"
+                    records.append(record)
+                    continue
+            if _compile_error is not None:
+                raise _compile_error
+            image = cv2.imread(task["source"], cv2.IMREAD_COLOR)
+            if image is None:
+                raise IOError("no se pudo leer la imagen")
+            result = _run(image)
+            if isinstance(result, dict):
+                raise ValueError("el grafo tiene varias salidas; indica una")
+            os.makedirs(os.path.dirname(task["destination"]) or ".", exist_ok=True)
+            if not cv2.imwrite(task["destination"], result):
+                raise IOError("no se pudo escribir la salida")
+            record["status"] = "ok"
+        except Exception as e:
+            record.update(status="error", error=str(e))
+        record["ms"] = round((time.perf_counter() - start) * 1000.0, 2)
+        records.append(record)
+    return records
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def process_directory(
+    input_dir: str,
+    output_dir: str,
+    pipeline: Sequence[Dict[str, Any]],
+    workers: Optional[int] = None,
+    files_per_task: int = FILES_PER_TASK,
+    check: str = "mtime",
+    log_path: Optional[str] = None,
+    extension: Optional[str] = None,
+    progress: Optional[Callable[[int, int, dict], None]] = None,
+) -> Dict[str, int]:
+    """
+    Aplica una pipeline a todas las imágenes de input_dir (recursivo) y deja
+    el resultado en output_dir con la misma estructura, usando un pool de
+    procesos que compilan la pipeline una vez cada uno. No necesita pantalla.
+    Si output_dir está dentro de input_dir, no se recorre.
+
+    Las salidas al día se saltan según el manifiesto de output_dir: con
+    check="mtime" si el original conserva fecha y tamaño, con check="hash" si
+    conserva el contenido (más lento, sobrevive a copias). Cada fichero
+    procesado, saltado o fallido se añade como una línea JSON a log_path y se
+    notifica a progress(hechos, total, registro). Devuelve los recuentos.
+    """
+    if check not in ("mtime", "hash"):
+        raise ValueError("check debe ser 'mtime' o 'hash'")
+    pipeline = copy.deepcopy(pipeline if is_graph(pipeline) else list(pipeline))
+    digest = pipeline_digest(pipeline)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path, digest)
+
+    files = find_images(input_dir, exclude=output_dir)
+    counts = {"ok": 0, "skipped": 0, "error": 0}
+    pending, done = [], 0
+    log = open(log_path, "a", encoding="utf-8") if log_path else None
+
+    def record_result(record: dict):
+        nonlocal done
+        done += 1
+        counts[record["status"]] += 1
+        if record["status"] in ("ok", "skipped"):
+            manifest[record["file"]] = {
+                key: record[key] for key in ("mtime", "size", "hash") if key in record
+            }
+        if log is not None:
+            log.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if progress is not None:
+            progress(done, len(files), record)
+
+    try:
+        for relative in files:
+            output = relative
+            if extension:
+                output = os.path.splitext(relative)[0] + extension
+            task = {
+                "file": relative,
+                "output": output,
+                "source": os.path.join(input_dir, relative),
+                "destination": os.path.join(output_dir, output),
+                "previous": manifest.get(relative),
+            }
+            previous = task["previous"]
+            if check == "mtime" and previous and os.path.exists(task["destination"]):
+                stat = os.stat(task["source"])
+                if (previous.get("mtime"), previous.get("size")) == (
+                    stat.st_mtime,
+                    stat.st_size,
+                ):
+                    record = dict(previous, file=relative, output=output)
+                    record_result(dict(record, status="skipped", ms=0.0))
+                    continue
+            pending.append(task)
+
+        workers = max(1, workers or os.cpu_count() or 1)
+        context = mp.get_context("spawn")
+        last_save = time.monotonic()
+        with ProcessPoolExecutor(
+            workers, context, _init_worker, (pipeline,)
+        ) as executor:
+            chunks = _chunks(pending, max(1, files_per_task))
+            running = set()
+            for chunk in chunks:
+                running.add(executor.submit(_process_files, chunk, check == "hash"))
+                if len(running) < 2 * workers:
+                    continue
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    for record in future.result():
+                        record_result(record)
+                if time.monotonic() - last_save > MANIFEST_SAVE_INTERVAL:
+                    save_manifest(manifest_path, digest, manifest)
+                    last_save = time.monotonic()
+            for future in wait(running).done:
+                for record in future.result():
+                    record_result(record)
+    finally:
+        save_manifest(manifest_path, digest, manifest)
+        if log is not None:
+            log.close()
+    return counts
@@ -0,0 +1,152 @@
+# processing/dirty_tiles.py
+
+from typing import Iterator, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from processing.pipeline_compiler import CompiledStage, run_compiled
+
+# Lado (px) de las teselas que se recalculan por separado.
+TILE_SIZE = 64
+# Los frames se comparan reducidos a 1/_DETECT_SCALE por lado (INTER_AREA
+# promedia el ruido del sensor); TILE_SIZE debe ser múltiplo de este valor.
+_DETECT_SCALE = 4
+# Una tesela ha cambiado si algún píxel reducido difiere más que esto (niveles).
+TILE_THRESHOLD = 8
+# Con más de esta fracción de teselas que recalcular, sale más barato (y
+# evita costuras en escenas en movimiento) procesar el frame entero.
+MAX_DIRTY_FRACTION = 0.5
+
+
+def pipeline_radius(stages: Sequence[CompiledStage]) -> Optional[int]:
+    """Halo total (px) que necesita la pipeline, o None si alguna etapa no es local."""
+    total = 0
+    for stage in stages:
+        if stage.radius is None:
+            return None
+        total += stage.radius
+    return total
+
+
+class DirtyTileRunner:
+    """
+    Ejecuta una pipeline local en vivo recalculando solo las teselas cuyo
+    contenido cambió desde que se calculó su salida. Cada tesela sucia se
+    procesa con un margen igual al radio total de la pipeline (suma de los
+    "radius" declarados), así que sus píxeles salen idénticos a los de una
+    pasada completa, y se pega sobre la salida anterior.
+
+    Las teselas vecinas de una que cambia también se recalculan si el halo las
+    alcanza. Si alguna etapa no es local (FFT, ecualización, NLM, bokeh...),
+    si cambian la pipeline o el tamaño, o si hay demasiadas teselas sucias,
+    se procesa el frame entero.
+    """
+
+    def __init__(
+        self,
+        tile_size: int = TILE_SIZE,
+        threshold: int = TILE_THRESHOLD,
+        max_dirty_fraction: float = MAX_DIRTY_FRACTION,
+    ):
+        # La rejilla de detección debe coincidir con la de teselas.
+        cells = max(1, -(-tile_size // _DETECT_SCALE))
+        self.tile_size = cells * _DETECT_SCALE
+        self.threshold = threshold
+        self.max_dirty_fraction = max_dirty_fraction
+        self.full_runs = 0
+        self.tiled_runs = 0
+        self.last_dirty_fraction = 1.0
+        self.reset()
+
+    def reset(self):
+        self._stages = None
+        self._reference = None  # frame reducido del que sale cada tesela
+        self._output = None
+
+    def _signature(self, frame: np.ndarray) -> np.ndarray:
+        rows, cols = frame.shape[:2]
+        size = (-(-cols // _DETECT_SCALE), -(-rows // _DETECT_SCALE))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        return small.astype(np.int16)
+
+    def dirty_tiles(self, signature: np.ndarray) -> np.ndarray:
+        """Máscara booleana (filas x columnas de teselas) de las que cambiaron."""
+        diff = np.abs(signature - self._reference)
+        if diff.ndim == 3:
+            diff = diff.max(axis=2)
+        cell = self.tile_size // _DETECT_SCALE
+        rows, cols = diff.shape
+        grid = (-(-rows // cell), -(-cols // cell))
+        padded = np.zeros((grid[0] * cell, grid[1] * cell), dtype=diff.dtype)
+        padded[:rows, :cols] = diff
+        tiles = padded.reshape(grid[0], cell, grid[1], cell).max(axis=(1, 3))
+        return tiles > self.threshold
+
+    def _runs(self, mask: np.ndarray) -> Iterator[Tuple[int, int, int]]:
+        """(fila, col_inicio, col_fin) de cada racha horizontal de teselas."""
+        for row in range(mask.shape[0]):
+            cols = np.flatnonzero(mask[row])
+            if cols.size == 0:
+                continue
+            breaks = np.flatnonzero(np.diff(cols) > 1)
+            starts = np.concatenate(([cols[0]], cols[breaks + 1]))
+            ends = np.concatenate((cols[breaks], [cols[-1]])) + 1
+            for start, end in zip(starts, ends):
+                yield row, int(start), int(end)
+
+    def run(self, stages: Sequence[CompiledStage], frame: np.ndarray) -> np.ndarray:
+        """Salida de la pipeline para frame (de solo lectura: se reutiliza)."""
+        halo = pipeline_radius(stages)
+        if halo is None:
+            self._stages = None
+            return self._full_run(stages, frame, None)
+        signature = self._signature(frame)
+        if (
+            stages is not self._stages
+            or self._output is None
+            or self._reference.shape != signature.shape
+        ):
+            return self._full_run(stages, frame, signature)
+
+        dirty = self.dirty_tiles(signature)
+        # Las teselas a menos de `halo` px de una sucia leen píxeles que cambiaron.
+        reach = -(-halo // self.tile_size)
+        if reach and dirty.any():
+            kernel = np.ones((2 * reach + 1, 2 * reach + 1), dtype=np.uint8)
+            dirty = cv2.dilate(dirty.astype(np.uint8), kernel).astype(bool)
+        self.last_dirty_fraction = float(dirty.mean())
+        if self.last_dirty_fraction > self.max_dirty_fraction:
+            return self._full_run(stages, frame, signature)
+        self.tiled_runs += 1
+        if not dirty.any():
+            return self._output
+
+        output = self._output.copy()
+        rows, cols = frame.shape[:2]
+        tile, cell = self.tile_size, self.tile_size // _DETECT_SCALE
+        for row, start, end in self._runs(dirty):
+            y0, y1 = row * tile, min(rows, (row + 1) * tile)
+            x0, x1 = start * tile, min(cols, end * tile)
+            py0, py1 = max(0, y0 - halo), min(rows, y1 + halo)
+            px0, px1 = max(0, x0 - halo), min(cols, x1 + halo)
+            patch = run_compiled(stages, frame[py0:py1, px0:px1])
+            output[y0:y1, x0:x1] = patch[y0 - py0 : y1 - py0, x0 - px0 : x1 - px0]
+            cells = (
+                slice(row * cell, (row + 1) * cell),
+                slice(start * cell, end * cell),
+            )
+            self._reference[cells] = signature[cells]
+        output.setflags(write=False)
+        self._output = output
+        return output
+
+    def _full_run(self, stages, frame, signature) -> np.ndarray:
+        self.full_runs += 1
+        self.last_dirty_fraction = 1.0
+        output = run_compiled(stages, frame)
+        if np.may_share_memory(output, frame):
+            output = output.copy()
+        output.setflags(write=False)
+        self._stages = stages
+        self._reference = signature
+        self._output = output
+        return output
@@ -0,0 +1,174 @@
+# processing/filter_capabilities.py
+
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+# --- Esquema de capacidades ---
+#
+# Cada entrada de FILTER_METADATA declara, además de los parámetros de la UI,
+# qué sabe hacer el filtro y cuánto cuesta. Los optimizadores, el planificador,
+# el generador LLM y la UI consultan estas claves en lugar de nombres de filtro.
+# Clave -> (tipos aceptados, valor por defecto).
+CAPABILITY_SCHEMA: Dict[str, Tuple[Tuple[type, ...], Any]] = {
+    # Mapeo por píxel y canal con la misma tabla 0-255 en todos los canales.
+    "point_op": ((bool,), False),
+    # (alpha, beta) del convertScaleAbs equivalente, en función de los params.
+    "affine": ((Callable,), None),
+    # La salida de un píxel depende solo del BGR de ese píxel (LUT 3D).
+    "color_only": ((bool,), False),
+    # Filtro lineal e invariante a traslaciones (convolución), salvo redondeo
+    # y saturación: conmuta con otros filtros lineales.
+    "linear": ((bool,), False),
+    # El núcleo se descompone en dos pasadas 1D (coste ~ lineal en ksize).
+    "separable": ((bool,), False),
+    # f(f(x)) == f(x): dos etapas seguidas con los mismos parámetros sobran.
+    "idempotent": ((bool,), False),
+    # f(f(x)) == x: dos etapas seguidas se anulan.
+    "involutive": ((bool,), False),
+    # Puede escribir el resultado sobre su propia entrada (dst=image).
+    "in_place": ((bool,), False),
+    # params -> None si la etapa hace algo, o el error máximo (niveles por
+    # canal, 0 = exacto) de quitarla cuando con esos params no hace nada.
+    "noop": ((Callable,), None),
+    # La salida depende solo del gris (BT.601) de la entrada (bool o función
+    # de los params): lo que una etapa anterior cambie en el color se pierde.
+    "discards_color": ((bool, Callable), False),
+    # Error máximo (niveles) que la etapa introduce en el gris de la imagen,
+    # o None si lo cambia (número o función de los params).
+    "luma_error": ((int, Callable), None),
+    # Cota de cuánto amplifica la etapa un error de su entrada: máx. de
+    # |Δsalida| / |Δentrada| por canal (número o función de los params).
+    # None = sin cota (umbrales, ecualización, FFT...): un error aproximado
+    # delante de la etapa puede cambiar la salida por completo.
+    "error_gain": ((int, float, Callable), None),
+    "uses_context": ((bool,), False),
+    "supports_dst": ((bool,), False),
+    "accepts_gray": ((bool,), False),
+    # Disposición de la salida: "gray", "bgr" o "input" (la de la entrada).
+    "emits": ((str,), "input"),
+    "keep_gray": ((bool,), False),
+    # Filtro local: cada píxel de salida solo lee los píxeles de entrada a esta
+    # distancia (px, número o función de los params) y no depende de su
+    # posición absoluta. None = no local (FFT, ecualización, NLM...): el modo
+    # por teselas (processing/dirty_tiles.py) recalcula entonces el frame entero.
+    "radius": ((int, Callable), None),
+    "live_function": ((Callable,), None),
+    # Coste en ms por megapíxel (número o función de los params), medido en
+    # el equipo de referencia con benchmarks/bench_filter_costs.py.
+    "cost": ((int, float, Callable), None),
+    # Coste de "live_function" en vídeo en vivo, si difiere de "cost".
+    "live_cost": ((int, float, Callable), None),
+}
+
+_DESCRIPTIVE_KEYS = {"function", "description", "params"}
+_EMITS = ("gray", "bgr", "input")
+_PARAM_TYPES = ("int_slider", "float_slider", "text")
+
+# Umbrales (ms/MP) de las etiquetas de coste que muestran la UI y el prompt.
+COST_CLASSES = ((2.0, "bajo"), (15.0, "medio"), (200.0, "alto"))
+
+
+def _check_param(name: str, param: str, info: Mapping[str, Any]) -> List[str]:
+    problems = []
+    kind = info.get("type")
+    if kind not in _PARAM_TYPES:
+        problems.append(f"{name}.{param}: tipo de parámetro desconocido {kind!r}")
+    if "default" not in info:
+        problems.append(f"{name}.{param}: falta 'default'")
+    if kind in ("int_slider", "float_slider"):
+        bounds = info.get("range")
+        if not (isinstance(bounds, tuple) and len(bounds) == 3):
+            problems.append(f"{name}.{param}: 'range' debe ser (min, max, paso)")
+        elif not bounds[0] <= info.get("default", bounds[0]) <= bounds[1]:
+            problems.append(f"{name}.{param}: 'default' fuera de 'range'")
+    return problems
+
+
+def _check_filter(name: str, info: Mapping[str, Any]) -> List[str]:
+    problems = []
+    if not callable(info.get("function")):
+        problems.append(f"{name}: 'function' no es invocable")
+    if not isinstance(info.get("description"), str):
+        problems.append(f"{name}: falta 'description'")
+    params = info.get("params")
+    if not isinstance(params, dict):
+        problems.append(f"{name}: 'params' debe ser un dict")
+        params = {}
+    for param, param_info in params.items():
+        problems.extend(_check_param(name, param, param_info))
+
+    for key, value in info.items():
+        if key in _DESCRIPTIVE_KEYS:
+            continue
+        if key not in CAPABILITY_SCHEMA:
+            problems.append(f"{name}: capacidad desconocida '{key}'")
+            continue
+        types = CAPABILITY_SCHEMA[key][0]
+        ok = any(
+            callable(value) if t is Callable else isinstance(value, t) for t in types
+        )
+        if not ok:
+            problems.append(f"{name}: '{key}' tiene un tipo no válido ({value!r})")
+
+    caps = capabilities_of(info)
+    if caps["cost"] is None:
+        problems.append(f"{name}: falta 'cost' (ms por megapíxel)")
+    if caps["emits"] not in _EMITS:
+        problems.append(f"{name}: 'emits' debe ser uno de {_EMITS}")
+    if caps["affine"] is not None and not caps["point_op"]:
+        problems.append(f"{name}: 'affine' requiere 'point_op'")
+    if caps["point_op"] and not caps["color_only"]:
+        problems.append(f"{name}: un 'point_op' también es 'color_only'")
+    if caps["keep_gray"] and not caps["accepts_gray"]:
+        problems.append(f"{name}: 'keep_gray' requiere 'accepts_gray'")
+    if caps["in_place"] and not caps["supports_dst"]:
+        problems.append(f"{name}: 'in_place' requiere 'supports_dst'")
+    if caps["separable"] and not caps["linear"]:
+        problems.append(f"{name}: 'separable' requiere 'linear'")
+    if caps["idempotent"] and caps["involutive"]:
+        problems.append(f"{name}: no puede ser 'idempotent' e 'involutive' a la vez")
+    if caps["point_op"] and caps["radius"] != 0:
+        problems.append(f"{name}: un 'point_op' tiene 'radius' 0")
+    if caps["live_cost"] is not None and caps["live_function"] is None:
+        problems.append(f"{name}: 'live_cost' sin 'live_function'")
+    return problems
+
+
+def validate_filter_metadata(metadata: Mapping[str, Mapping[str, Any]]):
+    """
+    Comprueba las declaraciones de todos los filtros (se llama al importar
+    processing.filters). Un registro mal formado es un error de programación:
+    se lanza ValueError con todos los problemas encontrados.
+    """
+    problems = []
+    for name, info in metadata.items():
+        problems.extend(_check_filter(name, info))
+    if problems:
+        raise ValueError(
+            "FILTER_METADATA no válido:\n" + "\n".join(f"  - {p}" for p in problems)
+        )
+
+
+def capabilities_of(info: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Capacidades de una entrada de FILTER_METADATA, con los valores por defecto."""
+    return MappingProxyType(
+        {key: info.get(key, default) for key, (_, default) in CAPABILITY_SCHEMA.items()}
+    )
+
+
+def cost_per_megapixel(
+    info: Mapping[str, Any], params: Mapping[str, Any], live: bool = False
+) -> float:
+    """Coste declarado (ms/MP) de un filtro con unos parámetros concretos."""
+    cost = info.get("live_cost") if live else None
+    if cost is None:
+        cost = info.get("cost", 0.0)
+    return float(cost(params) if callable(cost) else cost)
+
+
+def cost_class(ms_per_megapixel: float) -> str:
+    """Etiqueta legible del coste: "bajo", "medio", "alto" o "muy alto"."""
+    for limit, label in COST_CLASSES:
+        if ms_per_megapixel < limit:
+            return label
+    return "muy alto"
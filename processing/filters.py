@@ -2,97 +2,239 @@
 
 import cv2
 import numpy as np
+from functools import lru_cache, partial
+from typing import Optional
+from processing.filter_capabilities import (
+    capabilities_of,
+    cost_per_megapixel,
+    validate_filter_metadata,
+)
+from processing.frame_context import FrameContext, convert_color, gray_to_bgr, to_gray
+from processing.frequency_filters import FFT_PROFILES, apply_frequency_filter
+from processing.lut3d import apply_lut3d, load_cube_file
+from processing.temporal_denoise import TemporalDenoiser
 
 # --- Filter Functions ---
 
 
-def convert_to_grayscale(image: np.ndarray) -> np.ndarray:
+def convert_to_grayscale(
+    image: np.ndarray, context: Optional[FrameContext] = None
+) -> np.ndarray:
     """Converts a BGR image to grayscale."""
     if len(image.shape) == 2 or image.shape[2] == 1:
         return image  # Already grayscale
-    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return to_gray(image, context)
 
 
-def invert_colors(image: np.ndarray) -> np.ndarray:
+def invert_colors(image: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
     """Inverts the colors of an image."""
-    return cv2.bitwise_not(image)
+    return cv2.bitwise_not(image, dst=dst)
+
+
+# --- Kernels grandes vía pirámide ---
+#
+# A partir de estos tamaños de kernel se usa pyrDown -> desenfoque equivalente
+# más pequeño -> pyrUp. Cada etapa puede cambiar su umbral con el parámetro
+# pyramid_threshold (0 = siempre exacto). Error medido frente al filtro exacto
+# en benchmarks/bench_pyramid_blur.py.
+GAUSSIAN_PYRAMID_THRESHOLD = 21
+# La mediana aproximada es más tosca que la exacta cerca de bordes finos:
+# solo se usa en la parte alta del rango (1-31), donde la exacta es más lenta.
+MEDIAN_PYRAMID_THRESHOLD = 21
+_PYRAMID_MIN_SIDE = 16
+
+
+def _kernel_sigma(ksize: int) -> float:
+    """Sigma que usa cv2.GaussianBlur cuando solo se indica ksize."""
+    return 0.3 * ((ksize - 1) * 0.5 - 1) + 0.8
+
+
+def _pyramid_down(image: np.ndarray, levels: int):
+    sizes = []
+    for _ in range(levels):
+        sizes.append((image.shape[1], image.shape[0]))
+        image = cv2.pyrDown(image)
+    return image, sizes
 
 
-def apply_gaussian_blur(image: np.ndarray, ksize: int = 5) -> np.ndarray:
-    """Applies Gaussian blur to an image. ksize must be odd."""
+def _pyramid_up(image: np.ndarray, sizes: list) -> np.ndarray:
+    for size in reversed(sizes):
+        image = cv2.pyrUp(image, dstsize=size)
+    return image
+
+
+def _max_pyramid_levels(image: np.ndarray) -> int:
+    levels, side = 0, min(image.shape[:2])
+    while side >> (levels + 1) >= _PYRAMID_MIN_SIDE:
+        levels += 1
+    return levels
+
+
+def _pyramid_gaussian_blur(image: np.ndarray, ksize: int) -> np.ndarray:
+    """
+    GaussianBlur aproximado de kernel ksize. Cada nivel de pyrDown + pyrUp
+    aporta varianza (2 * 4^(L-1) en píxeles originales); se baja mientras
+    quede al menos sigma 1 por aplicar a la resolución reducida, que es donde
+    se completa la varianza que falta.
+    """
+    variance = _kernel_sigma(ksize) ** 2
+    levels, residual = 0, variance
+    for candidate in range(1, _max_pyramid_levels(image) + 1):
+        scale = 4**candidate
+        remaining = (variance - 2.0 * (scale - 1) / 3.0) / scale
+        if remaining < 1.0:
+            break
+        levels, residual = candidate, remaining
+    if levels == 0:
+        return cv2.GaussianBlur(image, (ksize, ksize), 0)
+    small, sizes = _pyramid_down(image, levels)
+    small = cv2.GaussianBlur(small, (0, 0), float(np.sqrt(residual)))
+    return _pyramid_up(small, sizes)
+
+
+def _median_down(image: np.ndarray, levels: int):
+    """
+    Reducción a la mitad por nivel que conserva la robustez de la mediana:
+    mediana 3x3 y un píxel de cada 2x2. pyrDown es un filtro gaussiano y
+    repartiría el ruido impulsivo (sal y pimienta) por sus vecinos antes de
+    que la mediana pudiera descartarlo.
+    """
+    sizes = []
+    for _ in range(levels):
+        sizes.append((image.shape[1], image.shape[0]))
+        image = np.ascontiguousarray(cv2.medianBlur(image, 3)[::2, ::2])
+    return image, sizes
+
+
+def _pyramid_median_blur(image: np.ndarray, ksize: int) -> np.ndarray:
+    """
+    medianBlur aproximado: se baja de nivel hasta que el kernel equivalente
+    es <= 5 (la ruta rápida de OpenCV; por encima usa un algoritmo por
+    histograma mucho más lento sobre frames en color).
+    """
+    levels = 0
+    while (ksize >> levels) | 1 > 5 and levels < _max_pyramid_levels(image):
+        levels += 1
+    if levels == 0:
+        return cv2.medianBlur(image, ksize)
+    small, sizes = _median_down(image, levels)
+    small = cv2.medianBlur(small, max(3, (ksize >> levels) | 1))
+    return _pyramid_up(small, sizes)
+
+
+def apply_gaussian_blur(
+    image: np.ndarray,
+    ksize: int = 5,
+    pyramid_threshold: int = GAUSSIAN_PYRAMID_THRESHOLD,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Applies Gaussian blur to an image. ksize must be odd.
+    Kernels >= pyramid_threshold use the pyramid approximation (0 disables it).
+    """
     # ksize = ksize if ksize % 2 == 1 else ksize + 1  # Ensure ksize is odd
-    return cv2.GaussianBlur(image, (ksize, ksize), 0)
+    if pyramid_threshold and ksize >= pyramid_threshold:
+        return _pyramid_gaussian_blur(image, ksize)
+    return cv2.GaussianBlur(image, (ksize, ksize), 0, dst=dst)
 
 
-def apply_median_blur(image: np.ndarray, ksize: int = 5) -> np.ndarray:
-    """Applies Median blur to an image. ksize must be odd."""
+def apply_median_blur(
+    image: np.ndarray,
+    ksize: int = 5,
+    pyramid_threshold: int = MEDIAN_PYRAMID_THRESHOLD,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Applies Median blur to an image. ksize must be odd.
+    Kernels >= pyramid_threshold use the pyramid approximation (0 disables it).
+    """
     # ksize = ksize if ksize % 2 == 1 else ksize + 1  # Ensure ksize is odd
-    return cv2.medianBlur(image, ksize)
+    if pyramid_threshold and ksize >= pyramid_threshold:
+        return _pyramid_median_blur(image, ksize)
+    return cv2.medianBlur(image, ksize, dst=dst)
 
 
 def apply_canny_edge_detection(
-    image: np.ndarray, low_threshold: int = 50, high_threshold: int = 150
+    image: np.ndarray,
+    low_threshold: int = 50,
+    high_threshold: int = 150,
+    context: Optional[FrameContext] = None,
 ) -> np.ndarray:
     """Applies Canny edge detection. Image is converted to grayscale internally."""
     if len(image.shape) == 3:
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        image = to_gray(image, context)
     return cv2.Canny(image, low_threshold, high_threshold)
 
 
 def adjust_brightness_contrast(
-    image: np.ndarray, alpha: float = 1.0, beta: int = 0
+    image: np.ndarray,
+    alpha: float = 1.0,
+    beta: int = 0,
+    dst: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """Adjusts brightness (beta) and contrast (alpha) of an image."""
-    return cv2.convertScaleAbs(image, alpha=alpha, beta=beta)
+    return cv2.convertScaleAbs(image, dst=dst, alpha=alpha, beta=beta)
 
 
-def sepia_tint(image: np.ndarray, strength: float = 0.8) -> np.ndarray:
+# Sepia matrix (simplified for demonstration)
+# The sum of each row should ideally be 1 for maintaining brightness
+# These values are often adjusted for desired effect
+_SEPIA_MATRIX = np.array(
+    [
+        [0.272, 0.534, 0.131],
+        [0.349, 0.686, 0.168],
+        [0.393, 0.769, 0.189],
+    ]
+).T  # Transpose for cv2.transform (cols of matrix must match scn)
+
+
+@lru_cache(maxsize=128)
+def _sepia_transform(strength: float) -> np.ndarray:
+    """
+    3x4 matrix for cv2.transform on uint8, interpolated between identity and
+    sepia by `strength`. Cached per strength value.
+
+    The values stay in the 0-255 domain (the old float path divided by 255 and
+    multiplied back, which cancels out). The -0.49 offset makes OpenCV's
+    round-to-nearest behave like the truncating astype(np.uint8) of the
+    original float implementation, so outputs match it within ±1 LSB.
+    """
+    final_matrix = (1.0 - strength) * np.eye(3) + strength * _SEPIA_MATRIX
+    offset = np.full((3, 1), -0.49)
+    matrix = np.hstack([final_matrix, offset]).astype(np.float32)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def sepia_tint(
+    image: np.ndarray, strength: float = 0.8, dst: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     Applies a sepia tint to the image.
     Ensures image is 3-channel BGR before applying tint.
+
+    Works directly on uint8: cv2.transform uses fixed-point arithmetic with
+    saturation for 8-bit input, so no float temporaries are allocated.
     """
     # Convert to BGR if grayscale
     if len(image.shape) == 2 or image.shape[2] == 1:
         image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
 
-    # Sepia matrix (simplified for demonstration)
-    # The sum of each row should ideally be 1 for maintaining brightness
-    # These values are often adjusted for desired effect
-    sepia_matrix = np.array(
-        [
-            [0.272, 0.534, 0.131],
-            [0.349, 0.686, 0.168],
-            [0.393, 0.769, 0.189],
-        ]
-    ).T  # Transpose for cv2.transform (cols of matrix must match scn)
-
-    # Apply tint gradually based on strength
-    identity_matrix = np.array(
-        [
-            [1.0, 0.0, 0.0],
-            [0.0, 1.0, 0.0],
-            [0.0, 0.0, 1.0],
-        ]
-    ).T
-
-    # Interpolate between identity and sepia matrix based on strength
-    final_matrix = (1.0 - strength) * identity_matrix + strength * sepia_matrix
-
-    # Convert image to float32 for matrix multiplication
-    image_float = image.astype(np.float32) / 255.0
-
-    # Apply the transformation
-    tinted_image = cv2.transform(image_float, final_matrix)
-
-    # Clip values to [0, 1] and convert back to uint8
-    tinted_image = np.clip(tinted_image, 0.0, 1.0) * 255.0
-    return tinted_image.astype(np.uint8)
+    return cv2.transform(image, _sepia_transform(float(strength)), dst=dst)
 
 
 def apply_laplacian_sharpen(
-    image: np.ndarray, kernel_size: int = 3, scale: float = 1.0
+    image: np.ndarray,
+    kernel_size: int = 3,
+    scale: float = 1.0,
+    context: Optional[FrameContext] = None,
+    keep_gray: bool = False,
 ) -> np.ndarray:
-    """Sharpens the image using the Laplacian operator."""
+    """
+    Sharpens the image using the Laplacian operator.
+    With keep_gray=True a BGR input returns the sharpened gray plane instead
+    of its GRAY2BGR expansion (the pipeline expands it only if needed).
+    """
     if len(image.shape) == 2 or image.shape[2] == 1:
         # If grayscale, convert to BGR for sharpening and then back to gray if desired,
         # or just sharpen as grayscale. For sharpening, grayscale is fine.
@@ -115,30 +257,69 @@ def apply_laplacian_sharpen(
 
     # If color, apply on each channel or convert to grayscale and then apply
     # Simplest for now: convert to grayscale, sharpen, then convert back to BGR
-    gray_image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    gray_image = to_gray(image, context)
     sharpened_gray = cv2.Laplacian(gray_image, cv2.CV_64F, ksize=kernel_size)
     sharpened_gray = gray_image - scale * sharpened_gray
     sharpened_gray = np.clip(sharpened_gray, 0, 255).astype(np.uint8)
-    return cv2.cvtColor(sharpened_gray, cv2.COLOR_GRAY2BGR)
+    if keep_gray:
+        return sharpened_gray
+    return gray_to_bgr(sharpened_gray, context)
+
+
+# BT.601 luma weights in BGR order, the same ones cv2.COLOR_BGR2GRAY uses.
+_LUMA_BGR = np.array([0.114, 0.587, 0.299])
+
+
+@lru_cache(maxsize=128)
+def _saturation_lut(factor: float) -> np.ndarray:
+    """
+    256-entry table for the HSV S channel, cached per factor. Same float64
+    multiply, clip and truncating cast as the original per-pixel expression,
+    so the result is bit-identical.
+    """
+    table = np.clip(np.arange(256) * factor, 0, 255).astype(np.uint8)
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=128)
+def _saturation_matrix(factor: float) -> np.ndarray:
+    """
+    BGR-space saturation matrix: lerp between each pixel's luma and its color.
+    Luma is preserved exactly, hue only approximately.
+    """
+    luma = np.tile(_LUMA_BGR, (3, 1))
+    matrix = (luma + factor * (np.eye(3) - luma)).astype(np.float32)
+    matrix.setflags(write=False)
+    return matrix
 
 
-def adjust_saturation(image: np.ndarray, factor: float = 1.5) -> np.ndarray:
+def adjust_saturation(
+    image: np.ndarray,
+    factor: float = 1.5,
+    preserve_hue: int = 1,
+    context: Optional[FrameContext] = None,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
     """
     Adjusts the saturation of an image.
     Ensures image is 3-channel BGR before conversion to HSV.
+
+    preserve_hue=1 scales S in HSV through a cached LUT, editing the channel in
+    place (no split/merge). preserve_hue=0 skips the HSV round-trip and applies
+    a single luma-preserving BGR matrix instead, which is much cheaper.
     """
     # Convert to BGR if grayscale
     if len(image.shape) == 2 or image.shape[2] == 1:
         image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
 
-    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-    h, s, v = cv2.split(hsv)
-
-    # Apply factor to saturation, clip to [0, 255]
-    s = np.clip(s * factor, 0, 255).astype(np.uint8)
+    factor = float(factor)
+    if not preserve_hue:
+        return cv2.transform(image, _saturation_matrix(factor), dst=dst)
 
-    merged_hsv = cv2.merge([h, s, v])
-    return cv2.cvtColor(merged_hsv, cv2.COLOR_HSV2BGR)
+    hsv = convert_color(image, cv2.COLOR_BGR2HSV, context, writable=True)
+    hsv[:, :, 1] = cv2.LUT(hsv[:, :, 1], _saturation_lut(factor))
+    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=hsv if dst is None else dst)
 
 
 # --- New Advanced Filter Functions (Placeholders for Phase 2) ---
@@ -150,6 +331,9 @@ def apply_denoising_nlm(
     h_color: float = 10,
     template_window_size: int = 7,
     search_window_size: int = 21,
+    realtime: int = 1,
+    refresh_interval: int = 15,
+    temporal_window: int = 1,
 ) -> np.ndarray:
     """
     Applies Non-Local Means Denoising to the image.
@@ -157,6 +341,9 @@ def apply_denoising_nlm(
     h_color: Parameter regulating filter strength for color components.
     template_window_size: Size in pixels of the template patch that is used to compute weights. Should be odd.
     search_window_size: Size in pixels of the window that is used to compute weighted average for given pixel. Should be odd.
+    realtime, refresh_interval, temporal_window: only used by the live pipeline
+    (see processing/temporal_denoise.py); this function is always the
+    full-quality single-frame path.
     """
     # Convert to 8-bit if not already (required by fastNlMeansDenoising/Colored)
     if image.dtype != np.uint8:
@@ -200,105 +387,338 @@ def apply_object_detection_placeholder(image: np.ndarray) -> np.ndarray:
     return output_image
 
 
+# El fondo del bokeh tolera la aproximación por pirámide antes que un
+# desenfoque gaussiano normal: solo se ve fuera del área enfocada. Empieza
+# por encima del valor por defecto (15), que sigue siendo exacto.
+_BOKEH_PYRAMID_THRESHOLD = 17
+
+
+@lru_cache(maxsize=8)
+def _bokeh_mask(shape: tuple, center: tuple, pixel_radius: int, feather_px: int):
+    """
+    Pesos del área enfocada, cacheados por (forma, centro, radio, difuminado).
+    Solo se guardan dentro del rectángulo que contiene el círculo: fuera de él
+    el resultado es el fondo desenfocado tal cual. Devuelve (slices, w_focus,
+    w_blur) con pesos float32 para cv2.blendLinear.
+    """
+    h, w = shape
+    cx, cy = center
+    reach = pixel_radius + feather_px // 2 + 1
+    y0, y1 = max(0, cy - reach), min(h, cy + reach + 1)
+    x0, x1 = max(0, cx - reach), min(w, cx + reach + 1)
+    if y0 >= y1 or x0 >= x1:
+        return None
+
+    yy, xx = np.mgrid[y0:y1, x0:x1]
+    distance = np.hypot(xx - cx, yy - cy)
+    if feather_px > 0:
+        alpha = np.clip((pixel_radius - distance) / feather_px + 0.5, 0.0, 1.0)
+    else:
+        alpha = (distance <= pixel_radius).astype(np.float64)
+    w_focus = np.ascontiguousarray(alpha, dtype=np.float32)
+    w_blur = 1.0 - w_focus
+    w_focus.setflags(write=False)
+    w_blur.setflags(write=False)
+    return (slice(y0, y1), slice(x0, x1)), w_focus, w_blur
+
+
 def apply_bokeh_effect(
     image: np.ndarray,
     blur_strength: int = 15,
     center_x: float = 0.5,
     center_y: float = 0.5,
     radius: float = 0.2,
+    feather: float = 0.02,
+    dst: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Applies a simple circular bokeh (depth of field) effect.
     blur_strength: Kernel size for blur (odd integer).
     center_x, center_y: Normalized coordinates (0.0-1.0) for the center of the focused area.
     radius: Normalized radius (0.0-1.0) of the focused area.
+    feather: Normalized width (0.0-1.0) of the soft transition at the edge.
     """
     if blur_strength % 2 == 0:
         blur_strength += 1  # Ensure odd kernel size
 
-    output_image = image.copy()
-    h, w = output_image.shape[:2]
-
-    # Create a mask for the focused area (e.g., a circle)
-    mask = np.zeros((h, w), dtype=np.uint8)
-    center_pixel_x = int(w * center_x)
-    center_pixel_y = int(h * center_y)
-    pixel_radius = int(min(h, w) * radius)
-
-    cv2.circle(
-        mask, (center_pixel_x, center_pixel_y), pixel_radius, 255, -1
-    )  # Draw filled circle
-
-    # Blur the entire image
-    blurred_image = cv2.GaussianBlur(output_image, (blur_strength, blur_strength), 0)
-
-    # Combine original (focused) and blurred areas using the mask
-    # The mask needs to be 3 channels if the image is color
-    if len(output_image.shape) == 3:
-        mask = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
-
-    # Blend the focused area (from original) and blurred area (from blurred_image)
-    result = np.where(mask == 255, output_image, blurred_image)
+    h, w = image.shape[:2]
+    short_side = min(h, w)
+    weights = _bokeh_mask(
+        (h, w),
+        (int(w * center_x), int(h * center_y)),
+        int(short_side * radius),
+        int(short_side * feather),
+    )
 
+    # El fondo desenfocado es un buffer nuevo: se compone sobre él en el sitio.
+    if blur_strength >= _BOKEH_PYRAMID_THRESHOLD:
+        result = _pyramid_gaussian_blur(image, blur_strength)
+    else:
+        result = cv2.GaussianBlur(image, (blur_strength, blur_strength), 0, dst=dst)
+    if weights is not None:
+        roi, w_focus, w_blur = weights
+        focus_roi = result[roi]
+        cv2.blendLinear(image[roi], focus_roi, w_focus, w_blur, dst=focus_roi)
     return result
 
 
-def equalize_histogram(image: np.ndarray) -> np.ndarray:
+def equalize_histogram(
+    image: np.ndarray,
+    context: Optional[FrameContext] = None,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
     """Aplica ecualización de histograma para mejorar el contraste."""
     if len(image.shape) == 2:
         return cv2.equalizeHist(image)
     elif image.shape[2] == 3:
-        ycrcb = cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)
+        ycrcb = convert_color(image, cv2.COLOR_BGR2YCrCb, context, writable=True)
         ycrcb[:, :, 0] = cv2.equalizeHist(ycrcb[:, :, 0])
-        return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
+        return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR, dst=dst)
     return image
 
 
 def apply_sobel_edge_detection(
-    image: np.ndarray, dx: int = 1, dy: int = 0, ksize: int = 3
+    image: np.ndarray,
+    dx: int = 1,
+    dy: int = 0,
+    ksize: int = 3,
+    context: Optional[FrameContext] = None,
+    keep_gray: bool = False,
 ) -> np.ndarray:
-    """Aplica el operador Sobel para detección de bordes en X o Y."""
+    """
+    Aplica el operador Sobel para detección de bordes en X o Y.
+    Con keep_gray=True devuelve la magnitud en gris sin expandirla a BGR.
+    """
     if len(image.shape) == 3:
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        image = to_gray(image, context)
     sobel = cv2.Sobel(image, cv2.CV_64F, dx, dy, ksize=ksize)
     sobel = np.absolute(sobel)
     sobel = np.clip(sobel, 0, 255).astype(np.uint8)
-    return cv2.cvtColor(sobel, cv2.COLOR_GRAY2BGR)
+    if keep_gray:
+        return sobel
+    return gray_to_bgr(sobel, context)
 
 
-def apply_lowpass_fft(image: np.ndarray, cutoff: float = 0.1) -> np.ndarray:
-    """Aplica un filtro pasa-bajo en el dominio de la frecuencia."""
-    if len(image.shape) == 3:
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+def _fft_profile(profile: int) -> str:
+    return FFT_PROFILES[min(max(int(profile), 0), len(FFT_PROFILES) - 1)]
+
 
-    f = np.fft.fft2(image)
-    fshift = np.fft.fftshift(f)
+def apply_lowpass_fft(
+    image: np.ndarray,
+    cutoff: float = 0.1,
+    profile: int = 0,
+    per_channel: int = 0,
+    context: Optional[FrameContext] = None,
+    keep_gray: bool = False,
+) -> np.ndarray:
+    """
+    Aplica un filtro pasa-bajo en el dominio de la frecuencia.
+    profile: 0 ideal, 1 gaussiano, 2 Butterworth. per_channel=1 filtra cada
+    canal BGR en lugar de la luminancia.
+    """
+    return apply_frequency_filter(
+        image,
+        "lowpass",
+        cutoff,
+        profile=_fft_profile(profile),
+        per_channel=bool(per_channel),
+        context=context,
+        keep_gray=keep_gray,
+    )
 
-    rows, cols = image.shape
-    crow, ccol = rows // 2, cols // 2
-    mask = np.zeros_like(image, dtype=np.uint8)
-    radius = int(min(rows, cols) * cutoff)
-    cv2.circle(mask, (ccol, crow), radius, 1, -1)
 
-    fshift_filtered = fshift * mask
-    f_ishift = np.fft.ifftshift(fshift_filtered)
-    img_back = np.fft.ifft2(f_ishift)
-    img_back = np.abs(img_back)
-    img_back = np.clip(img_back, 0, 255).astype(np.uint8)
-    return cv2.cvtColor(img_back, cv2.COLOR_GRAY2BGR)
+def apply_highpass_fft(
+    image: np.ndarray,
+    cutoff: float = 0.05,
+    profile: int = 0,
+    per_channel: int = 0,
+    context: Optional[FrameContext] = None,
+    keep_gray: bool = False,
+) -> np.ndarray:
+    """Filtro pasa-alto en frecuencia: conserva bordes y textura fina (magnitud)."""
+    return apply_frequency_filter(
+        image,
+        "highpass",
+        cutoff,
+        profile=_fft_profile(profile),
+        per_channel=bool(per_channel),
+        context=context,
+        keep_gray=keep_gray,
+    )
+
+
+def apply_bandpass_fft(
+    image: np.ndarray,
+    cutoff_low: float = 0.02,
+    cutoff_high: float = 0.15,
+    profile: int = 0,
+    per_channel: int = 0,
+    context: Optional[FrameContext] = None,
+    keep_gray: bool = False,
+) -> np.ndarray:
+    """Filtro pasa-banda en frecuencia entre cutoff_low y cutoff_high (magnitud)."""
+    return apply_frequency_filter(
+        image,
+        "bandpass",
+        cutoff_low,
+        cutoff_high,
+        profile=_fft_profile(profile),
+        per_channel=bool(per_channel),
+        context=context,
+        keep_gray=keep_gray,
+    )
+
+
+def apply_cube_lut(
+    image: np.ndarray,
+    lut_path: str = "",
+    strength: float = 1.0,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Aplica una LUT 3D cargada desde un fichero .cube (gradación de color).
+    strength mezcla entre la imagen original (0.0) y la graduada (1.0).
+    """
+    table = load_cube_file(lut_path)
+    if table is None:
+        return image
+    if len(image.shape) == 2 or image.shape[2] == 1:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if strength >= 1.0:
+        return apply_lut3d(image, table, dst=dst)
+    graded = apply_lut3d(image, table)
+    return cv2.addWeighted(graded, strength, image, 1.0 - strength, 0, dst=dst)
+
+
+# --- Cost models (ms per megapixel, see benchmarks/bench_filter_costs.py) ---
+
+
+def _uses_pyramid(params: dict) -> bool:
+    threshold = params["pyramid_threshold"]
+    return bool(threshold) and params["ksize"] >= threshold
+
+
+def _median_cost(params: dict) -> float:
+    # 3 y 5 tienen rutas SIMD propias; a partir de 7 OpenCV usa el algoritmo
+    # por histogramas, unas 20 veces más lento (salvo con la pirámide).
+    if params["ksize"] <= 3:
+        return 0.7
+    if params["ksize"] == 5 or _uses_pyramid(params):
+        return 5.0
+    return 100.0
+
+
+def _nlm_cost(params: dict) -> float:
+    return 500.0 + 3.8 * params["search_window_size"] ** 2
+
+
+def _bokeh_cost(params: dict) -> float:
+    if params["blur_strength"] >= _BOKEH_PYRAMID_THRESHOLD:
+        return 6.0
+    return 0.6 * params["blur_strength"]
+
+
+# --- Tiled execution radii (see processing/dirty_tiles.py) ---
+
+
+def _kernel_radius(params: dict):
+    # La pirámide depende de la alineación del frame con la rejilla de
+    # pyrDown: no es local. Canny tampoco (la histéresis sigue bordes a
+    # cualquier distancia), así que no declara radio.
+    return None if _uses_pyramid(params) else params["ksize"] // 2
+
+
+# --- Optimizer declarations (see processing/pipeline_optimizer.py) ---
+
+
+def _unit_kernel_noop(params: dict):
+    return 0 if params["ksize"] == 1 and not _uses_pyramid(params) else None
+
+
+def _saturation_noop(params: dict):
+    if params["factor"] != 1.0:
+        return None
+    # Con factor 1 la ruta HSV solo añade el redondeo de ida y vuelta.
+    return 6 if params["preserve_hue"] else 0
+
+
+def _sepia_gain(params: dict) -> float:
+    # Mayor suma de |coeficientes| de una fila de la matriz.
+    matrix = _sepia_transform(float(params["strength"]))[:, :3]
+    return float(np.abs(matrix).sum(axis=1).max())
+
+
+def _saturation_luma_error(params: dict):
+    # La matriz conserva la luma salvo redondeo mientras no satura (factor <= 1).
+    if params["preserve_hue"] or params["factor"] > 1.0:
+        return None
+    return 1
 
 
 # --- Filter Metadata ---
+# "point_op": True marks per-pixel, per-channel mappings (same 0-255 -> 0-255
+# table for every channel). Consecutive point ops are fused by the pipeline
+# compiler into a single cv2.LUT pass. "affine" optionally gives the
+# (alpha, beta) of the equivalent cv2.convertScaleAbs call, which lets the
+# compiler replace the LUT with a faster SIMD pass when the result is exact.
+# "color_only": True marks filters whose output pixel depends only on the same
+# input pixel's BGR value; runs of them can be baked into a 3D LUT.
+# "uses_context": True means the filter accepts a `context` FrameContext
+# argument and reuses/provides derived color spaces (gray, HSV, YCrCb) for the
+# current intermediate image instead of converting it again.
+# "supports_dst": True means the filter accepts `dst`, a preallocated array
+# with the input's shape and dtype, and writes its result there when the
+# output has that same shape (it returns whatever array it wrote to). The
+# compiler passes buffers from ImageProcessor's BufferPool.
+# Channel layout (tracked by run_compiled so gray chains stay single-channel):
+# "accepts_gray": True means the filter gives the same pixels for a 1-channel
+# image as for its GRAY2BGR expansion (with equal channels), so a gray plane
+# standing in for an equal-channel BGR frame can be passed to it as is.
+# "emits" is the output layout: "gray", "bgr" or "input" (same as the input,
+# the default). "keep_gray": True means the filter accepts `keep_gray` and,
+# when set, returns its gray result without expanding it to BGR; the pipeline
+# expands it once, only where a later stage or the output needs BGR.
+# Optimizer capabilities ("linear", "separable", "idempotent", "involutive",
+# "in_place", "noop", "discards_color", "luma_error", "error_gain") and the
+# "cost" model (ms per megapixel, a number or a function of the validated
+# params) are described in processing/filter_capabilities.py, which validates
+# every entry below at import time.
+# "radius" is the neighbourhood (px) each output pixel reads, for filters
+# that are local and position-independent; the tiled mode recomputes only
+# changed tiles padded by the pipeline's total radius (None = not local).
+# "live_function" is a factory for a stateful replacement of "function" that
+# the compiler uses only in live pipelines (one instance per compiled stage);
+# stills and captures keep the stateless "function".
 FILTER_METADATA = {
     "convert_to_grayscale": {
         "function": convert_to_grayscale,
         "description": "Convierte la imagen a escala de grises, eliminando toda la información de color.",
         "params": {},
+        "color_only": True,
+        "uses_context": True,
+        "accepts_gray": True,
+        "emits": "gray",
+        "idempotent": True,
+        "cost": 0.5,
+        "radius": 0,
+        "discards_color": True,
+        "luma_error": 0,
+        "error_gain": 1,
     },
     "invert_colors": {
         "function": invert_colors,
         "description": "Invierte los colores de la imagen, creando un efecto negativo.",
         "params": {},
+        "point_op": True,
+        "affine": lambda params: (-1.0, 255.0),
+        "color_only": True,
+        "supports_dst": True,
+        "accepts_gray": True,
+        "involutive": True,
+        "in_place": True,
+        "cost": 0.3,
+        "radius": 0,
+        "error_gain": 1,
     },
     "apply_gaussian_blur": {
         "function": apply_gaussian_blur,
@@ -310,8 +730,23 @@ FILTER_METADATA = {
                 "default": 5,
                 "label": "Kernel Size (Odd)",
                 #                "must_be_odd": True
-            }
+            },
+            "pyramid_threshold": {
+                "type": "int_slider",
+                "range": (0, 99, 1),
+                "default": GAUSSIAN_PYRAMID_THRESHOLD,
+                "label": "Umbral pirámide (0 = exacto)",
+            },
         },
+        "supports_dst": True,
+        "accepts_gray": True,
+        "linear": True,
+        "separable": True,
+        "in_place": True,
+        "cost": lambda p: 6.0 if _uses_pyramid(p) else max(0.5, 0.6 * p["ksize"] - 1),
+        "radius": _kernel_radius,
+        "noop": _unit_kernel_noop,
+        "error_gain": 1,
     },
     "apply_median_blur": {
         "function": apply_median_blur,
@@ -323,8 +758,21 @@ FILTER_METADATA = {
                 "default": 5,
                 "label": "Kernel Size (Odd)",
                 # "must_be_odd": True
-            }
+            },
+            "pyramid_threshold": {
+                "type": "int_slider",
+                "range": (0, 31, 1),
+                "default": MEDIAN_PYRAMID_THRESHOLD,
+                "label": "Umbral pirámide (0 = exacto)",
+            },
         },
+        "supports_dst": True,
+        "accepts_gray": True,
+        "in_place": True,
+        "cost": _median_cost,
+        "radius": _kernel_radius,
+        "noop": _unit_kernel_noop,
+        "error_gain": 1,
     },
     "apply_canny_edge_detection": {
         "function": apply_canny_edge_detection,
@@ -343,6 +791,11 @@ FILTER_METADATA = {
                 "label": "High Threshold",
             },
         },
+        "uses_context": True,
+        "accepts_gray": True,
+        "emits": "gray",
+        "cost": 4.5,
+        "discards_color": True,
     },
     "adjust_brightness_contrast": {
         "function": adjust_brightness_contrast,
@@ -361,6 +814,15 @@ FILTER_METADATA = {
                 "label": "Brightness (Beta)",
             },
         },
+        "point_op": True,
+        "affine": lambda params: (params["alpha"], params["beta"]),
+        "color_only": True,
+        "supports_dst": True,
+        "accepts_gray": True,
+        "in_place": True,
+        "cost": 0.6,
+        "radius": 0,
+        "error_gain": lambda params: abs(params["alpha"]),
     },
     "sepia_tint": {
         "function": sepia_tint,
@@ -373,6 +835,14 @@ FILTER_METADATA = {
                 "label": "Strength",
             }
         },
+        "color_only": True,
+        "supports_dst": True,
+        "emits": "bgr",
+        "in_place": True,
+        "cost": 0.6,
+        "radius": 0,
+        "noop": lambda p: 0 if p["strength"] == 0 else None,
+        "error_gain": _sepia_gain,
     },
     "apply_laplacian_sharpen": {
         "function": apply_laplacian_sharpen,
@@ -392,22 +862,44 @@ FILTER_METADATA = {
                 "label": "Sharpening Scale",
             },
         },
+        "uses_context": True,
+        "accepts_gray": True,
+        "keep_gray": True,
+        "linear": True,
+        "cost": 9.5,
+        "radius": lambda p: max(1, p["kernel_size"] // 2),
+        "discards_color": True,
     },
     "adjust_saturation": {
         "function": adjust_saturation,
-        "description": "Ajusta la saturación del color de la imagen. El factor > 1.0 aumenta, < 1.0 disminuye. 0.0 para la escala de grises.",
+        "description": "Ajusta la saturación del color de la imagen. El factor > 1.0 aumenta, < 1.0 disminuye. 0.0 para la escala de grises. 'preserve_hue' = 0 usa una matriz BGR más rápida que conserva la luminancia pero no exactamente el tono.",
         "params": {
             "factor": {
                 "type": "float_slider",
                 "range": (0.0, 3.0, 0.01),
                 "default": 1.5,
                 "label": "Factor",
-            }
+            },
+            "preserve_hue": {
+                "type": "int_slider",
+                "range": (0, 1, 1),
+                "default": 1,
+                "label": "Preservar tono (HSV)",
+            },
         },
+        "color_only": True,
+        "uses_context": True,
+        "supports_dst": True,
+        "emits": "bgr",
+        "in_place": True,
+        "cost": lambda p: 6.5 if p["preserve_hue"] else 0.6,
+        "radius": 0,
+        "noop": _saturation_noop,
+        "luma_error": _saturation_luma_error,
     },
     "non_local_means_denoising": {
         "function": apply_denoising_nlm,
-        "description": "Aplica la reducción de ruido Non-Local Means.",
+        "description": "Aplica la reducción de ruido Non-Local Means. En vídeo en vivo, 'realtime' = 1 refresca el NLM cada 'refresh_interval' frames en segundo plano (multi-frame si 'temporal_window' >= 3) y promedia en el tiempo con compensación de movimiento entre refrescos. Las capturas usan siempre el NLM completo.",
         "params": {
             "h": {
                 "type": "float_slider",
@@ -435,12 +927,36 @@ FILTER_METADATA = {
                 "label": "Tamaño Ventana Búsqueda",
                 # "must_be_odd": True
             },
+            "realtime": {
+                "type": "int_slider",
+                "range": (0, 1, 1),
+                "default": 1,
+                "label": "Tiempo real (vídeo en vivo)",
+            },
+            "refresh_interval": {
+                "type": "int_slider",
+                "range": (1, 60, 1),
+                "default": 15,
+                "label": "Frames entre refrescos NLM",
+            },
+            "temporal_window": {
+                "type": "int_slider",
+                "range": (1, 7, 2),
+                "default": 1,
+                "label": "Ventana temporal NLM (frames)",
+                "must_be_odd": True,
+            },
         },
+        "live_function": partial(TemporalDenoiser, apply_denoising_nlm),
+        "cost": _nlm_cost,
+        "live_cost": lambda p: 45.0 if p["realtime"] else _nlm_cost(p),
     },
     "object_detection_placeholder": {
         "function": apply_object_detection_placeholder,
         "description": "Un filtro de demostración para la detección de objetos.",
         "params": {},  # No adjustable parameters for this placeholder
+        "emits": "bgr",
+        "cost": 0.4,
     },
     "bokeh_effect": {
         "function": apply_bokeh_effect,
@@ -471,12 +987,28 @@ FILTER_METADATA = {
                 "default": 0.2,
                 "label": "Radio (0-1)",
             },
+            "feather": {
+                "type": "float_slider",
+                "range": (0.0, 0.2, 0.01),
+                "default": 0.02,
+                "label": "Difuminado del borde (0-1)",
+            },
         },
+        "supports_dst": True,
+        "accepts_gray": True,
+        "cost": _bokeh_cost,
+        "noop": lambda p: 0 if p["blur_strength"] == 1 else None,
+        "error_gain": 1,
     },
     "equalize_histogram": {
         "function": equalize_histogram,
         "description": "Ecualiza el histograma para mejorar el contraste de la imagen.",
         "params": {},
+        "uses_context": True,
+        "supports_dst": True,
+        "accepts_gray": True,
+        "in_place": True,
+        "cost": 4.5,
     },
     "apply_sobel_edge_detection": {
         "function": apply_sobel_edge_detection,
@@ -501,10 +1033,17 @@ FILTER_METADATA = {
                 "label": "Tamaño Kernel",
             },
         },
+        "uses_context": True,
+        "accepts_gray": True,
+        "emits": "bgr",
+        "keep_gray": True,
+        "cost": lambda p: 4.0 + 0.5 * p["ksize"],
+        "radius": lambda p: max(1, p["ksize"] // 2),
+        "discards_color": True,
     },
     "apply_lowpass_fft": {
         "function": apply_lowpass_fft,
-        "description": "Filtra frecuencias altas usando FFT. Mejora suavidad global.",
+        "description": "Filtra frecuencias altas usando FFT. Mejora suavidad global. 'per_channel' = 1 conserva el color.",
         "params": {
             "cutoff": {
                 "type": "float_slider",
@@ -512,10 +1051,116 @@ FILTER_METADATA = {
                 "default": 0.1,
                 "label": "Radio de Corte (0-1)",
             },
+            "profile": {
+                "type": "int_slider",
+                "range": (0, 2, 1),
+                "default": 0,
+                "label": "Perfil (0 ideal, 1 gauss, 2 butterworth)",
+            },
+            "per_channel": {
+                "type": "int_slider",
+                "range": (0, 1, 1),
+                "default": 0,
+                "label": "Por canal (color)",
+            },
         },
+        "uses_context": True,
+        "accepts_gray": True,
+        "keep_gray": True,
+        "cost": lambda p: 25.0 if p["per_channel"] else 10.0,
+        "discards_color": lambda p: not p["per_channel"],
+    },
+    "apply_highpass_fft": {
+        "function": apply_highpass_fft,
+        "description": "Elimina las frecuencias bajas usando FFT. Resalta bordes y textura fina.",
+        "params": {
+            "cutoff": {
+                "type": "float_slider",
+                "range": (0.0, 0.5, 0.01),
+                "default": 0.05,
+                "label": "Radio de Corte (0-1)",
+            },
+            "profile": {
+                "type": "int_slider",
+                "range": (0, 2, 1),
+                "default": 0,
+                "label": "Perfil (0 ideal, 1 gauss, 2 butterworth)",
+            },
+            "per_channel": {
+                "type": "int_slider",
+                "range": (0, 1, 1),
+                "default": 0,
+                "label": "Por canal (color)",
+            },
+        },
+        "uses_context": True,
+        "accepts_gray": True,
+        "keep_gray": True,
+        "cost": lambda p: 25.0 if p["per_channel"] else 10.0,
+        "discards_color": lambda p: not p["per_channel"],
+    },
+    "apply_bandpass_fft": {
+        "function": apply_bandpass_fft,
+        "description": "Conserva una banda de frecuencias entre dos radios usando FFT.",
+        "params": {
+            "cutoff_low": {
+                "type": "float_slider",
+                "range": (0.0, 0.5, 0.01),
+                "default": 0.02,
+                "label": "Radio Inferior (0-1)",
+            },
+            "cutoff_high": {
+                "type": "float_slider",
+                "range": (0.01, 0.5, 0.01),
+                "default": 0.15,
+                "label": "Radio Superior (0-1)",
+            },
+            "profile": {
+                "type": "int_slider",
+                "range": (0, 2, 1),
+                "default": 0,
+                "label": "Perfil (0 ideal, 1 gauss, 2 butterworth)",
+            },
+            "per_channel": {
+                "type": "int_slider",
+                "range": (0, 1, 1),
+                "default": 0,
+                "label": "Por canal (color)",
+            },
+        },
+        "uses_context": True,
+        "accepts_gray": True,
+        "keep_gray": True,
+        "cost": lambda p: 25.0 if p["per_channel"] else 10.0,
+        "discards_color": lambda p: not p["per_channel"],
+    },
+    "apply_cube_lut": {
+        "function": apply_cube_lut,
+        "description": "Aplica una LUT 3D de gradación de color desde un fichero .cube. 'strength' mezcla con la imagen original.",
+        "params": {
+            "lut_path": {
+                "type": "text",
+                "default": "",
+                "label": "Fichero .cube",
+            },
+            "strength": {
+                "type": "float_slider",
+                "range": (0.0, 1.0, 0.01),
+                "default": 1.0,
+                "label": "Intensidad",
+            },
+        },
+        "color_only": True,
+        "supports_dst": True,
+        "in_place": True,
+        "cost": lambda p: 12.0 if p["lut_path"] else 0.1,
+        "radius": 0,
+        "noop": lambda p: 0 if not p["lut_path"] else None,
     },
 }
 
+validate_filter_metadata(FILTER_METADATA)
+
 # You can also make a list of available filter names for convenience
 AVAILABLE_FILTERS = list(FILTER_METADATA.keys())
 
@@ -534,3 +1179,38 @@ def get_default_filter_params(filter_name: str) -> dict:
     for param_name, param_info in metadata_params.items():
         params[param_name] = param_info.get("default")
     return params
+
+
+# --- Capability and cost queries ---
+def get_filter_capabilities(filter_name: str):
+    """
+    Returns the (read-only) capability flags of a filter with defaults filled
+    in, or None if the filter is not registered.
+    """
+    info = FILTER_METADATA.get(filter_name)
+    return None if info is None else capabilities_of(info)
+
+
+def filters_with(capability: str, value=True) -> list:
+    """Returns the names of the filters whose `capability` equals `value`."""
+    return [
+        name
+        for name, info in FILTER_METADATA.items()
+        if capabilities_of(info)[capability] == value
+    ]
+
+
+def estimate_filter_cost(
+    filter_name: str, params: dict = None, shape=(1080, 1920), live: bool = False
+) -> float:
+    """
+    Estimated milliseconds for one frame of the given shape. Missing params
+    take their defaults; unknown filters cost 0.
+    """
+    info = FILTER_METADATA.get(filter_name)
+    if info is None:
+        return 0.0
+    full_params = get_default_filter_params(filter_name)
+    full_params.update(params or {})
+    megapixels = shape[0] * shape[1] / 1e6
+    return cost_per_megapixel(info, full_params, live) * megapixels
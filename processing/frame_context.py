@@ -0,0 +1,118 @@
+# processing/frame_context.py
+
+from typing import Dict, Optional
+import cv2
+import numpy as np
+
+
+class FrameContext:
+    """
+    Frame que recorre la pipeline junto con sus representaciones derivadas
+    (gris, HSV, YCrCb...). Se calculan bajo demanda y se memoizan para la
+    imagen intermedia actual; cuando una etapa devuelve otra imagen, se
+    descartan.
+
+    Las representaciones memoizadas son compartidas: quien necesite
+    modificarlas debe pedirlas con writable=True.
+
+    pipeline_version es la versión de la pipeline con la que se procesó (la
+    fija ImageProcessor.process_frame_context).
+    """
+
+    def __init__(self, image: np.ndarray):
+        self._image = image
+        self._derived: Dict[int, np.ndarray] = {}
+        self._seeded = None
+        self.pipeline_version: Optional[int] = None
+
+    @property
+    def image(self) -> np.ndarray:
+        return self._image
+
+    def update(self, image: np.ndarray):
+        """Pasa a describir `image` (la salida de la última etapa)."""
+        if image is self._image:
+            return
+        if self._seeded is not None and self._seeded[0] is image:
+            self._derived = self._seeded[1]
+        else:
+            self._derived = {}
+        self._seeded = None
+        self._image = image
+
+    def convert(self, code: int, writable: bool = False) -> np.ndarray:
+        """cv2.cvtColor(image, code), memoizado por código de conversión."""
+        value = self._derived.get(code)
+        if value is None:
+            value = cv2.cvtColor(self._image, code)
+            if writable:
+                return value
+            self._derived[code] = value
+        return value.copy() if writable else value
+
+    def gray(self) -> np.ndarray:
+        image = self._image
+        if image.ndim == 2:
+            return image
+        if image.shape[2] == 1:
+            return image[:, :, 0]
+        return self.convert(cv2.COLOR_BGR2GRAY)
+
+    def hsv(self) -> np.ndarray:
+        return self.convert(cv2.COLOR_BGR2HSV)
+
+    def ycrcb(self) -> np.ndarray:
+        return self.convert(cv2.COLOR_BGR2YCrCb)
+
+    def provide(self, image: np.ndarray, code: int, value: np.ndarray):
+        """
+        Registra una representación ya conocida de `image`: la imagen actual
+        o la salida que la etapa está a punto de devolver (p. ej. el gris del
+        que salió un resultado GRAY2BGR, que BGR2GRAY reproduce exactamente).
+        """
+        if image is self._image:
+            self._derived[code] = value
+            return
+        if self._seeded is None or self._seeded[0] is not image:
+            self._seeded = (image, {})
+        self._seeded[1][code] = value
+
+    def references(self, buf: np.ndarray) -> bool:
+        """Si alguna representación guardada comparte memoria con `buf`."""
+        values = list(self._derived.values())
+        if self._seeded is not None:
+            values.extend(self._seeded[1].values())
+        return any(np.may_share_memory(value, buf) for value in values)
+
+
+def convert_color(
+    image: np.ndarray,
+    code: int,
+    context: Optional[FrameContext] = None,
+    writable: bool = False,
+) -> np.ndarray:
+    """cv2.cvtColor que reutiliza el contexto cuando describe a `image`."""
+    if context is not None and context.image is image:
+        return context.convert(code, writable)
+    return cv2.cvtColor(image, code)
+
+
+def to_gray(image: np.ndarray, context: Optional[FrameContext] = None) -> np.ndarray:
+    """Gris de `image` (la propia imagen si ya es de un canal)."""
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 1:
+        return image[:, :, 0]
+    return convert_color(image, cv2.COLOR_BGR2GRAY, context)
+
+
+def gray_to_bgr(
+    gray: np.ndarray,
+    context: Optional[FrameContext] = None,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """GRAY2BGR que deja el gris registrado en el contexto para la salida."""
+    bgr = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR, dst=dst)
+    if context is not None:
+        context.provide(bgr, cv2.COLOR_BGR2GRAY, gray)
+    return bgr
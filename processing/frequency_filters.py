@@ -0,0 +1,155 @@
+# processing/frequency_filters.py
+
+from functools import lru_cache
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from processing.frame_context import FrameContext, gray_to_bgr, to_gray
+
+FFT_KINDS = ("lowpass", "highpass", "bandpass")
+FFT_PROFILES = ("ideal", "gaussian", "butterworth")
+BUTTERWORTH_ORDER = 2
+
+
+# --- Geometría del espectro ---
+#
+# Se usa la DFT real de OpenCV (cv2.dft sobre float32 sin DFT_COMPLEX_OUTPUT),
+# que devuelve el espectro empaquetado en formato CCS con el mismo tamaño que
+# la entrada: aprox. 3x más rápida que np.fft.rfft2 y casi 10x más que la
+# fft2 compleja con fftshift (ver benchmarks/bench_fft.py). Como todas las
+# máscaras son reales y simétricas (M(k) == M(-k)), basta con repetir el valor
+# de cada frecuencia en sus posiciones Re/Im del formato empaquetado: no hace
+# falta fftshift/ifftshift ni reconstruir el espectro completo.
+
+
+def optimal_dft_shape(rows: int, cols: int) -> Tuple[int, int]:
+    """Tamaño de relleno más rápido para la DFT (cv2.getOptimalDFTSize)."""
+    return cv2.getOptimalDFTSize(rows), cv2.getOptimalDFTSize(cols)
+
+
+def _packed_frequencies(n: int) -> np.ndarray:
+    """Índice de frecuencia |k| de cada posición de una DFT real 1D empaquetada."""
+    return (np.arange(n) + 1) // 2
+
+
+def _ccs_frequency_grid(
+    padded_shape: Tuple[int, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Índices de frecuencia (|ky|, |kx|) de cada elemento del espectro CCS 2D.
+    La primera columna (y la última si el ancho es par) contiene columnas
+    reales empaquetadas a su vez en CCS; el resto son pares Re/Im de filas
+    con el espectro completo en vertical.
+    """
+    rows, cols = padded_shape
+    kx = _packed_frequencies(cols)
+    full_rows = np.arange(rows)
+    full_rows = np.minimum(full_rows, rows - full_rows)
+    packed_rows = _packed_frequencies(rows)
+
+    special = np.zeros(cols, dtype=bool)
+    special[0] = True
+    if cols % 2 == 0:
+        special[-1] = True
+    ky = np.where(special[None, :], packed_rows[:, None], full_rows[:, None])
+    return ky, np.broadcast_to(kx[None, :], padded_shape)
+
+
+def _lowpass_response(distance: np.ndarray, radius: float, profile: str) -> np.ndarray:
+    radius = max(radius, 1e-6)
+    if profile == "gaussian":
+        return np.exp(-(distance**2) / (2.0 * radius**2))
+    if profile == "butterworth":
+        return 1.0 / (1.0 + (distance / radius) ** (2 * BUTTERWORTH_ORDER))
+    return (distance <= radius).astype(np.float64)
+
+
+@lru_cache(maxsize=32)
+def frequency_mask(
+    image_shape: Tuple[int, int],
+    padded_shape: Tuple[int, int],
+    kind: str,
+    cutoff: float,
+    cutoff_high: float = 0.0,
+    profile: str = "ideal",
+) -> np.ndarray:
+    """
+    Máscara float32 en formato CCS, cacheada por (forma, corte, tipo, perfil).
+
+    Los cortes son fracciones de min(alto, ancho) de la imagen original, medidos
+    en índices de frecuencia de esa imagen (como el antiguo círculo de
+    apply_lowpass_fft), así que el relleno no cambia el radio efectivo.
+    """
+    if kind not in FFT_KINDS:
+        raise ValueError(f"Tipo de filtro FFT desconocido: '{kind}'.")
+    if profile not in FFT_PROFILES:
+        raise ValueError(f"Perfil de filtro FFT desconocido: '{profile}'.")
+
+    rows, cols = image_shape
+    ky, kx = _ccs_frequency_grid(padded_shape)
+    uy = ky * (rows / padded_shape[0])
+    ux = kx * (cols / padded_shape[1])
+    distance = np.hypot(uy, ux)
+    base = min(rows, cols)
+
+    if kind == "lowpass":
+        mask = _lowpass_response(distance, base * cutoff, profile)
+    elif kind == "highpass":
+        mask = 1.0 - _lowpass_response(distance, base * cutoff, profile)
+    else:
+        low, high = sorted((cutoff, cutoff_high))
+        mask = _lowpass_response(distance, base * high, profile) * (
+            1.0 - _lowpass_response(distance, base * low, profile)
+        )
+
+    mask = np.ascontiguousarray(mask, dtype=np.float32)
+    mask.setflags(write=False)
+    return mask
+
+
+def _filter_plane(plane: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    rows, cols = plane.shape
+    pad_rows, pad_cols = mask.shape
+    padded = cv2.copyMakeBorder(
+        plane, 0, pad_rows - rows, 0, pad_cols - cols, cv2.BORDER_REFLECT_101
+    )
+    spectrum = cv2.dft(np.float32(padded))
+    cv2.multiply(spectrum, mask, dst=spectrum)
+    back = cv2.dft(
+        spectrum, flags=cv2.DFT_INVERSE | cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT
+    )
+    # |x| saturado a uint8 en una pasada (equivale al antiguo np.abs + clip).
+    return cv2.convertScaleAbs(back[:rows, :cols])
+
+
+def apply_frequency_filter(
+    image: np.ndarray,
+    kind: str = "lowpass",
+    cutoff: float = 0.1,
+    cutoff_high: float = 0.0,
+    profile: str = "ideal",
+    per_channel: bool = False,
+    context: Optional[FrameContext] = None,
+    keep_gray: bool = False,
+) -> np.ndarray:
+    """
+    Filtra una imagen uint8 en el dominio de la frecuencia.
+
+    Las imágenes en gris devuelven gris. Las BGR se filtran por canal si
+    per_channel es True; si no, se filtra la luminancia y se devuelve en BGR
+    (comportamiento histórico de apply_lowpass_fft), o en gris si keep_gray.
+    """
+    rows, cols = image.shape[:2]
+    padded_shape = optimal_dft_shape(rows, cols)
+    mask = frequency_mask(
+        (rows, cols), padded_shape, kind, float(cutoff), float(cutoff_high), profile
+    )
+
+    if image.ndim == 2:
+        return _filter_plane(image, mask)
+    if image.shape[2] == 1:
+        return _filter_plane(image[:, :, 0], mask)
+    if per_channel:
+        return cv2.merge([_filter_plane(plane, mask) for plane in cv2.split(image)])
+    filtered = _filter_plane(to_gray(image, context), mask)
+    return filtered if keep_gray else gray_to_bgr(filtered, context)
@@ -1,18 +1,22 @@
 # processing/image_processing_worker.py
 
-import cv2
 import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal, QMutex
+from config.logging_config import get_logger
 from processing.image_processor import ImageProcessor
 
+log = get_logger("ImageProcessingWorker")
+
 
 class ImageProcessingWorker(QThread):
     """
     Hilo dedicado al procesamiento de imágenes en segundo plano.
-    Utiliza un ImageProcessor y emite señales con los resultados.
+    Utiliza un ImageProcessor y emite señales con los resultados: imagen,
+    histograma y versión de la pipeline que la produjo. La UI puede cambiar
+    la pipeline mientras tanto; cada frame usa una sola versión.
     """
 
-    processed_frame_ready = pyqtSignal(np.ndarray, np.ndarray)
+    processed_frame_ready = pyqtSignal(np.ndarray, np.ndarray, int)
     error_occurred = pyqtSignal(str)
 
     def __init__(
@@ -26,14 +30,14 @@ class ImageProcessingWorker(QThread):
         self._max_queue_size = max_queue_size
 
     def run(self):
-        print("[ImageProcessingWorker] Hilo iniciado.")
+        log.info("Hilo iniciado.")
         while self._running:
             frame = self._dequeue_frame()
             if frame is not None:
                 self._process_frame(frame)
             else:
                 self.msleep(1)
-        print("[ImageProcessingWorker] Hilo detenido.")
+        log.info("Hilo detenido.")
 
     def _dequeue_frame(self) -> np.ndarray:
         self._mutex.lock()
@@ -43,19 +47,18 @@ class ImageProcessingWorker(QThread):
 
     def _process_frame(self, frame: np.ndarray):
         try:
-            processed = self._image_processor.process_frame(frame)
-
-            if len(processed.shape) == 3:
-                gray = cv2.cvtColor(processed, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = processed
+            context = self._image_processor.process_frame_context(frame)
+            processed = context.image
 
-            hist = self._image_processor.get_histogram_data(gray)
-            self.processed_frame_ready.emit(processed, hist)
+            # El gris de la imagen final puede venir ya calculado por la pipeline.
+            hist = self._image_processor.get_histogram_data(context.gray())
+            self.processed_frame_ready.emit(
+                processed, hist, context.pipeline_version
+            )
 
         except Exception as e:
             self.error_occurred.emit(f"❌ Error procesando frame: {e}")
-            print(f"[ImageProcessingWorker] Error: {e}")
+            log.error("Error procesando frame: %s", e)
 
     def enqueue_frame(self, frame: np.ndarray):
         self._mutex.lock()
@@ -2,90 +2,445 @@
 
 import cv2
 import numpy as np
-import copy
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Mapping, Optional
+from config.logging_config import get_logger
 from processing import filters
-from processing.validation import validate_filter_params
+from processing.pipeline_compiler import compile_pipeline, run_compiled, timed_stages
+from processing.batch import BATCH_CHUNK_SIZE, process_batch
+from processing.buffer_pool import BufferPool
+from processing.dirty_tiles import DirtyTileRunner
+from processing.parallel_strips import StripRunner
+from processing.pipeline_graph import GraphRunner, compile_graph, is_graph, run_graph
+from processing.pipeline_snapshot import (
+    EMPTY_SNAPSHOT,
+    PipelineSnapshot,
+    freeze_entries,
+    freeze_graph,
+)
+from processing.frame_context import FrameContext
+from processing.lut3d import DEFAULT_LUT_SIZE
+from processing.scene_change import StaticSceneDetector
+from processing.stage_cache import (
+    StageCache,
+    frame_fingerprint,
+    prefix_keys,
+    run_incremental,
+)
 from skimage.metrics import (
     peak_signal_noise_ratio as psnr,
     structural_similarity as ssim,
 )
 
 
+# Error máximo (niveles por canal) que el optimizador puede introducir en la
+# salida de la pipeline en vivo, sumando todas sus reescrituras. Basta para
+# quitar adjust_saturation con factor 1 (redondeo HSV de ida y vuelta) si lo
+# que sigue no amplifica el error; las capturas usan siempre 0.
+LIVE_OPTIMIZER_TOLERANCE = 8
+
+log = get_logger("ImageProcessor")
+
+
 class ImageProcessor:
     def __init__(self):
-        self.pipeline = []
+        # Pipeline activa: instantánea inmutable que se sustituye entera (ver
+        # processing/pipeline_snapshot.py). El cerrojo solo ordena a quienes
+        # la cambian; el procesado de frames nunca lo toma.
+        self._snapshot = EMPTY_SNAPSHOT
+        self._publish_lock = threading.Lock()
+        # Versión para imágenes fijas: (versión, etapas, claves), al pedirla.
+        self._compiled_still = None
+        # Versión con la que se procesó el último frame en vivo.
+        self._frame_version = 0
+        self.buffer_pool = BufferPool()
+        self.stage_cache = StageCache()
+        # Reutilizar la salida anterior si la escena en vivo no cambia (opt-in:
+        # lo activa la ventana principal).
+        self.skip_static_frames = False
+        self.scene_detector = StaticSceneDetector()
+        self._last_context = None
+        # Recalcular solo las teselas que cambian (pipelines locales, opt-in).
+        self.tiled_mode = False
+        self.tile_runner = DirtyTileRunner()
+        # Reparto del frame en franjas entre hilos (None = un solo hilo).
+        self.strip_runner = None
+        # Hilos para las ramas de las pipelines en grafo (se crean al usarlas).
+        self.graph_runner = None
+        self.bake_color_luts = False
+        self.lut3d_size = DEFAULT_LUT_SIZE
+        self.optimizer_tolerance = LIVE_OPTIMIZER_TOLERANCE
+        # Segundos acumulados por etapa compilada (None = sin medir).
+        self.stage_timings = None
         self.available_filters = {
             name: info["function"] for name, info in filters.FILTER_METADATA.items()
         }
-        print(
-            f"[ImageProcessor] Filtros disponibles: {list(self.available_filters.keys())}"
-        )
+        log.debug("Filtros disponibles: %s", list(self.available_filters))
 
     def add_filter(self, filter_name: str, params: dict = None, index: int = None):
         if filter_name not in self.available_filters:
-            print(f"[⚠️] Filtro '{filter_name}' no disponible.")
+            log.warning("Filtro '%s' no disponible.", filter_name)
             return
 
         if params is None:
             params = filters.get_default_filter_params(filter_name)
 
         entry = {"name": filter_name, "params": params, "enabled": True}
-        if index is None:
-            self.pipeline.append(entry)
-        else:
-            self.pipeline.insert(index, entry)
-        print(f"[+] Filtro '{filter_name}' añadido. Pipeline actual: {self.pipeline}")
+        with self._publish_lock:
+            if self._is_graph_locked():
+                return
+            pipeline = list(self._snapshot.pipeline)
+            if index is None:
+                pipeline.append(entry)
+            else:
+                pipeline.insert(index, entry)
+            self._publish(pipeline)
+        log.info("Filtro '%s' añadido.", filter_name)
+        log.debug("Pipeline actual: %s", self._snapshot.pipeline)
 
     def remove_filter(self, index: int):
-        if 0 <= index < len(self.pipeline):
-            removed = self.pipeline.pop(index)
-            print(f"[-] Filtro '{removed['name']}' eliminado.")
-        else:
-            print(f"[⚠️] Índice {index} fuera de rango.")
+        with self._publish_lock:
+            if self._is_graph_locked():
+                return
+            pipeline = list(self._snapshot.pipeline)
+            if not 0 <= index < len(pipeline):
+                log.warning("Índice %s fuera de rango.", index)
+                return
+            removed = pipeline.pop(index)
+            self._publish(pipeline)
+        log.info("Filtro '%s' eliminado.", removed["name"])
 
     def reorder_filter(self, old_index: int, new_index: int):
-        if 0 <= old_index < len(self.pipeline) and 0 <= new_index < len(self.pipeline):
-            f = self.pipeline.pop(old_index)
-            self.pipeline.insert(new_index, f)
-            print(f"[↔️] Filtro reordenado: {old_index} → {new_index}")
+        with self._publish_lock:
+            if self._is_graph_locked():
+                return
+            pipeline = list(self._snapshot.pipeline)
+            if not (0 <= old_index < len(pipeline) and 0 <= new_index < len(pipeline)):
+                log.warning(
+                    "Reordenamiento inválido (%s → %s).", old_index, new_index
+                )
+                return
+            pipeline.insert(new_index, pipeline.pop(old_index))
+            self._publish(pipeline)
+        log.info("Filtro reordenado: %s → %s", old_index, new_index)
+
+    @property
+    def pipeline(self) -> List[Mapping[str, Any]]:
+        """Configuración de la versión activa (solo lectura: ver get_pipeline)."""
+        return list(self._snapshot.pipeline)
+
+    @property
+    def pipeline_version(self) -> int:
+        """Versión activa; cada cambio de la pipeline publica una nueva."""
+        return self._snapshot.version
+
+    @property
+    def optimization_steps(self) -> list:
+        return list(self._snapshot.optimization_steps)
+
+    @property
+    def _compiled(self) -> tuple:
+        return self._snapshot.compiled
+
+    def snapshot(self) -> PipelineSnapshot:
+        """Instantánea activa: seguirá siendo la misma aunque la UI la cambie."""
+        return self._snapshot
+
+    def _is_graph_locked(self) -> bool:
+        if self._snapshot.graph is None:
+            return False
+        log.warning("La pipeline activa es un grafo: se edita con set_pipeline.")
+        return True
+
+    def _recompile(self):
+        """Vuelve a publicar la configuración activa (cambió una opción)."""
+        with self._publish_lock:
+            snapshot = self._snapshot
+            self._publish(
+                snapshot.pipeline if snapshot.graph is None else snapshot.graph.config
+            )
+
+    def _publish(self, pipeline):
+        """
+        Compila la pipeline (lista o grafo) una sola vez, validación incluida,
+        la optimiza con la tolerancia en vivo y la publica como una nueva
+        instantánea. Llamar con _publish_lock tomado. Con un grafo no válido
+        lanza ValueError sin publicar nada.
+        """
+        steps = []
+        options = dict(
+            bake_luts=self.bake_color_luts,
+            lut_size=self.lut3d_size,
+            live=True,
+            tolerance=self.optimizer_tolerance,
+            explain=steps,
+        )
+        graph = None
+        if is_graph(pipeline):
+            graph = compile_graph(pipeline, self.available_filters, **options)
+            graph = freeze_graph(graph)
+            entries, compiled = graph.config["nodes"], ()
         else:
-            print(f"[⚠️] Reordenamiento inválido.")
+            entries = freeze_entries(pipeline)
+            compiled = compile_pipeline(entries, self.available_filters, **options)
+            if self.stage_timings is not None:
+                compiled = timed_stages(compiled, self.stage_timings)
+        for step in steps:
+            log.debug("Optimizador: %s", step.explain())
+        self._snapshot = PipelineSnapshot(
+            self._snapshot.version + 1, entries, compiled, tuple(steps), graph
+        )
+
+    def set_stage_timings(self, totals: Optional[Dict[str, float]]):
+        """
+        Mide cada etapa compilada de las pipelines lineales (en vivo y
+        process_batch): acumula en `totals` los segundos por nombre de etapa.
+        None deja de medir.
+        """
+        self.stage_timings = totals
+        self._recompile()
+
+    def set_optimizer_tolerance(self, levels: int = None):
+        """Tolerancia (niveles) del optimizador en vivo; None lo desactiva."""
+        self.optimizer_tolerance = None if levels is None else int(levels)
+        self._recompile()
+
+    def explain_optimization(self) -> List[str]:
+        """Qué quitó el optimizador de la pipeline en vivo y por qué."""
+        return [step.explain() for step in self.optimization_steps]
+
+    @property
+    def has_live_stages(self) -> bool:
+        """
+        True si la pipeline en vivo no da exactamente lo mismo que en fijo: por
+        etapas con estado o por reescrituras aproximadas del optimizador.
+        """
+        snapshot = self._snapshot
+        if any(step.max_error > 0 for step in snapshot.optimization_steps):
+            return True
+        return any(
+            "live_function" in filters.FILTER_METADATA.get(entry["name"], {})
+            for entry in snapshot.pipeline
+            if entry.get("enabled", True)
+        )
+
+    def estimate_cost_ms(self, shape=(1080, 1920), live: bool = True) -> float:
+        """Coste estimado (ms por frame) de la pipeline activa según FILTER_METADATA."""
+        return sum(
+            filters.estimate_filter_cost(entry["name"], entry.get("params"), shape, live)
+            for entry in self._snapshot.pipeline
+            if entry.get("enabled", True)
+        )
+
+    def set_color_baking(self, enabled: bool, lut_size: int = None):
+        """
+        Activa el horneado de rachas de filtros de color en una LUT 3D.
+        Es una aproximación (interpolada) más rápida en cadenas largas de color.
+        """
+        self.bake_color_luts = enabled
+        if lut_size is not None:
+            self.lut3d_size = int(lut_size)
+        self._recompile()
 
     def process_frame(self, frame: np.ndarray) -> np.ndarray:
-        processed = frame.copy()
-        for entry in self.pipeline:
-            if not entry.get("enabled", True):
-                continue
-            name = entry["name"]
-            raw_params = entry.get("params", {})
-            params = validate_filter_params(name, raw_params)
-            func = self.available_filters.get(name)
-            if func:
-                try:
-                    processed = func(processed, **params)
-                except Exception as e:
-                    print(f"[❌] Error en filtro '{name}': {e}")
-            else:
-                print(f"[⚠️] Función para '{name}' no encontrada.")
-        return processed
+        return self.process_frame_context(frame).image
+
+    def release_frame(self, image: np.ndarray):
+        """
+        Devuelve al BufferPool un frame de salida que ya no se usa (p. ej. tras
+        escribirlo en el vídeo). Los frames que no se devuelven no se reutilizan
+        nunca: el visor, el histograma o la caché pueden quedárselos.
+        """
+        last = self._last_context
+        if last is not None and image is last.image:
+            return  # lo reutiliza el salto de frames estáticos
+        snapshot = self._snapshot
+        if snapshot.graph is not None or any(s.stateful for s in snapshot.compiled):
+            return  # no sale del pool, o una etapa con estado puede guardarlo
+        self.buffer_pool.release(image)
+
+    def process_frame_context(self, frame: np.ndarray) -> FrameContext:
+        """
+        Procesa un frame y devuelve su FrameContext: la imagen final junto con
+        las representaciones (gris, HSV...) ya calculadas por la pipeline, para
+        que el histograma y las métricas no vuelvan a convertirla.
+
+        Con skip_static_frames, si la escena no ha cambiado desde el último
+        frame procesado se devuelve el mismo FrameContext (el llamador puede
+        comprobarlo con `is` y reutilizar también sus métricas).
+
+        El frame se procesa entero con la instantánea activa al empezar, aunque
+        otro hilo publique una nueva mientras tanto; su versión queda en
+        context.pipeline_version.
+        """
+        snapshot = self._snapshot
+        if snapshot.version != self._frame_version:
+            # Primera vez con esta versión: lo guardado de la anterior no vale.
+            self._frame_version = snapshot.version
+            self._last_context = None
+            self.scene_detector.reset()
+            self.tile_runner.reset()
+        detector = self.scene_detector if self.skip_static_frames else None
+        if (
+            detector is not None
+            and self._last_context is not None
+            and detector.should_skip(frame)
+        ):
+            return self._last_context
+        start = time.perf_counter()
+        stages = snapshot.compiled
+        if snapshot.graph is not None:
+            if self.graph_runner is None:
+                self.graph_runner = GraphRunner()
+            output = self.graph_runner.run(snapshot.graph, frame)
+            context = FrameContext(_first_output(output))
+        elif self.tiled_mode:
+            # Salida de solo lectura, reutilizada por las teselas sin cambios.
+            context = FrameContext(self.tile_runner.run(stages, frame))
+        elif self.strip_runner is not None:
+            context = FrameContext(self.buffer_pool.copy_of(frame))
+            self.strip_runner.run(
+                stages, context.image, context, self.buffer_pool, owns_input=True
+            )
+        else:
+            context = FrameContext(self.buffer_pool.copy_of(frame))
+            run_compiled(
+                stages, context.image, context, self.buffer_pool, owns_input=True
+            )
+        context.pipeline_version = snapshot.version
+        if detector is not None:
+            detector.record_processed((time.perf_counter() - start) * 1000.0)
+            self._last_context = context
+        return context
+
+    def set_tiled_mode(self, enabled: bool, tile_size: int = None):
+        """
+        Activa el modo por teselas en vivo: solo se recalculan las teselas que
+        cambian (con las pipelines no locales se procesa el frame entero).
+        """
+        self.tiled_mode = enabled
+        if tile_size is not None:
+            self.tile_runner = DirtyTileRunner(tile_size)
+        self.tile_runner.reset()
+
+    def set_parallel_strips(self, enabled: bool, workers: int = None):
+        """
+        Reparte cada frame en vivo en franjas horizontales procesadas en
+        paralelo (workers hilos; por defecto, uno por núcleo). Solo las
+        pipelines locales se reparten; el resultado es el mismo.
+        """
+        if self.strip_runner is not None:
+            self.strip_runner.shutdown()
+        self.strip_runner = StripRunner(workers) if enabled else None
+
+    def shutdown(self):
+        """Detiene los hilos de franjas y de ramas de grafos (al cerrar)."""
+        self.set_parallel_strips(False)
+        if self.graph_runner is not None:
+            self.graph_runner.shutdown()
+            self.graph_runner = None
+
+    def set_static_frame_skipping(self, enabled: bool):
+        """Activa o desactiva el salto de frames en vivo sin cambios."""
+        self.skip_static_frames = enabled
+        self._last_context = None
+        self.scene_detector.reset()
+
+    def process_still(self, frame: np.ndarray, frame_id=None) -> np.ndarray:
+        """
+        Procesa una imagen fija (captura, cámara en pausa) con la calidad
+        completa: sin el estado entre frames de las etapas en vivo.
+
+        La salida de cada etapa se guarda en stage_cache por (frame_id, prefijo
+        de la pipeline): al volver a procesar el mismo frame tras cambiar la
+        etapa k solo se recalculan k..n. frame_id identifica el contenido del
+        frame (si falta, se calcula un hash). El resultado es de solo lectura.
+        """
+        snapshot = self._snapshot
+        compiled = self._compiled_still
+        if snapshot.graph is not None:
+            # Grafos: sin caché de etapas (las ramas no son prefijos).
+            if compiled is None or compiled[0] != snapshot.version:
+                graph = compile_graph(
+                    snapshot.graph.config,
+                    self.available_filters,
+                    bake_luts=self.bake_color_luts,
+                    lut_size=self.lut3d_size,
+                    tolerance=0,
+                )
+                compiled = (snapshot.version, graph)
+                self._compiled_still = compiled
+            return _first_output(run_graph(compiled[1], frame))
+        if compiled is None or compiled[0] != snapshot.version:
+            stages = compile_pipeline(
+                snapshot.pipeline,
+                self.available_filters,
+                bake_luts=self.bake_color_luts,
+                lut_size=self.lut3d_size,
+                tolerance=0,
+            )
+            compiled = (snapshot.version, stages, prefix_keys(stages))
+            self._compiled_still = compiled
+        return self._run_cached(*compiled[1:], frame, frame_id)
 
     def apply_custom_pipeline(
-        self, frame: np.ndarray, pipeline: List[Dict[str, Any]]
+        self, frame: np.ndarray, pipeline: List[Dict[str, Any]], frame_id=None
     ) -> np.ndarray:
-        processed = frame.copy()
-        for entry in pipeline:
-            name = entry.get("name")
-            raw_params = entry.get("params", {})
-            if name not in self.available_filters:
-                print(f"[⚠️] Filtro '{name}' no disponible.")
-                continue
-            params = validate_filter_params(name, raw_params)
-            try:
-                processed = self.available_filters[name](processed, **params)
-            except Exception as e:
-                print(f"[❌] Error aplicando '{name}': {e}")
-        return processed
+        """
+        Como process_still, con otra pipeline (vistas previas del LLM). Con un
+        grafo de varias salidas devuelve un dict id -> imagen.
+        """
+        if is_graph(pipeline):
+            return run_graph(compile_graph(pipeline, self.available_filters), frame)
+        stages = compile_pipeline(pipeline, self.available_filters)
+        return self._run_cached(stages, prefix_keys(stages), frame, frame_id)
+
+    def process_batch(
+        self,
+        frames,
+        pipeline: List[Dict[str, Any]] = None,
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        workers: int = None,
+    ):
+        """
+        Procesa sin conexión una pila (N, H, W, C) o un iterable de frames con
+        la pipeline actual (u otra) y calidad completa, como process_still.
+        Devuelve un generador perezoso con los resultados en orden (ver
+        processing/batch.py). Los grafos se procesan frame a frame.
+        """
+        if pipeline is None:
+            snapshot = self._snapshot
+            graph = snapshot.graph
+            pipeline = snapshot.pipeline if graph is None else graph.config
+        if is_graph(pipeline):
+            graph = compile_graph(
+                pipeline,
+                self.available_filters,
+                bake_luts=self.bake_color_luts,
+                lut_size=self.lut3d_size,
+                tolerance=0,
+            )
+            return (_first_output(run_graph(graph, frame)) for frame in frames)
+        stages = compile_pipeline(
+            pipeline,
+            self.available_filters,
+            bake_luts=self.bake_color_luts,
+            lut_size=self.lut3d_size,
+            tolerance=0,
+        )
+        if self.stage_timings is not None:
+            stages = timed_stages(stages, self.stage_timings)
+        return process_batch(stages, frames, chunk_size, workers)
+
+    def _run_cached(self, stages, keys, frame, frame_id) -> np.ndarray:
+        if frame_id is None:
+            frame_id = frame_fingerprint(frame)
+        return run_incremental(stages, keys, frame, self.stage_cache, frame_id)
+
+    def set_stage_cache_budget(self, max_bytes: int):
+        """Memoria máxima (bytes) de la caché de etapas; 0 la desactiva."""
+        self.stage_cache.set_budget(int(max_bytes))
 
     def get_histogram_data(self, gray_image: np.ndarray) -> np.ndarray:
         if gray_image is None or gray_image.size == 0:
@@ -95,23 +450,40 @@ class ImageProcessor:
         hist = cv2.calcHist([gray_image], [0], None, [256], [0, 256])
         return hist.flatten()
 
-    def set_pipeline(self, pipeline_config: list):
+    def set_pipeline(self, pipeline_config):
+        """
+        Publica una pipeline: lista de filtros o grafo (ver
+        processing/pipeline_graph.py). Un grafo no válido se descarta con un
+        error en el registro y la pipeline activa no cambia.
+        """
+        if is_graph(pipeline_config):
+            try:
+                with self._publish_lock:
+                    self._publish(pipeline_config)
+            except ValueError as e:
+                log.error("%s", e)
+                return
+            log.debug("Grafo configurado (v%d).", self.pipeline_version)
+            return
         validated = []
         for entry in pipeline_config:
             name = entry.get("name")
             if name not in self.available_filters:
-                print(f"[⚠️] Filtro '{name}' no reconocido. Omitido.")
+                log.warning("Filtro '%s' no reconocido. Omitido.", name)
                 continue
             enabled = entry.get("enabled", True)
             params = entry.get("params", {})
             if "enabled" in params:
                 del params["enabled"]
             validated.append({"name": name, "params": params, "enabled": enabled})
-        self.pipeline = validated
-        print(f"[✓] Pipeline configurado: {self.pipeline}")
+        with self._publish_lock:
+            self._publish(validated)
+        # Se llama en cada movimiento de un slider: el detalle, solo en DEBUG.
+        log.debug("Pipeline configurada (v%d): %s", self.pipeline_version, validated)
 
-    def get_pipeline(self) -> list:
-        return copy.deepcopy(self.pipeline)
+    def get_pipeline(self):
+        """Copia de la pipeline activa: lista de filtros o grafo (dict)."""
+        return self._snapshot.entries()
 
     def compute_metrics(
         self, original: np.ndarray, processed: np.ndarray
@@ -126,3 +498,8 @@ class ImageProcessor:
     @property
     def filter_metadata(self):
         return filters.FILTER_METADATA
+
+
+def _first_output(output):
+    """La imagen de un grafo de varias salidas que se muestra: la primera."""
+    return next(iter(output.values())) if isinstance(output, dict) else output
@@ -0,0 +1,166 @@
+# processing/lut3d.py
+
+import os
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+import cv2
+import numpy as np
+from config.logging_config import get_logger
+
+DEFAULT_LUT_SIZE = 33
+
+log = get_logger("LUT3D")
+
+_reported_missing = set()
+
+
+# --- Geometría de la tabla ---
+#
+# La LUT 3D se guarda como una imagen 2D uint8 de (256 * N, N, C): la fila es
+# b * N + g_idx y la columna es r_idx; los canales son la salida (BGR, o 1 canal
+# si la sub-pipeline termina en escala de grises). Los ejes G y R se muestrean
+# en una rejilla de N puntos y el eje B se guarda con los 256 niveles, de modo
+# que la interpolación trilineal degenera en una bilineal dentro del corte de b
+# exacto: un único cv2.remap por frame. La variante con B muestreado necesita
+# dos remap y una mezcla y resultó más lenta que la propia cadena de filtros
+# (ver benchmarks/bench_lut3d.py).
+
+
+def lut_grid_values(size: int) -> np.ndarray:
+    """Valores de entrada (uint8) muestreados en los ejes G y R de la rejilla."""
+    return np.round(np.linspace(0.0, 255.0, size)).astype(np.uint8)
+
+
+def sample_cube(size: int) -> np.ndarray:
+    """
+    Imagen BGR que contiene cada punto de la rejilla 256 x N x N una vez, en la
+    misma disposición (256 * N, N, 3) que la tabla.
+    """
+    grid = lut_grid_values(size)
+    levels = np.arange(256, dtype=np.uint8)
+    b, g, r = np.meshgrid(levels, grid, grid, indexing="ij")
+    cube = np.stack([b, g, r], axis=-1)
+    return np.ascontiguousarray(cube.reshape(256 * size, size, 3))
+
+
+def bake_lut3d(
+    color_fn: Callable[[np.ndarray], np.ndarray], size: int = DEFAULT_LUT_SIZE
+) -> np.ndarray:
+    """
+    Hornea una función de color (que solo depende del valor BGR de cada píxel)
+    en una tabla (256 * N, N, C). La función se ejecuta una única vez sobre la
+    rejilla, no por frame.
+    """
+    if size < 2:
+        raise ValueError("El tamaño de la LUT 3D debe ser al menos 2.")
+    baked = color_fn(sample_cube(size))
+    baked = np.ascontiguousarray(baked, dtype=np.uint8)
+    if baked.shape[:2] != (256 * size, size):
+        raise ValueError("La función horneada cambió la geometría de la imagen.")
+    baked.setflags(write=False)
+    return baked
+
+
+@lru_cache(maxsize=16)
+def _axis_tables(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tablas de 256 entradas (float32) que convierten un valor uint8 en
+    coordenadas de la tabla: posición continua en la rejilla (ejes G y R) y
+    fila base del corte de b.
+    """
+    pos = np.arange(256, dtype=np.float64) * (size - 1) / 255.0
+    rows = np.arange(256, dtype=np.float64) * size
+    return pos.astype(np.float32), rows.astype(np.float32)
+
+
+def apply_lut3d(
+    image: np.ndarray, table: np.ndarray, dst: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Aplica una LUT 3D (disposición (256 * N, N, C)) a una imagen BGR uint8.
+    """
+    pos, rows = _axis_tables(table.shape[1])
+    b, g, r = cv2.split(image)
+    map_x = cv2.LUT(r, pos)
+    map_y = cv2.add(cv2.LUT(g, pos), cv2.LUT(b, rows))
+    return cv2.remap(
+        table,
+        map_x,
+        map_y,
+        cv2.INTER_LINEAR,
+        dst=dst,
+        borderMode=cv2.BORDER_REPLICATE,
+    )
+
+
+# --- Ficheros .cube ---
+
+
+@lru_cache(maxsize=8)
+def _load_cube_cached(path: str, mtime: float) -> Optional[np.ndarray]:
+    size = None
+    domain_min = np.zeros(3, dtype=np.float64)
+    domain_max = np.ones(3, dtype=np.float64)
+    rows = []
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                tokens = line.split()
+                key = tokens[0].upper()
+                if key == "LUT_3D_SIZE":
+                    size = int(tokens[1])
+                elif key == "DOMAIN_MIN":
+                    domain_min = np.array(tokens[1:4], dtype=np.float64)
+                elif key == "DOMAIN_MAX":
+                    domain_max = np.array(tokens[1:4], dtype=np.float64)
+                elif key == "LUT_1D_SIZE":
+                    log.warning("LUT 1D no soportada en '%s'.", path)
+                    return None
+                elif key[0].isalpha():
+                    continue  # TITLE, LUT_3D_INPUT_RANGE, etc.
+                else:
+                    rows.append(tokens[:3])
+    except (OSError, ValueError) as e:
+        log.error("Error al leer LUT '%s': %s", path, e)
+        return None
+
+    if size is None or len(rows) != size**3:
+        log.warning("Fichero .cube inválido: '%s'.", path)
+        return None
+
+    # .cube: R varía más rápido, luego G, luego B -> (b, g, r, rgb).
+    data = np.asarray(rows, dtype=np.float64)
+    data = (data - domain_min) / np.maximum(domain_max - domain_min, 1e-12)
+    data = data.reshape(size, size, size, 3)[..., ::-1] * 255.0
+
+    # Se interpola el eje B hasta los 256 niveles de la disposición interna.
+    pos = np.arange(256, dtype=np.float64) * (size - 1) / 255.0
+    b0 = np.minimum(np.floor(pos).astype(int), size - 2)
+    frac = (pos - b0)[:, None, None, None]
+    expanded = data[b0] * (1.0 - frac) + data[b0 + 1] * frac
+
+    table = np.clip(expanded + 0.5, 0, 255).astype(np.uint8)
+    table = np.ascontiguousarray(table.reshape(256 * size, size, 3))
+    table.setflags(write=False)
+    return table
+
+
+def load_cube_file(path: str) -> Optional[np.ndarray]:
+    """
+    Carga un fichero .cube (Adobe/Resolve) como tabla (256 * N, N, 3) BGR.
+    Se cachea por (ruta, mtime): editar el fichero fuerza la recarga.
+    Devuelve None si el fichero no existe o no es válido.
+    """
+    if not path:
+        return None
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        if path not in _reported_missing:
+            _reported_missing.add(path)
+            log.warning("LUT no encontrada: '%s'.", path)
+        return None
+    return _load_cube_cached(path, mtime)
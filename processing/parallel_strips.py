@@ -0,0 +1,111 @@
+# processing/parallel_strips.py
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from processing.buffer_pool import BufferPool
+from processing.dirty_tiles import pipeline_radius
+from processing.frame_context import FrameContext
+from processing.pipeline_compiler import CompiledStage, run_compiled
+
+# Una franja no baja de estas filas (ni de 4 veces el halo): con franjas más
+# finas el margen repetido y el reparto cuestan más de lo que se gana.
+MIN_STRIP_ROWS = 64
+
+
+class StripRunner:
+    """
+    Ejecuta una pipeline local repartiendo el frame en franjas horizontales
+    entre hilos. Cada franja se procesa con un margen de filas igual al radio
+    total de la pipeline (suma de los "radius" de FILTER_METADATA), así que el
+    resultado es idéntico al de una pasada completa.
+
+    Si la última etapa es puntual (radio 0) y admite dst, se aplica solo a las
+    filas propias de la franja y escribe directamente en su vista de la salida
+    preasignada. Si no, la franja (con margen) se calcula aparte y sus filas
+    propias se copian a la salida: una copia por franja.
+
+    OpenCV y NumPy liberan el GIL en sus bucles, así que las etapas avanzan en
+    paralelo de verdad. Las pipelines no locales se ejecutan enteras.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_rows: int = MIN_STRIP_ROWS):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.min_rows = min_rows
+        self._executor = (
+            ThreadPoolExecutor(self.workers, thread_name_prefix="strips")
+            if self.workers > 1
+            else None
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def strips(self, rows: int, halo: int) -> List[Tuple[int, int]]:
+        """Límites (inicio, fin) de las franjas en que se reparte un frame."""
+        tallest = max(self.min_rows, 4 * halo)
+        count = max(1, min(self.workers, rows // tallest))
+        bounds = np.linspace(0, rows, count + 1).astype(int)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def run(
+        self,
+        stages: Sequence[CompiledStage],
+        frame: np.ndarray,
+        context: Optional[FrameContext] = None,
+        pool: Optional[BufferPool] = None,
+        owns_input: bool = False,
+    ) -> np.ndarray:
+        """
+        Como run_compiled. En paralelo las etapas no comparten el FrameContext
+        (cada franja convierte lo suyo); al terminar describe la salida y, con
+        owns_input, el frame de entrada vuelve al pool.
+        """
+        halo = pipeline_radius(stages)
+        strips = [] if halo is None else self.strips(frame.shape[0], halo)
+        if self._executor is None or len(strips) < 2:
+            return run_compiled(stages, frame, context, pool, owns_input=owns_input)
+
+        rows = frame.shape[0]
+        lock = threading.Lock()
+        output: List[np.ndarray] = []
+        last = stages[-1]
+        direct = last.supports_dst and last.radius == 0
+        head = stages[:-1] if direct else stages
+
+        def output_rows(y0: int, y1: int, sample: np.ndarray) -> np.ndarray:
+            with lock:
+                # La disposición (gris/BGR) de la salida se conoce al terminar
+                # la primera franja (sin la última etapa si es directa).
+                if not output:
+                    shape = (rows,) + sample.shape[1:]
+                    if direct and last.emits != "input":
+                        shape = shape[:2] + ((3,) if last.emits == "bgr" else ())
+                    output.append(
+                        pool.acquire(shape, sample.dtype)
+                        if pool is not None
+                        else np.empty(shape, sample.dtype)
+                    )
+            return output[0][y0:y1]
+
+        def run_strip(y0: int, y1: int):
+            py0, py1 = max(0, y0 - halo), min(rows, y1 + halo)
+            result = run_compiled(head, frame[py0:py1])[y0 - py0 : y1 - py0]
+            target = output_rows(y0, y1, result)
+            if direct:
+                result = run_compiled((last,), result, dst=target)
+            if result is not target:
+                np.copyto(target, result)
+
+        futures = [self._executor.submit(run_strip, y0, y1) for y0, y1 in strips]
+        for future in futures:
+            future.result()
+        if context is not None:
+            context.update(output[0])
+        if owns_input and pool is not None:
+            pool.release(frame)
+        return output[0]
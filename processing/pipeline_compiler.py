@@ -0,0 +1,504 @@
+# processing/pipeline_compiler.py
+
+import threading
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+import cv2
+import numpy as np
+from config.logging_config import get_logger
+from processing.filters import FILTER_METADATA, get_filter_capabilities
+from processing.buffer_pool import BufferPool
+from processing.frame_context import FrameContext, gray_to_bgr
+from processing.lut3d import DEFAULT_LUT_SIZE, apply_lut3d, bake_lut3d
+from processing.pipeline_optimizer import OptimizationStep, optimize_stages
+from processing.validation import validate_filter_params
+
+log = get_logger("PipelineCompiler")
+
+
+class CompiledStage(NamedTuple):
+    """
+    Etapa de pipeline lista para ejecutarse: la función ya está resuelta y
+    los parámetros ya fueron validados (y congelados) una única vez.
+    uses_context indica que la función recibe el FrameContext del frame y
+    supports_dst que acepta un buffer de salida preasignado (`dst`).
+    accepts_gray, emits y keep_gray describen la disposición de canales
+    (ver FILTER_METADATA en processing/filters.py). radius es el halo (px)
+    que necesita la etapa con sus parámetros, o None si no es local.
+    stateful indica que la función puede guardar referencias a sus entradas
+    entre llamadas (instancias "live_function", funciones sin metadatos): su
+    entrada nunca se devuelve al BufferPool.
+    """
+
+    name: str
+    func: Callable[..., np.ndarray]
+    params: Mapping[str, Any]
+    uses_context: bool = False
+    supports_dst: bool = False
+    accepts_gray: bool = False
+    emits: str = "input"
+    keep_gray: bool = False
+    radius: Optional[int] = None
+    stateful: bool = False
+
+
+def _default_functions() -> Dict[str, Callable[..., np.ndarray]]:
+    return {name: info["function"] for name, info in FILTER_METADATA.items()}
+
+
+def compile_stage(
+    name: str,
+    raw_params: Optional[dict] = None,
+    available_filters: Optional[Mapping[str, Callable]] = None,
+    live: bool = False,
+) -> Optional[CompiledStage]:
+    """
+    Resuelve y valida una sola etapa. Devuelve None si el filtro no existe.
+    Con live=True, los filtros con "live_function" obtienen una instancia
+    propia con estado (p. ej. denoise temporal) en lugar de la función.
+    """
+    functions = available_filters or _default_functions()
+    func = functions.get(name)
+    if func is None:
+        log.warning("Filtro '%s' no disponible.", name)
+        return None
+    params = validate_filter_params(name, dict(raw_params or {}))
+    caps = get_filter_capabilities(name)
+    if caps is None:  # función registrada fuera de FILTER_METADATA
+        return CompiledStage(name, func, MappingProxyType(params), stateful=True)
+    live_factory = caps["live_function"]
+    radius = caps["radius"]
+    if callable(radius):
+        radius = radius(params)
+    stateful = live and live_factory is not None
+    if stateful:
+        func = live_factory()
+        radius = None  # con estado entre frames: no se puede teselar
+    return CompiledStage(
+        name,
+        func,
+        MappingProxyType(params),
+        caps["uses_context"],
+        caps["supports_dst"] and live_factory is None,
+        caps["accepts_gray"],
+        caps["emits"],
+        caps["keep_gray"],
+        radius,
+        stateful,
+    )
+
+
+# --- Point-op fusion ---
+
+_IDENTITY_RAMP = np.arange(256, dtype=np.uint8).reshape(256, 1)
+
+
+def _freeze_params(params: Mapping[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    return tuple(sorted(params.items()))
+
+
+@lru_cache(maxsize=256)
+def _point_op_lut(name: str, frozen_params: Tuple[Tuple[str, Any], ...]) -> np.ndarray:
+    """
+    Tabla de 256 entradas equivalente a un filtro puntual. Se obtiene aplicando
+    el propio filtro a una rampa 0..255, así que el resultado es bit a bit el
+    mismo que ejecutar el filtro. Se cachea por (filtro, parámetros): solo se
+    recalcula cuando cambia algún parámetro.
+    """
+    func = FILTER_METADATA[name]["function"]
+    table = func(_IDENTITY_RAMP, **dict(frozen_params))
+    table = np.ascontiguousarray(table, dtype=np.uint8).reshape(256)
+    table.setflags(write=False)
+    return table
+
+
+def apply_lut(
+    image: np.ndarray, lut: np.ndarray, dst: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Aplica una tabla de 256 entradas a todos los canales en una sola pasada."""
+    return cv2.LUT(image, lut, dst=dst)
+
+
+def apply_scale_abs(
+    image: np.ndarray, alpha: float, beta: float, dst: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Mapa afín saturado |alpha * x + beta| en una sola pasada SIMD."""
+    return cv2.convertScaleAbs(image, dst=dst, alpha=alpha, beta=beta)
+
+
+def _has_capability(stage: CompiledStage, capability: str) -> bool:
+    caps = get_filter_capabilities(stage.name)
+    return caps is not None and bool(caps[capability])
+
+
+def _is_point_op(stage: CompiledStage) -> bool:
+    return _has_capability(stage, "point_op")
+
+
+def _affine_equivalent(
+    run: List[CompiledStage], lut: np.ndarray
+) -> Optional[Tuple[float, float]]:
+    """
+    Si todas las etapas declaran su forma afín, compone (alpha, beta) y
+    comprueba sobre la rampa completa que un único convertScaleAbs reproduce
+    exactamente la tabla fusionada (la saturación intermedia puede romperlo).
+    """
+    alpha, beta = 1.0, 0.0
+    for stage in run:
+        affine = FILTER_METADATA[stage.name].get("affine")
+        if affine is None:
+            return None
+        a, b = affine(stage.params)
+        alpha, beta = a * alpha, a * beta + b
+    candidate = cv2.convertScaleAbs(_IDENTITY_RAMP, alpha=alpha, beta=beta)
+    if np.array_equal(candidate.reshape(256), lut):
+        return alpha, beta
+    return None
+
+
+def _fuse_run(run: List[CompiledStage]) -> CompiledStage:
+    lut = None
+    for stage in run:
+        table = _point_op_lut(stage.name, _freeze_params(stage.params))
+        lut = table if lut is None else table[lut]
+    label = "+".join(stage.name for stage in run)
+
+    # cv2.LUT es un gather, no un kernel SIMD: cuesta lo que dos o tres filtros
+    # puntuales baratos (ver benchmarks/bench_lut_fusion.py). Si la racha es
+    # afín de forma exacta, una sola pasada de convertScaleAbs es más rápida.
+    affine = _affine_equivalent(run, lut)
+    if affine is not None:
+        alpha, beta = affine
+        return CompiledStage(
+            f"fused_affine({label})",
+            apply_scale_abs,
+            MappingProxyType({"alpha": alpha, "beta": beta}),
+            supports_dst=True,
+            accepts_gray=True,
+            radius=0,
+        )
+    return CompiledStage(
+        f"fused_lut({label})",
+        apply_lut,
+        MappingProxyType({"lut": lut}),
+        supports_dst=True,
+        accepts_gray=True,
+        radius=0,
+    )
+
+
+def fuse_point_ops(stages: Tuple[CompiledStage, ...]) -> Tuple[CompiledStage, ...]:
+    """
+    Sustituye cada racha de dos o más filtros puntuales consecutivos por una
+    única pasada sobre el frame (cv2.LUT con las tablas ya compuestas, o un
+    convertScaleAbs cuando la composición es afín de forma exacta).
+    """
+    fused = []
+    run: List[CompiledStage] = []
+
+    def flush():
+        if len(run) >= 2:
+            try:
+                fused.append(_fuse_run(run))
+            except Exception as e:
+                log.warning("No se pudo fusionar %s: %s", [s.name for s in run], e)
+                fused.extend(run)
+        else:
+            fused.extend(run)
+        run.clear()
+
+    for stage in stages:
+        if _is_point_op(stage):
+            run.append(stage)
+        else:
+            flush()
+            fused.append(stage)
+    flush()
+    return tuple(fused)
+
+
+# --- 3D LUT baking ---
+
+
+def _is_color_only(stage: CompiledStage) -> bool:
+    return _has_capability(stage, "color_only")
+
+
+@lru_cache(maxsize=32)
+def _baked_table(
+    run_key: Tuple[Tuple[str, Tuple[Tuple[str, Any], ...]], ...], size: int
+) -> np.ndarray:
+    """Tabla 3D de una racha de filtros de color, cacheada por (racha, tamaño)."""
+
+    def color_fn(image: np.ndarray) -> np.ndarray:
+        for name, frozen_params in run_key:
+            image = FILTER_METADATA[name]["function"](image, **dict(frozen_params))
+        return image
+
+    return bake_lut3d(color_fn, size)
+
+
+def apply_baked_lut3d(
+    image: np.ndarray,
+    table: np.ndarray,
+    fallback: Tuple[CompiledStage, ...],
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Aplica una racha horneada. La tabla se muestreó con entrada BGR; si llega
+    una imagen en gris se ejecutan las etapas originales.
+    """
+    if len(image.shape) == 3 and image.shape[2] == 3:
+        return apply_lut3d(image, table, dst=dst)
+    return run_compiled(fallback, image)
+
+
+def bake_color_runs(
+    stages: Tuple[CompiledStage, ...], size: int = DEFAULT_LUT_SIZE
+) -> Tuple[CompiledStage, ...]:
+    """
+    Sustituye cada racha de dos o más filtros "color_only" consecutivos por una
+    única consulta a una LUT 3D horneada (aproximación: ver processing/lut3d.py).
+    """
+    baked = []
+    run: List[CompiledStage] = []
+
+    def flush():
+        if len(run) >= 2:
+            key = tuple((stage.name, _freeze_params(stage.params)) for stage in run)
+            try:
+                table = _baked_table(key, size)
+                name = "baked_lut3d(" + "+".join(stage.name for stage in run) + ")"
+                params = {"table": table, "fallback": tuple(run)}
+                baked.append(
+                    CompiledStage(
+                        name,
+                        apply_baked_lut3d,
+                        MappingProxyType(params),
+                        supports_dst=True,
+                        radius=0,
+                    )
+                )
+            except Exception as e:
+                log.warning("No se pudo hornear %s: %s", [s.name for s in run], e)
+                baked.extend(run)
+        else:
+            baked.extend(run)
+        run.clear()
+
+    for stage in stages:
+        if _is_color_only(stage):
+            run.append(stage)
+        else:
+            flush()
+            baked.append(stage)
+    flush()
+    return tuple(baked)
+
+
+def compile_pipeline(
+    pipeline_config: List[Dict[str, Any]],
+    available_filters: Optional[Mapping[str, Callable]] = None,
+    fuse: bool = True,
+    bake_luts: bool = False,
+    lut_size: int = DEFAULT_LUT_SIZE,
+    live: bool = False,
+    track_layout: bool = True,
+    tolerance: Optional[int] = None,
+    explain: Optional[List[OptimizationStep]] = None,
+    input_layout: str = "bgr",
+) -> Tuple[CompiledStage, ...]:
+    """
+    Compila una configuración de pipeline en una secuencia inmutable de etapas.
+
+    Las etapas desactivadas y los filtros desconocidos se descartan aquí, de modo
+    que el bucle por frame no necesita consultar diccionarios ni validar nada.
+    Con fuse=True, las rachas de filtros puntuales se fusionan en una sola pasada.
+    Con bake_luts=True, las rachas de filtros de solo color se hornean antes en
+    una LUT 3D de lado lut_size (modo aproximado, desactivado por defecto).
+    Con live=True, la pipeline es para vídeo en vivo y puede tener estado entre
+    frames (ver "live_function" en FILTER_METADATA).
+    Con track_layout=False, cada etapa recibe y devuelve la disposición de
+    canales histórica (sin cadenas en gris; solo para comparar).
+    Con tolerance (niveles), se quitan antes las etapas sin efecto, repetidas
+    o muertas cuyo error declarado no la supera (0 = salida idéntica); los
+    pasos aplicados se añaden a `explain` si se pasa una lista. input_layout
+    ("bgr"/"gray") es la disposición de los frames que recibirá.
+    """
+    functions = available_filters or _default_functions()
+    stages = []
+    for entry in pipeline_config:
+        if not entry.get("enabled", True):
+            continue
+        stage = compile_stage(
+            entry.get("name"), entry.get("params", {}), functions, live
+        )
+        if stage is not None:
+            if not track_layout:
+                stage = stage._replace(accepts_gray=False, keep_gray=False)
+            stages.append(stage)
+    stages = tuple(stages)
+    if tolerance is not None:
+        stages, steps = optimize_stages(stages, tolerance, input_layout)
+        if explain is not None:
+            explain.extend(steps)
+    if bake_luts:
+        stages = bake_color_runs(stages, lut_size)
+    return fuse_point_ops(stages) if fuse else stages
+
+
+def timed_stages(
+    stages: Tuple[CompiledStage, ...], totals: Dict[str, float]
+) -> Tuple[CompiledStage, ...]:
+    """
+    Las mismas etapas, pero cada llamada suma su duración (segundos) en
+    totals[nombre de la etapa]. Para perfilar (process_video); las etapas
+    pueden ejecutarse en varios hilos a la vez.
+    """
+    lock = threading.Lock()
+
+    def timed(stage: CompiledStage) -> CompiledStage:
+        def func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return stage.func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    totals[stage.name] = totals.get(stage.name, 0.0) + elapsed
+
+        return stage._replace(func=func)
+
+    return tuple(timed(stage) for stage in stages)
+
+
+def run_compiled(
+    stages: Tuple[CompiledStage, ...],
+    frame: np.ndarray,
+    context: Optional[FrameContext] = None,
+    pool: Optional[BufferPool] = None,
+    dst: Optional[np.ndarray] = None,
+    owns_input: bool = False,
+) -> np.ndarray:
+    """
+    Ejecuta una pipeline compilada sobre un frame. Si se pasa un FrameContext,
+    las etapas que lo usan comparten las conversiones de color de la imagen
+    intermedia, y al terminar el contexto describe la imagen final. Si se pasa
+    un BufferPool, las etapas con supports_dst escriben en buffers del pool.
+    Si se pasa dst, la última etapa escribe en él cuando puede (supports_dst
+    y misma forma); quien llama comprueba si el resultado `is dst`.
+
+    Los buffers que esta llamada toma del pool (y `frame` si owns_input, es
+    decir, si es un buffer del pool que quien llama le cede) vuelven al pool
+    en cuanto la etapa siguiente los ha consumido, salvo que pasen por una
+    etapa con estado, que su salida los vea o que el contexto guarde algo
+    sobre ellos.
+    El resultado nunca se devuelve: es de quien llama.
+
+    La disposición de canales se lleva como estado: las etapas con keep_gray
+    devuelven su resultado en gris aunque represente un frame BGR (con los
+    tres canales iguales), y ese gris sigue por las etapas con accepts_gray
+    sin expandirse. Solo se expande a BGR, una vez, antes de la primera etapa
+    que no lo acepta o al final, así que la salida es la misma que sin
+    seguimiento.
+    """
+    processed = frame
+    del frame
+    owned = [processed] if owns_input and pool is not None else []
+    collapsed = False  # processed es un gris que representa un frame BGR
+    last = len(stages) - 1
+    for index, stage in enumerate(stages):
+        if collapsed and not stage.accepts_gray:
+            processed = _expand_gray(processed, context, pool, owned)
+            collapsed = False
+        extra = {}
+        if context is not None:
+            context.update(processed)
+            if stage.uses_context:
+                extra["context"] = context
+        if stage.supports_dst and index == last and _fits(dst, processed):
+            extra["dst"] = dst
+        elif stage.supports_dst and pool is not None:
+            extra["dst"] = pool.acquire(processed.shape, processed.dtype)
+            owned.append(extra["dst"])
+        if stage.keep_gray:
+            extra["keep_gray"] = True
+        try:
+            output = stage.func(processed, **stage.params, **extra)
+        except Exception as e:
+            # Se repite en cada frame: limitado por filtro, no por mensaje.
+            log.error(
+                "Error en filtro '%s': %s", stage.name, e, extra={"key": stage.name}
+            )
+            _recycle(pool, owned, extra.get("dst"), processed, context)
+        else:
+            if stage.keep_gray or collapsed:
+                collapsed = output.ndim == 2 and _emits_bgr(stage, processed, collapsed)
+            # Algunas etapas no siempre escriben en dst (p. ej. por pirámide).
+            _recycle(pool, owned, extra.get("dst"), output, context)
+            if stage.stateful:
+                # Puede guardar su entrada y su salida: ninguna vuelve al pool.
+                owned[:] = [
+                    buf
+                    for buf in owned
+                    if not np.may_share_memory(buf, processed)
+                    and not np.may_share_memory(buf, output)
+                ]
+            else:
+                _recycle(pool, owned, processed, output, context)
+            processed = output
+            output = None
+        extra = None
+    if collapsed:
+        processed = _expand_gray(processed, context, pool, owned)
+    if context is not None:
+        context.update(processed)
+    for buf in list(owned):
+        _recycle(pool, owned, buf, processed, context)
+    return processed
+
+
+def _fits(dst: Optional[np.ndarray], image: np.ndarray) -> bool:
+    return dst is not None and dst.shape == image.shape and dst.dtype == image.dtype
+
+
+def _emits_bgr(stage: CompiledStage, image: np.ndarray, collapsed: bool) -> bool:
+    """Si la salida de `stage` sobre `image` es, lógicamente, un frame BGR."""
+    if stage.emits == "input":
+        return collapsed or image.ndim == 3
+    return stage.emits == "bgr"
+
+
+def _recycle(
+    pool: Optional[BufferPool],
+    owned: List[np.ndarray],
+    consumed: Optional[np.ndarray],
+    kept: np.ndarray,
+    context: Optional[FrameContext],
+):
+    """Devuelve `consumed` al pool si es de esta llamada y ya nadie lo usa."""
+    if not any(buf is consumed for buf in owned):
+        return
+    if np.may_share_memory(consumed, kept):
+        return
+    if context is not None and context.references(consumed):
+        return
+    owned[:] = [buf for buf in owned if buf is not consumed]
+    pool.release(consumed)
+
+
+def _expand_gray(
+    gray: np.ndarray,
+    context: Optional[FrameContext],
+    pool: Optional[BufferPool],
+    owned: List[np.ndarray],
+) -> np.ndarray:
+    if pool is None:
+        return gray_to_bgr(gray, context)
+    dst = pool.acquire(gray.shape + (3,), gray.dtype)
+    owned.append(dst)
+    bgr = gray_to_bgr(gray, context, dst)
+    _recycle(pool, owned, gray, bgr, context)
+    return bgr
@@ -0,0 +1,430 @@
+# processing/pipeline_graph.py
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+import cv2
+import numpy as np
+from processing.frame_context import gray_to_bgr
+from processing.lut3d import DEFAULT_LUT_SIZE
+from processing.pipeline_compiler import CompiledStage, compile_pipeline, run_compiled
+
+# Pipelines en forma de grafo: además de la lista lineal de siempre, una
+# pipeline puede ser un dict
+#
+#   {"nodes": [
+#       {"id": "sat", "name": "adjust_saturation", "params": {"factor": 1.6}},
+#       {"id": "bordes", "name": "apply_canny_edge_detection", "inputs": ["input"]},
+#       {"id": "out", "name": "blend", "inputs": ["sat", "bordes"],
+#        "params": {"mode": "lighten", "alpha": 1.0}}],
+#    "output": "out"}
+#
+# "input" es el frame de entrada. Un nodo de filtro tiene una entrada (por
+# defecto, el nodo anterior de la lista); "blend" mezcla dos. "output" puede
+# ser una lista de nodos: se devuelven todos, calculando una sola vez lo que
+# compartan. Una lista lineal es un grafo de un solo camino.
+
+GRAPH_INPUT = "input"
+BLEND_NODE = "blend"
+
+
+def _multiply(a, b):
+    return cv2.multiply(a, b, scale=1.0 / 255.0)
+
+
+def _screen(a, b):
+    return cv2.subtract(255, _multiply(cv2.subtract(255, a), cv2.subtract(255, b)))
+
+
+# Modo -> f(a, b) con a y b del mismo tamaño y disposición.
+BLEND_MODES: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "mix": lambda a, b: b,
+    "add": cv2.add,
+    "multiply": _multiply,
+    "screen": _screen,
+    "lighten": cv2.max,
+    "darken": cv2.min,
+    "difference": cv2.absdiff,
+}
+
+
+def blend_images(
+    base: np.ndarray, layer: np.ndarray, mode: str = "mix", alpha: float = 0.5
+) -> np.ndarray:
+    """
+    Funde `layer` sobre `base` con el modo dado y opacidad alpha (0-1). Si
+    una de las dos es gris y la otra BGR, el gris se expande; si el tamaño
+    no coincide, `layer` se escala al de `base`.
+    """
+    if layer.shape[:2] != base.shape[:2]:
+        layer = cv2.resize(layer, (base.shape[1], base.shape[0]))
+    if base.ndim != layer.ndim:
+        if base.ndim == 2:
+            base = gray_to_bgr(base)
+        else:
+            layer = gray_to_bgr(layer)
+    if layer.dtype != base.dtype:
+        layer = np.clip(layer, 0, 255).astype(base.dtype)
+    blended = BLEND_MODES[mode](base, layer)
+    if alpha >= 1.0:
+        return blended
+    return cv2.addWeighted(base, 1.0 - alpha, blended, alpha, 0.0)
+
+
+def is_graph(pipeline_config) -> bool:
+    return isinstance(pipeline_config, Mapping) and "nodes" in pipeline_config
+
+
+def as_graph(pipeline_config) -> Dict[str, Any]:
+    """
+    Forma normalizada de una pipeline lineal o en grafo: cada nodo con "id",
+    "name", "params", "inputs" y "enabled"; "output" como lista de ids.
+    """
+    if is_graph(pipeline_config):
+        raw_nodes = list(pipeline_config["nodes"])
+        output = pipeline_config.get("output")
+    else:
+        raw_nodes = [dict(entry, id=f"n{i}") for i, entry in enumerate(pipeline_config)]
+        output = None
+    nodes = []
+    previous = GRAPH_INPUT
+    for i, raw in enumerate(raw_nodes):
+        node_id = str(raw.get("id", f"n{i}"))
+        inputs = raw.get("inputs")
+        if inputs is None:
+            inputs = [previous]
+        nodes.append(
+            {
+                "id": node_id,
+                "name": raw.get("name"),
+                "params": dict(raw.get("params") or {}),
+                "inputs": [str(source) for source in inputs],
+                "enabled": raw.get("enabled", True),
+            }
+        )
+        previous = node_id
+    if output is None:
+        output = [previous]
+    elif isinstance(output, str):
+        output = [output]
+    return {"nodes": nodes, "output": list(output)}
+
+
+def topological_order(nodes: List[Dict[str, Any]]) -> List[str]:
+    """Ids en un orden en que cada nodo va tras sus entradas (estable)."""
+    pending = {node["id"]: set(node["inputs"]) - {GRAPH_INPUT} for node in nodes}
+    order, done = [], set()
+    while pending:
+        ready = [n for n in pending if pending[n] <= done]
+        if not ready:
+            raise ValueError(f"El grafo tiene un ciclo entre {sorted(pending)}.")
+        for node_id in ready:
+            del pending[node_id]
+            done.add(node_id)
+            order.append(node_id)
+    return order
+
+
+def validate_graph(graph: Mapping[str, Any]) -> List[str]:
+    """
+    Comprueba un grafo normalizado (as_graph). Lanza ValueError con todos los
+    problemas; devuelve el orden topológico si es válido.
+    """
+    problems = []
+    ids = set()
+    for node in graph["nodes"]:
+        if node["id"] == GRAPH_INPUT or node["id"] in ids:
+            problems.append(f"id de nodo repetido o reservado: '{node['id']}'")
+        ids.add(node["id"])
+    for node in graph["nodes"]:
+        expected = 2 if node["name"] == BLEND_NODE else 1
+        if len(node["inputs"]) != expected:
+            problems.append(
+                f"'{node['id']}' debe tener {expected} entrada(s), "
+                f"tiene {len(node['inputs'])}"
+            )
+        for source in node["inputs"]:
+            if source != GRAPH_INPUT and source not in ids:
+                problems.append(f"'{node['id']}' lee un nodo inexistente '{source}'")
+        if node["name"] == BLEND_NODE:
+            mode = node["params"].get("mode", "mix")
+            alpha = node["params"].get("alpha", 0.5)
+            if mode not in BLEND_MODES:
+                problems.append(f"'{node['id']}': modo de mezcla desconocido '{mode}'")
+            if not isinstance(alpha, (int, float)) or not 0 <= alpha <= 1:
+                problems.append(f"'{node['id']}': 'alpha' debe estar entre 0 y 1")
+    for output in graph["output"]:
+        if output != GRAPH_INPUT and output not in ids:
+            problems.append(f"salida inexistente '{output}'")
+    if problems:
+        details = "\n".join(f"  - {p}" for p in problems)
+        raise ValueError(f"Grafo no válido:\n{details}")
+    return topological_order(graph["nodes"])
+
+
+class GraphSegment(NamedTuple):
+    """Cadena lineal de nodos de filtro, compilada como una pipeline."""
+
+    node_id: str  # último nodo de la cadena: su valor es la salida
+    source: str
+    stages: Tuple[CompiledStage, ...]
+    nodes: Tuple[str, ...]
+
+
+class GraphBlend(NamedTuple):
+    node_id: str
+    inputs: Tuple[str, str]
+    mode: str
+    alpha: float
+
+
+class CompiledGraph(NamedTuple):
+    """
+    Pasos en orden topológico tras quitar subexpresiones comunes y unir las
+    cadenas lineales. aliases lleva cada id del grafo al paso que calcula su
+    valor; shared cuenta los nodos que no se calculan por estar repetidos.
+    """
+
+    steps: Tuple[Any, ...]
+    outputs: Tuple[str, ...]
+    single_output: bool
+    aliases: Mapping[str, str]
+    shared: int
+    config: Mapping[str, Any]
+
+    @property
+    def stages(self) -> Tuple[CompiledStage, ...]:
+        """Todas las etapas de filtro del grafo."""
+        segments = [step for step in self.steps if isinstance(step, GraphSegment)]
+        return tuple(stage for segment in segments for stage in segment.stages)
+
+
+def _node_key(node, inputs) -> str:
+    return json.dumps(
+        [node["name"], node["params"], inputs], sort_keys=True, default=str
+    )
+
+
+def _output_layout(stages, layout: str) -> str:
+    for stage in stages:
+        if stage.emits != "input":
+            layout = stage.emits
+    return layout
+
+
+def compile_graph(
+    pipeline_config,
+    available_filters: Optional[Mapping[str, Callable]] = None,
+    bake_luts: bool = False,
+    lut_size: int = DEFAULT_LUT_SIZE,
+    live: bool = False,
+    tolerance: Optional[int] = None,
+    explain: Optional[list] = None,
+) -> CompiledGraph:
+    """
+    Compila una pipeline (lineal o grafo) en un CompiledGraph:
+
+    - Los nodos desactivados pasan su entrada tal cual.
+    - Eliminación de subexpresiones comunes: dos nodos con el mismo filtro,
+      parámetros y entradas (ya unificadas) se calculan una vez, así que dos
+      variantes con un prefijo común solo lo recorren una vez.
+    - Cada cadena de filtros cuyos valores intermedios nadie más lee se
+      compila con compile_pipeline (fusión, LUT y optimizador incluidos).
+
+    Lanza ValueError si el grafo no es válido.
+    """
+    graph = as_graph(pipeline_config)
+    order = validate_graph(graph)
+    by_id = {node["id"]: node for node in graph["nodes"]}
+
+    # Unificar nodos: alias[id] es el nodo que representa su valor.
+    alias = {GRAPH_INPUT: GRAPH_INPUT}
+    representative: Dict[str, str] = {}
+    unique = []
+    for node_id in order:
+        node = by_id[node_id]
+        inputs = [alias[source] for source in node["inputs"]]
+        if not node["enabled"]:
+            alias[node_id] = inputs[0]
+            continue
+        key = _node_key(node, inputs)
+        if key in representative:
+            alias[node_id] = representative[key]
+            continue
+        representative[key] = alias[node_id] = node_id
+        unique.append((node, inputs))
+    outputs = tuple(alias[output] for output in graph["output"])
+    shared = sum(1 for n in graph["nodes"] if n["enabled"]) - len(unique)
+
+    consumers: Dict[str, int] = {}
+    for _, inputs in unique:
+        for source in inputs:
+            consumers[source] = consumers.get(source, 0) + 1
+
+    # Unir cadenas: un filtro cuya entrada es un filtro que solo él lee (y que
+    # no es una salida) continúa la cadena de esa entrada.
+    chains: Dict[str, List[Dict[str, Any]]] = {}
+    chain_of: Dict[str, str] = {}
+    plan = []  # nodos de mezcla o ids de cabeza de cadena, en orden
+    for node, inputs in unique:
+        if node["name"] == BLEND_NODE:
+            plan.append((node, inputs))
+            continue
+        source = inputs[0]
+        head = chain_of.get(source)
+        if head is not None and consumers[source] == 1 and source not in outputs:
+            chains[head].append(node)
+        else:
+            head = node["id"]
+            chains[head] = [node]
+            plan.append((head, inputs))
+        chain_of[node["id"]] = head
+
+    steps = []
+    step_of: Dict[str, str] = {GRAPH_INPUT: GRAPH_INPUT}
+    layouts = {GRAPH_INPUT: "bgr"}
+    for item, inputs in plan:
+        sources = tuple(step_of[source] for source in inputs)
+        if isinstance(item, dict):  # mezcla
+            step = GraphBlend(
+                item["id"],
+                sources,
+                item["params"].get("mode", "mix"),
+                float(item["params"].get("alpha", 0.5)),
+            )
+            gray = all(layouts[source] == "gray" for source in sources)
+            layouts[step.node_id] = "gray" if gray else "bgr"
+            step_of[step.node_id] = step.node_id
+        else:
+            chain = chains[item]
+            # La tolerancia se mide a la salida: una cadena que alimenta a
+            # otros pasos (que pueden amplificar su error) se compila exacta.
+            exact = tolerance is not None and consumers.get(chain[-1]["id"], 0)
+            stages = compile_pipeline(
+                chain,
+                available_filters,
+                bake_luts=bake_luts,
+                lut_size=lut_size,
+                live=live,
+                tolerance=0 if exact else tolerance,
+                explain=explain,
+                input_layout=layouts[sources[0]],
+            )
+            ids = tuple(node["id"] for node in chain)
+            step = GraphSegment(ids[-1], sources[0], stages, ids)
+            layouts[step.node_id] = _output_layout(stages, layouts[sources[0]])
+            for node_id in ids:
+                step_of[node_id] = step.node_id
+        steps.append(step)
+    aliases = {node_id: step_of[alias[node_id]] for node_id in by_id}
+    aliases[GRAPH_INPUT] = GRAPH_INPUT
+    several = is_graph(pipeline_config) and isinstance(
+        pipeline_config.get("output"), list
+    )
+    return CompiledGraph(
+        tuple(steps),
+        tuple(step_of[output] for output in outputs),
+        not several,
+        aliases,
+        shared,
+        graph,
+    )
+
+
+def _run_step(step, values: Mapping[str, np.ndarray]) -> np.ndarray:
+    if isinstance(step, GraphBlend):
+        base, layer = (values[source] for source in step.inputs)
+        return blend_images(base, layer, step.mode, step.alpha)
+    return run_compiled(step.stages, values[step.source])
+
+
+def run_graph(
+    graph: CompiledGraph,
+    frame: np.ndarray,
+    executor: Optional[ThreadPoolExecutor] = None,
+):
+    """
+    Ejecuta un CompiledGraph. Con un executor, los pasos independientes
+    (ramas) avanzan a la vez en sus hilos: cada paso se lanza en cuanto sus
+    entradas están listas. Ningún paso escribe en sus entradas, así que las
+    ramas comparten los valores sin copiarlos.
+
+    Devuelve la imagen de salida, o un dict id -> imagen si "output" era una
+    lista. La salida nunca comparte memoria con `frame`.
+    """
+    values: Dict[str, np.ndarray] = {GRAPH_INPUT: frame}
+    if executor is None or len(graph.steps) < 2:
+        for step in graph.steps:
+            values[step.node_id] = _run_step(step, values)
+    else:
+        _run_concurrent(graph, values, executor)
+
+    results = {}
+    for node_id in graph.config["output"]:
+        value = values[graph.aliases[node_id]]
+        if np.may_share_memory(value, frame):
+            value = value.copy()
+        results[node_id] = value
+    if graph.single_output:
+        return results[graph.config["output"][0]]
+    return results
+
+
+def _inputs_of(step) -> Tuple[str, ...]:
+    return step.inputs if isinstance(step, GraphBlend) else (step.source,)
+
+
+def _run_concurrent(graph: CompiledGraph, values, executor: ThreadPoolExecutor):
+    waiting = {
+        step.node_id: {s for s in _inputs_of(step) if s != GRAPH_INPUT}
+        for step in graph.steps
+    }
+    by_id = {step.node_id: step for step in graph.steps}
+    # Cuántos pasos leen aún cada valor: al llegar a 0 se suelta (salvo salidas).
+    readers: Dict[str, int] = {}
+    for step in graph.steps:
+        for source in _inputs_of(step):
+            readers[source] = readers.get(source, 0) + 1
+    keep = set(graph.outputs) | {GRAPH_INPUT}
+    running = {}
+
+    def launch():
+        for node_id in [n for n, pending in waiting.items() if not pending]:
+            del waiting[node_id]
+            step = by_id[node_id]
+            running[executor.submit(_run_step, step, dict(values))] = step
+
+    launch()
+    while running:
+        finished, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in finished:
+            step = running.pop(future)
+            values[step.node_id] = future.result()
+            for pending in waiting.values():
+                pending.discard(step.node_id)
+            for source in _inputs_of(step):
+                readers[source] -= 1
+                if readers[source] == 0 and source not in keep:
+                    del values[source]
+        launch()
+
+
+class GraphRunner:
+    """Hilos para ejecutar las ramas independientes de los grafos en vivo."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._executor = (
+            ThreadPoolExecutor(self.workers, thread_name_prefix="graph")
+            if self.workers > 1
+            else None
+        )
+
+    def run(self, graph: CompiledGraph, frame: np.ndarray):
+        return run_graph(graph, frame, self._executor)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
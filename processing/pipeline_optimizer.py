@@ -0,0 +1,167 @@
+# processing/pipeline_optimizer.py
+
+from typing import Any, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+import math
+import numpy as np
+from processing.filters import FILTER_METADATA, get_filter_capabilities
+
+# Reescritura de pipelines compiladas en otras equivalentes más baratas. Solo
+# se usan las capacidades declaradas en FILTER_METADATA ("noop", "idempotent",
+# "involutive", "discards_color", "luma_error", "error_gain", "emits"), nunca
+# nombres de filtro. Cada reescritura tiene un error máximo declarado (niveles
+# por canal, 0 = bit a bit idéntica) que se propaga por las etapas siguientes
+# con su "error_gain" hasta la salida; la suma de los errores de salida de
+# todas las reescrituras no supera la tolerancia pedida.
+
+_IDENTITY_RAMP = np.arange(256, dtype=np.uint8).reshape(256, 1)
+
+
+class OptimizationStep(NamedTuple):
+    """Una reescritura aplicada: qué etapas se quitaron y por qué."""
+
+    action: str  # "noop", "duplicate", "involution" o "dead"
+    removed: Tuple[str, ...]
+    reason: str
+    max_error: int  # a la salida de la pipeline
+
+    def explain(self) -> str:
+        exact = "exacto" if self.max_error == 0 else f"error <= {self.max_error}"
+        return f"{self.action}: quitado {', '.join(self.removed)} ({self.reason}; {exact})"
+
+
+def _caps(stage) -> Optional[Mapping[str, Any]]:
+    return get_filter_capabilities(stage.name)
+
+
+def _evaluate(value, params):
+    return value(params) if callable(value) else value
+
+
+def _stage_layouts(stages: Sequence, input_layout: str) -> List[str]:
+    """Disposición ("gray"/"bgr") a la entrada de cada etapa y a la salida."""
+    layouts = [input_layout]
+    for stage in stages:
+        caps = _caps(stage)
+        emits = "input" if caps is None else caps["emits"]
+        layouts.append(layouts[-1] if emits == "input" else emits)
+    return layouts
+
+
+def _noop_error(stage) -> Optional[int]:
+    caps = _caps(stage)
+    if caps is None:
+        return None
+    if caps["noop"] is not None:
+        return caps["noop"](stage.params)
+    if caps["point_op"]:
+        # Un filtro puntual es la identidad si deja la rampa 0..255 intacta.
+        func = FILTER_METADATA[stage.name]["function"]
+        table = func(_IDENTITY_RAMP, **stage.params)
+        if np.array_equal(np.asarray(table).reshape(256, 1), _IDENTITY_RAMP):
+            return 0
+    return None
+
+
+def _output_error(error: int, following: Sequence) -> Optional[int]:
+    """
+    Cota del error a la salida de la pipeline de un error `error` a la entrada
+    de `following`, o None si alguna etapa no la declara. Las ganancias < 1 se
+    cuentan como 1: quitar después esa etapa no debe invalidar la cota.
+    """
+    if error == 0:
+        return 0
+    for stage in following:
+        caps = _caps(stage)
+        gain = None if caps is None else _evaluate(caps["error_gain"], stage.params)
+        if gain is None:
+            return None
+        error = math.ceil(error * max(1.0, gain) - 1e-9)
+    return error
+
+
+def _same_stage(a, b) -> bool:
+    return a.name == b.name and dict(a.params) == dict(b.params)
+
+
+def _find_rewrite(
+    stages: Sequence, tolerance: int, input_layout: str
+) -> Optional[Tuple[Tuple[int, ...], OptimizationStep]]:
+    layouts = _stage_layouts(stages, input_layout)
+    for i, stage in enumerate(stages):
+        caps = _caps(stage)
+        if caps is None:
+            continue
+        # Quitar la etapa no debe cambiar la disposición que ven las siguientes.
+        keeps_layout = layouts[i] == layouts[i + 1]
+
+        rest = stages[i + 1 :]
+        error = _noop_error(stage)
+        if error is not None and keeps_layout:
+            error = _output_error(error, rest)
+        if error is not None and error <= tolerance and keeps_layout:
+            step = OptimizationStep(
+                "noop", (stage.name,), f"no hace nada con {dict(stage.params)}", error
+            )
+            return (i,), step
+
+        if i + 1 >= len(stages):
+            continue
+        following = stages[i + 1]
+        if _same_stage(stage, following):
+            if caps["idempotent"]:
+                step = OptimizationStep(
+                    "duplicate", (following.name,), "idempotente y repetida", 0
+                )
+                return (i + 1,), step
+            if caps["involutive"] and keeps_layout:
+                step = OptimizationStep(
+                    "involution", (stage.name, following.name), "se anulan", 0
+                )
+                return (i, i + 1), step
+
+        next_caps = _caps(following)
+        if next_caps is None or not _evaluate(
+            next_caps["discards_color"], following.params
+        ):
+            continue
+        error = _evaluate(caps["luma_error"], stage.params)
+        if error is not None:
+            error = _output_error(error, rest)
+        # Si la disposición cambia, la siguiente debe fijar la suya propia.
+        if error is not None and error <= tolerance and (
+            keeps_layout or next_caps["emits"] != "input"
+        ):
+            step = OptimizationStep(
+                "dead",
+                (stage.name,),
+                f"{following.name} solo usa el gris y {stage.name} no lo cambia",
+                error,
+            )
+            return (i,), step
+    return None
+
+
+def optimize_stages(
+    stages: Sequence, tolerance: int = 0, input_layout: str = "bgr"
+) -> Tuple[tuple, List[OptimizationStep]]:
+    """
+    Elimina etapas sin efecto, duplicadas o cuyo resultado se descarta, hasta
+    que no quede nada que quitar. Devuelve (etapas, pasos aplicados).
+
+    tolerance es el error máximo (niveles) admitido a la salida de la pipeline
+    para todas las reescrituras juntas: el error de cada una se propaga por las
+    etapas siguientes ("error_gain") y se resta de lo que queda. Una etapa sin
+    cota de ganancia (umbral, ecualización...) tras una reescritura aproximada
+    la impide. input_layout es la disposición del frame de entrada.
+    """
+    stages = list(stages)
+    steps: List[OptimizationStep] = []
+    budget = tolerance
+    while True:
+        rewrite = _find_rewrite(stages, budget, input_layout)
+        if rewrite is None:
+            return tuple(stages), steps
+        indices, step = rewrite
+        stages = [stage for i, stage in enumerate(stages) if i not in indices]
+        steps.append(step)
+        budget -= step.max_error
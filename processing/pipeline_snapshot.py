@@ -0,0 +1,72 @@
+# processing/pipeline_snapshot.py
+
+import copy
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Optional, Sequence, Tuple
+from processing.pipeline_compiler import CompiledStage
+from processing.pipeline_graph import CompiledGraph
+
+
+class PipelineSnapshot(NamedTuple):
+    """
+    Versión publicada de la pipeline de un ImageProcessor: la configuración
+    y su compilación en vivo, que no se modifican una vez creadas. La UI
+    publica una nueva sustituyendo la referencia (una asignación, atómica
+    para los hilos de Python) y el hilo de procesado lee la referencia una
+    vez por frame, así que cada frame usa una versión completa y coherente
+    sin que ninguno de los dos espere por un cerrojo.
+
+    Las pipelines en grafo (processing/pipeline_graph.py) llevan sus nodos en
+    pipeline, el grafo compilado en graph y compiled vacío.
+
+    La configuración está congelada (ver freeze_entries): sus entradas son
+    MappingProxyType y sus listas, tuplas, así que tampoco se puede cambiar
+    en el sitio.
+    """
+
+    version: int
+    pipeline: Tuple[Mapping[str, Any], ...]
+    compiled: Tuple[CompiledStage, ...]
+    optimization_steps: Tuple[Any, ...]
+    graph: Optional[CompiledGraph] = None
+
+    def entries(self):
+        """Copia modificable de la configuración (para get_pipeline)."""
+        if self.graph is not None:
+            return thaw(self.graph.config)
+        return thaw(self.pipeline)
+
+
+EMPTY_SNAPSHOT = PipelineSnapshot(0, (), (), ())
+
+
+def _freeze(value):
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return copy.deepcopy(value)
+
+
+def thaw(value):
+    """Copia modificable de una configuración congelada (dicts y listas)."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return copy.deepcopy(value)
+
+
+def freeze_entries(
+    pipeline: Sequence[Mapping[str, Any]],
+) -> Tuple[Mapping[str, Any], ...]:
+    """
+    Copia propia y de solo lectura de la configuración: los cambios del
+    llamador no la alcanzan, y quien la lea no puede modificarla.
+    """
+    return tuple(_freeze(entry) for entry in pipeline)
+
+
+def freeze_graph(graph: CompiledGraph) -> CompiledGraph:
+    """El mismo grafo compilado con su configuración congelada."""
+    return graph._replace(config=_freeze(graph.config))
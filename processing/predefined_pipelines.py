@@ -1,8 +1,12 @@
 # pdi_studio_ai/processing/predefined_pipelines.py
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
 import copy
 import difflib
+import json
+import os
+from config.presets import PRESETS_FILE, load_presets
+from processing.pipeline_graph import is_graph
 
 # Semantic aliases for redirecting variants to base keys
 PIPELINE_ALIASES = {
@@ -126,3 +130,31 @@ def suggest_closest_pipeline(
         if pipeline:
             return resolved_key, copy.deepcopy(pipeline)
     return None
+
+
+def resolve_pipeline(
+    preset: Optional[str] = None,
+    pipeline: Optional[str] = None,
+    presets_file: str = PRESETS_FILE,
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Pipeline a aplicar: un preset guardado (presets.json) o predefinido, o
+    una pipeline JSON (ruta a un fichero o el propio texto JSON).
+    Lanza ValueError si no se encuentra o no es una lista de filtros ni un
+    grafo (ver processing/pipeline_graph.py).
+    """
+    if preset is not None:
+        config = load_presets(presets_file).get(preset)
+        if config is None:
+            config = get_pipeline_from_rules(preset)
+        if config is None:
+            raise ValueError(f"Preset '{preset}' no encontrado.")
+    else:
+        if os.path.exists(pipeline):
+            with open(pipeline, "r", encoding="utf-8") as f:
+                config = json.load(f)
+        else:
+            config = json.loads(pipeline)
+    if not (isinstance(config, list) or is_graph(config)):
+        raise ValueError("La pipeline debe ser una lista de filtros o un grafo.")
+    return config
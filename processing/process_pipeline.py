@@ -0,0 +1,316 @@
+# processing/process_pipeline.py
+
+import multiprocessing as mp
+import queue
+import threading
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config.logging_config import get_logger
+from processing.filters import estimate_filter_cost, get_filter_capabilities
+
+# Frames que pueden estar a la vez dentro de la cadena de procesos. Con la
+# cadena llena, submit() descarta el frame nuevo (en vivo es mejor saltar uno
+# que acumular retraso).
+MAX_IN_FLIGHT = 4
+# Tiempo (s) que se espera a que los procesos terminen antes de forzarlos.
+_JOIN_TIMEOUT = 2.0
+
+log = get_logger("ProcessPipeline")
+
+
+def split_stage_groups(
+    pipeline_config: Sequence[Dict[str, Any]], groups: int, live: bool = True
+) -> List[List[Dict[str, Any]]]:
+    """
+    Reparte las etapas activas en `groups` tramos consecutivos con el menor
+    coste máximo por tramo (coste declarado en FILTER_METADATA): el tramo más
+    lento marca el ritmo de toda la cadena. Puede haber tramos vacíos.
+    """
+    entries = [e for e in pipeline_config if e.get("enabled", True)]
+    costs = [
+        estimate_filter_cost(e["name"], e.get("params"), live=live) for e in entries
+    ]
+    n = len(entries)
+    prefix = np.concatenate(([0.0], np.cumsum(costs)))
+    # best[k][i]: coste máximo óptimo de repartir las i primeras etapas en k tramos.
+    best = [[float("inf")] * (n + 1) for _ in range(groups + 1)]
+    cut = [[0] * (n + 1) for _ in range(groups + 1)]
+    best[0][0] = 0.0
+    for k in range(1, groups + 1):
+        for i in range(n + 1):
+            for j in range(i + 1):
+                cost = max(best[k - 1][j], prefix[i] - prefix[j])
+                if cost < best[k][i]:
+                    best[k][i], cut[k][i] = cost, j
+    bounds, i = [], n
+    for k in range(groups, 0, -1):
+        bounds.append((cut[k][i], i))
+        i = cut[k][i]
+    return [entries[start:end] for start, end in reversed(bounds)]
+
+
+def _output_layout(entries: Sequence[Dict[str, Any]], layout: str) -> str:
+    """Disposición ("gray"/"bgr") a la salida de un tramo."""
+    for entry in entries:
+        caps = get_filter_capabilities(entry.get("name"))
+        emits = "input" if caps is None else caps["emits"]
+        layout = layout if emits == "input" else emits
+    return layout
+
+
+def group_compile_options(
+    groups: Sequence[Sequence[Dict[str, Any]]], compile_options: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Opciones de compilación de cada tramo. Cada uno se compila con la
+    disposición de salida del anterior, y solo el último usa la tolerancia
+    del optimizador: el error se mide a la salida de la pipeline, así que los
+    demás tramos se optimizan solo con reescrituras exactas.
+    """
+    layout = compile_options.get("input_layout", "bgr")
+    last = len(groups) - 1
+    options = []
+    for index, group in enumerate(groups):
+        group_options = dict(compile_options, input_layout=layout)
+        if index != last and group_options.get("tolerance") is not None:
+            group_options["tolerance"] = 0
+        options.append(group_options)
+        layout = _output_layout(group, layout)
+    return options
+
+
+def _stage_worker(
+    index: int,
+    groups: List[List[Dict[str, Any]]],
+    options: List[Dict[str, Any]],
+    slot_names: List[str],
+    inbox,
+    outbox,
+):
+    """
+    Proceso de un tramo: toma (seq, slot, forma, dtype) de inbox, ejecuta su
+    tramo sobre el frame del slot, deja el resultado en el mismo slot y pasa
+    el mensaje al siguiente. None detiene la cadena en orden.
+    """
+    from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+    slots = [SharedMemory(name=name) for name in slot_names]
+    stages = compile_pipeline(groups[index], **options[index])
+    try:
+        while True:
+            message = inbox.get()
+            if message is None:
+                break
+            if message[0] == "pipeline":
+                _, groups, options = message
+                stages = compile_pipeline(groups[index], **options[index])
+                outbox.put(message)
+                continue
+            _, seq, slot, shape, dtype = message
+            buffer = slots[slot].buf
+            result = run_compiled(stages, np.ndarray(shape, dtype, buffer))
+            if result.nbytes > slots[slot].size:
+                log.error("Tramo %d: la salida no cabe en el slot.", index)
+            else:
+                view = np.ndarray(result.shape, result.dtype, buffer)
+                if not np.shares_memory(view, result):
+                    np.copyto(view, result)
+                shape, dtype = result.shape, result.dtype.str
+            result = view = buffer = None
+            outbox.put(("frame", seq, slot, shape, dtype))
+    finally:
+        outbox.put(None)
+        for shm in slots:
+            shm.close()
+
+
+class ProcessPipeline:
+    """
+    Ejecución por tramos en procesos separados: el tramo 1 puede procesar el
+    frame N+1 mientras el tramo 2 procesa el N. Los frames viajan en un anillo
+    de slots de memoria compartida (multiprocessing.shared_memory) y por las
+    colas solo pasan (seq, slot, forma, dtype), así que no se serializan
+    píxeles. Cada proceso compila su tramo (con estado en vivo propio) con
+    las opciones de group_compile_options.
+
+    submit() encola un frame (o lo descarta si ya hay max_in_flight dentro) y
+    results() devuelve los terminados en orden de entrada. close() detiene la
+    cadena y libera la memoria compartida.
+    """
+
+    def __init__(
+        self,
+        pipeline_config: Sequence[Dict[str, Any]],
+        groups: int = 2,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        compile_options: Optional[Dict[str, Any]] = None,
+    ):
+        self.groups = max(1, groups)
+        self.max_in_flight = max(1, max_in_flight)
+        self.compile_options = dict(compile_options or {"live": True})
+        self._pipeline_config = [dict(e) for e in pipeline_config]
+        self._lock = threading.Lock()
+        self._context = mp.get_context("spawn")
+        self._shape = None
+        self._workers: List[Any] = []
+        self._queues: List[Any] = []
+        self._slots: List[SharedMemory] = []
+        self._free: List[int] = []
+        self._tags: Dict[int, Any] = {}
+        self._ready: Dict[int, Tuple[Any, np.ndarray]] = {}
+        self._next_seq = 0
+        self._next_out = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def in_flight(self) -> int:
+        return self.max_in_flight - len(self._free) if self.running else 0
+
+    def _start(self, frame: np.ndarray):
+        groups = split_stage_groups(
+            self._pipeline_config, self.groups, self.compile_options.get("live", True)
+        )
+        self._slots = [
+            SharedMemory(create=True, size=frame.nbytes)
+            for _ in range(self.max_in_flight)
+        ]
+        self._free = list(range(self.max_in_flight))
+        self._queues = [self._context.Queue() for _ in range(self.groups + 1)]
+        names = [shm.name for shm in self._slots]
+        self._workers = [
+            self._context.Process(
+                target=_stage_worker,
+                args=(
+                    index,
+                    groups,
+                    group_compile_options(groups, self.compile_options),
+                    names,
+                    self._queues[index],
+                    self._queues[index + 1],
+                ),
+                name=f"pipeline-tramo-{index}",
+                daemon=True,
+            )
+            for index in range(self.groups)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._shape = (frame.shape, frame.dtype)
+        log.info(
+            "%d procesos, %d slots de %.1f MB: %s",
+            self.groups,
+            self.max_in_flight,
+            frame.nbytes / 2**20,
+            [[e["name"] for e in g] for g in groups],
+        )
+
+    def submit(self, frame: np.ndarray, tag: Any = None) -> Optional[int]:
+        """
+        Encola frame; tag vuelve con su resultado. Devuelve el número de
+        secuencia, o None si la cadena está llena y el frame se descarta.
+        """
+        with self._lock:
+            if self._shape != (frame.shape, frame.dtype):
+                self._stop()
+                self._start(frame)
+            if not self._free:
+                self.dropped += 1
+                return None
+            slot = self._free.pop(0)
+            view = np.ndarray(frame.shape, frame.dtype, self._slots[slot].buf)
+            np.copyto(view, frame)
+            seq = self._next_seq
+            self._next_seq += 1
+            self._tags[seq] = tag
+            self._queues[0].put(("frame", seq, slot, frame.shape, frame.dtype.str))
+            return seq
+
+    def results(self, timeout: float = 0.0) -> List[Tuple[Any, np.ndarray]]:
+        """
+        Frames terminados, en orden de entrada, como (tag, resultado). Espera
+        hasta `timeout` segundos al primero si aún no hay ninguno.
+        """
+        with self._lock:
+            outbox = self._queues[-1] if self._queues else None
+        if outbox is None:
+            return []
+        messages = []
+        try:
+            if timeout:
+                messages.append(outbox.get(timeout=timeout))
+            while True:
+                messages.append(outbox.get_nowait())
+        except queue.Empty:
+            pass
+        except (ValueError, OSError, EOFError):
+            return []  # la cadena se reinició mientras se esperaba
+        with self._lock:
+            if not self._queues or outbox is not self._queues[-1]:
+                return []
+            for message in messages:
+                if message is None or message[0] != "frame":
+                    continue
+                _, seq, slot, shape, dtype = message
+                result = np.ndarray(shape, dtype, self._slots[slot].buf).copy()
+                self._free.append(slot)
+                self._ready[seq] = (self._tags.pop(seq, None), result)
+            delivered = []
+            while self._next_out in self._ready:
+                delivered.append(self._ready.pop(self._next_out))
+                self._next_out += 1
+            return delivered
+
+    def set_pipeline(self, pipeline_config: Sequence[Dict[str, Any]]):
+        """
+        Cambia la pipeline. El cambio recorre la cadena detrás de los frames
+        ya encolados, que terminan con la anterior.
+        """
+        with self._lock:
+            self._pipeline_config = [dict(e) for e in pipeline_config]
+            if self.running:
+                groups = split_stage_groups(
+                    self._pipeline_config,
+                    self.groups,
+                    self.compile_options.get("live", True),
+                )
+                options = group_compile_options(groups, self.compile_options)
+                self._queues[0].put(("pipeline", groups, options))
+
+    def close(self):
+        """Detiene los procesos (en orden, o a la fuerza si no responden)."""
+        with self._lock:
+            self._stop()
+
+    def _stop(self):
+        if not self._workers:
+            return
+        self._queues[0].put(None)
+        for worker in self._workers:
+            worker.join(_JOIN_TIMEOUT)
+            if worker.is_alive():
+                log.warning("%s no terminó; se fuerza su cierre.", worker.name)
+                worker.terminate()
+                worker.join()
+        for q in self._queues:
+            q.close()
+            q.cancel_join_thread()
+        for shm in self._slots:
+            shm.close()
+            shm.unlink()
+        self._workers, self._queues, self._slots, self._free = [], [], [], []
+        # Los frames en vuelo se pierden; la numeración sigue.
+        self._tags.clear()
+        self._ready.clear()
+        self._next_out = self._next_seq
+        self._shape = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
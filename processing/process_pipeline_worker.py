@@ -0,0 +1,58 @@
+# processing/process_pipeline_worker.py
+
+import numpy as np
+from PyQt6.QtCore import QThread, pyqtSignal
+from config.logging_config import get_logger
+from processing.process_pipeline import MAX_IN_FLIGHT, ProcessPipeline
+
+log = get_logger("ProcessPipelineWorker")
+
+
+class ProcessPipelineWorker(QThread):
+    """
+    Puente entre la cadena de procesos (ProcessPipeline) y Qt: la ventana
+    encola frames con enqueue_frame() y este hilo recoge los resultados, en
+    orden, y los emite como (original, procesado).
+    """
+
+    processed_frame_ready = pyqtSignal(np.ndarray, np.ndarray)
+
+    def __init__(
+        self,
+        pipeline_config: list,
+        groups: int = 2,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        compile_options: dict = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._pipeline = ProcessPipeline(
+            pipeline_config, groups, max_in_flight, compile_options
+        )
+        self._running = True
+
+    def run(self):
+        log.info("Hilo iniciado.")
+        while self._running:
+            for original, processed in self._pipeline.results(timeout=0.02):
+                self.processed_frame_ready.emit(original, processed)
+            if not self._pipeline.running:
+                self.msleep(5)
+        log.info("Hilo detenido.")
+
+    def enqueue_frame(self, frame: np.ndarray):
+        """Encola un frame; si ya hay demasiados en vuelo se descarta."""
+        self._pipeline.submit(frame, tag=frame)
+
+    def set_pipeline_config(self, pipeline_config: list):
+        self._pipeline.set_pipeline(pipeline_config)
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._pipeline.dropped
+
+    def stop(self):
+        """Detiene el hilo y después los procesos, liberando la memoria compartida."""
+        self._running = False
+        self.wait()
+        self._pipeline.close()
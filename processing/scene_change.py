@@ -0,0 +1,108 @@
+# processing/scene_change.py
+
+import time
+import cv2
+import numpy as np
+
+# Ancho (px) del gris reducido con el que se comparan los frames. El
+# promediado de INTER_AREA absorbe el ruido del sensor de una escena quieta.
+SIGNATURE_WIDTH = 160
+# Diferencia media (niveles) a partir de la cual la escena ha cambiado.
+MEAN_THRESHOLD = 1.5
+# Un píxel reducido ha cambiado si difiere más que esto (niveles)...
+PIXEL_THRESHOLD = 12
+# ...y la escena también, si cambian más de esta fracción de píxeles (capta
+# movimientos pequeños que apenas mueven la media).
+CHANGED_FRACTION = 0.002
+# Frames quietos que se siguen procesando antes de empezar a saltar, para que
+# las etapas con estado (media temporal) converjan sobre la escena.
+SETTLE_FRAMES = 8
+
+
+def scene_signature(frame: np.ndarray, width: int = SIGNATURE_WIDTH) -> np.ndarray:
+    """Gris reducido (~width px de ancho) en int16, listo para restar."""
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    rows, cols = gray.shape
+    if cols > width:
+        size = (width, max(1, rows * width // cols))
+        gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    return gray.astype(np.int16)
+
+
+class StaticSceneDetector:
+    """
+    Decide si un frame en vivo puede reutilizar la salida anterior porque la
+    escena no ha cambiado. Compara con el último frame *procesado* (no con el
+    anterior), así que una deriva lenta acaba superando los umbrales.
+
+    Lleva además las cuentas de la sesión: frames procesados y saltados y el
+    tiempo de CPU ahorrado (coste medio de procesar menos el de comparar).
+    """
+
+    def __init__(
+        self,
+        mean_threshold: float = MEAN_THRESHOLD,
+        pixel_threshold: int = PIXEL_THRESHOLD,
+        changed_fraction: float = CHANGED_FRACTION,
+        settle_frames: int = SETTLE_FRAMES,
+        width: int = SIGNATURE_WIDTH,
+    ):
+        self.mean_threshold = mean_threshold
+        self.pixel_threshold = pixel_threshold
+        self.changed_fraction = changed_fraction
+        self.settle_frames = settle_frames
+        self.width = width
+        self.processed = 0
+        self.skipped = 0
+        self.saved_ms = 0.0
+        self._process_ms = 0.0
+        self.reset()
+
+    def reset(self):
+        """Olvida la referencia (cambio de pipeline, de cámara...)."""
+        self._reference = None
+        self._static_run = 0
+
+    def has_changed(self, signature: np.ndarray) -> bool:
+        if self._reference is None or self._reference.shape != signature.shape:
+            return True
+        diff = np.abs(signature - self._reference)
+        if diff.mean() > self.mean_threshold:
+            return True
+        moving = np.count_nonzero(diff > self.pixel_threshold)
+        return moving > self.changed_fraction * diff.size
+
+    def should_skip(self, frame: np.ndarray) -> bool:
+        """
+        True si frame puede sustituirse por la última salida. Si devuelve
+        False, el llamador procesa el frame y lo notifica con record_processed.
+        """
+        start = time.perf_counter()
+        signature = scene_signature(frame, self.width)
+        if self.has_changed(signature):
+            self._static_run = 0
+        else:
+            self._static_run += 1
+        if self._static_run > self.settle_frames:
+            self.skipped += 1
+            detect_ms = (time.perf_counter() - start) * 1000.0
+            self.saved_ms += max(0.0, self._process_ms - detect_ms)
+            return True
+        self._reference = signature
+        return False
+
+    def record_processed(self, elapsed_ms: float):
+        """Tiempo que costó procesar un frame (media móvil exponencial)."""
+        self.processed += 1
+        if self.processed == 1:
+            self._process_ms = elapsed_ms
+        else:
+            self._process_ms += 0.1 * (elapsed_ms - self._process_ms)
+
+    def summary(self) -> str:
+        total = self.processed + self.skipped
+        share = 100.0 * self.skipped / total if total else 0.0
+        return (
+            f"Frames sin cambios saltados: {self.skipped}/{total} ({share:.0f}%), "
+            f"CPU ahorrada ~{self.saved_ms / 1000.0:.1f} s"
+        )
@@ -2,12 +2,15 @@
 
 from sentence_transformers import SentenceTransformer, util
 from typing import Dict, List, Tuple
+from config.logging_config import get_logger
+
+log = get_logger("SemanticClassifier")
 
 # Model initialization
 try:
     model = SentenceTransformer("all-MiniLM-L6-v2")
 except Exception as e:
-    print(f"❌ Error al cargar el modelo de embeddings: {e}")
+    log.error("Error al cargar el modelo de embeddings: %s", e)
     model = None
 
 # Dict of semantic keywords
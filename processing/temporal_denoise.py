@@ -0,0 +1,227 @@
+# processing/temporal_denoise.py
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Tuple
+import cv2
+import numpy as np
+from config.logging_config import get_logger
+
+log = get_logger("TemporalDenoise")
+
+# Peso del frame actual en la media temporal recursiva (el resto viene de la
+# referencia compensada en movimiento). 0.2 equivale a promediar ~9 frames.
+TEMPORAL_WEIGHT = 0.2
+# Diferencia (niveles de gris, a resolución reducida) a partir de la cual un
+# píxel se considera en movimiento y se toma directamente del frame actual.
+MOTION_THRESHOLD = 24
+# Desplazamiento medio (px a resolución reducida) por debajo del cual no se
+# deforma la referencia: la escena está quieta y el remap no aporta nada.
+_MIN_MEAN_FLOW = 0.25
+_FLOW_WIDTH = 480
+
+
+@lru_cache(maxsize=4)
+def _identity_grid(rows: int, cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    grid_x, grid_y = np.meshgrid(
+        np.arange(cols, dtype=np.float32), np.arange(rows, dtype=np.float32)
+    )
+    grid_x.setflags(write=False)
+    grid_y.setflags(write=False)
+    return grid_x, grid_y
+
+
+def _motion_gray(image: np.ndarray) -> np.ndarray:
+    """Gris a resolución reducida (~480 px de ancho) para el flujo óptico."""
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    rows, cols = gray.shape
+    scale = max(1, cols // _FLOW_WIDTH)
+    if scale == 1:
+        return gray
+    return cv2.resize(
+        gray, (cols // scale, rows // scale), interpolation=cv2.INTER_AREA
+    )
+
+
+def nlm_multi_frame(
+    frames: list,
+    h: float,
+    h_color: float,
+    template_window_size: int,
+    search_window_size: int,
+) -> np.ndarray:
+    """NLM multi-frame sobre el frame central de `frames` (número impar)."""
+    window = len(frames)
+    if frames[0].ndim == 3:
+        return cv2.fastNlMeansDenoisingColoredMulti(
+            frames,
+            window // 2,
+            window,
+            None,
+            h,
+            h_color,
+            template_window_size,
+            search_window_size,
+        )
+    return cv2.fastNlMeansDenoisingMulti(
+        frames,
+        window // 2,
+        window,
+        None,
+        [h],
+        template_window_size,
+        search_window_size,
+    )
+
+
+class TemporalDenoiser:
+    """
+    Versión en tiempo real de non_local_means_denoising para la pipeline en
+    vivo. Guarda un anillo con los últimos frames y:
+
+    - cada `refresh_interval` frames lanza un NLM completo (de un frame, o
+      multi-frame sobre `temporal_window` frames del anillo) en un hilo de
+      fondo, sin bloquear el feed;
+    - en cada frame, deforma la última salida con el flujo óptico (DIS, a
+      resolución reducida) hasta el frame actual y la promedia con él; los
+      píxeles donde la compensación falla se toman del frame actual.
+
+    Cuando termina un NLM, su resultado se lleva al frame actual con el mismo
+    flujo y pasa a ser la nueva referencia. Las capturas y las imágenes fijas
+    no usan esta clase: van por apply_denoising_nlm (ver ImageProcessor).
+    """
+
+    def __init__(
+        self,
+        single_frame_fn: Callable[..., np.ndarray],
+        ring_size: int = 7,
+        asynchronous: bool = True,
+    ):
+        self._single_frame_fn = single_frame_fn
+        self._ring = deque(maxlen=ring_size)
+        self._asynchronous = asynchronous
+        self._executor = None
+        self._flow = cv2.DISOpticalFlow_create(cv2.DISOPTICAL_FLOW_PRESET_ULTRAFAST)
+        self.reset()
+
+    def reset(self):
+        """Olvida el historial (cambio de resolución o de cámara)."""
+        self._ring.clear()
+        self._reference = None
+        self._reference_gray = None
+        self._pending = None
+        self._frames_since_refresh = 0
+
+    def wait(self):
+        """Espera al NLM en curso (si lo hay)."""
+        if self._pending is not None:
+            self._pending[0].result()
+
+    # --- Refresco NLM ---
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._asynchronous:
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="nlm-refresh"
+            )
+        return self._executor.submit(fn, *args)
+
+    def _schedule_refresh(self, nlm_params: tuple, temporal_window: int):
+        if temporal_window >= 3 and len(self._ring) >= temporal_window:
+            window = list(self._ring)[-temporal_window:]
+            frames = [frame for frame, _ in window]
+            target_gray = window[temporal_window // 2][1]
+            future = self._submit(nlm_multi_frame, frames, *nlm_params)
+        else:
+            frame, target_gray = self._ring[-1]
+            future = self._submit(self._single_frame_fn, frame, *nlm_params)
+        self._pending = (future, target_gray)
+        self._frames_since_refresh = 0
+
+    # --- Compensación de movimiento ---
+
+    def _warp_to(self, source: np.ndarray, source_gray: np.ndarray, gray: np.ndarray):
+        """Deforma `source` (alineada con source_gray) hacia el frame `gray`."""
+        flow = self._flow.calc(gray, source_gray, None)
+        if float(np.mean(np.abs(flow))) < _MIN_MEAN_FLOW:
+            return source
+        # El mapa de coordenadas se construye a la resolución del flujo y se
+        # escala una sola vez: evita split/scaleAdd a resolución completa.
+        rows, cols = source.shape[:2]
+        small_rows, small_cols = gray.shape
+        scale_x, scale_y = cols / small_cols, rows / small_rows
+        grid_x, grid_y = _identity_grid(small_rows, small_cols)
+        coords = cv2.merge(
+            [
+                (grid_x + flow[..., 0]) * scale_x + (scale_x - 1) / 2,
+                (grid_y + flow[..., 1]) * scale_y + (scale_y - 1) / 2,
+            ]
+        )
+        coords = cv2.resize(coords, (cols, rows), interpolation=cv2.INTER_LINEAR)
+        return cv2.remap(
+            source, coords, None, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
+        )
+
+    def _blend(self, image: np.ndarray, gray: np.ndarray, reference: np.ndarray):
+        output = cv2.addWeighted(
+            image, TEMPORAL_WEIGHT, reference, 1.0 - TEMPORAL_WEIGHT, 0.0
+        )
+        moving = cv2.absdiff(gray, _motion_gray(reference)) > MOTION_THRESHOLD
+        if moving.any():
+            mask = cv2.dilate(moving.astype(np.uint8), None)
+            mask = cv2.resize(
+                mask, (image.shape[1], image.shape[0]), interpolation=cv2.INTER_NEAREST
+            )
+            cv2.copyTo(image, mask, output)
+        return output
+
+    def __call__(
+        self,
+        image: np.ndarray,
+        h: float = 10,
+        h_color: float = 10,
+        template_window_size: int = 7,
+        search_window_size: int = 21,
+        realtime: int = 1,
+        refresh_interval: int = 15,
+        temporal_window: int = 1,
+    ) -> np.ndarray:
+        nlm_params = (h, h_color, template_window_size, search_window_size)
+        if not realtime:
+            return self._single_frame_fn(image, *nlm_params)
+        if image.dtype != np.uint8:
+            image = cv2.normalize(image, None, 0, 255, cv2.NORM_MINMAX, cv2.CV_8U)
+        if self._ring and self._ring[-1][0].shape != image.shape:
+            self.reset()
+
+        gray = _motion_gray(image)
+        self._ring.append((image, gray))
+        self._frames_since_refresh += 1
+
+        reference, reference_gray = self._reference, self._reference_gray
+        if self._pending is not None and self._pending[0].done():
+            future, target_gray = self._pending
+            self._pending = None
+            try:
+                reference, reference_gray = future.result(), target_gray
+            except Exception as e:
+                log.error("Error en NLM de refresco: %s", e)
+
+        if reference is None:
+            output = image
+        else:
+            output = self._blend(
+                image, gray, self._warp_to(reference, reference_gray, gray)
+            )
+        self._reference, self._reference_gray = output, gray
+
+        if self._pending is None and (
+            reference is None or self._frames_since_refresh >= refresh_interval
+        ):
+            self._schedule_refresh(nlm_params, temporal_window)
+        return output
@@ -1,7 +1,12 @@
 # processing/validation.py
 
+from config.logging_config import get_logger
 from processing.filters import FILTER_METADATA
 
+# Se valida al compilar cada etapa, es decir, en cada cambio de la pipeline:
+# los avisos repetidos los limita el registro.
+log = get_logger("Validation")
+
 
 def clamp_value(value, min_val, max_val):
     """Restringe un valor dentro de un rango."""
@@ -28,7 +33,7 @@ def _validate_sobel_direction(params: dict) -> dict:
     dx = params.get("dx", 0)
     dy = params.get("dy", 0)
     if dx == 0 and dy == 0:
-        print("⚠️ Sobel: dx y dy no pueden ser ambos cero. Activando dx=1 por defecto.")
+        log.warning("Sobel: dx y dy no pueden ser ambos cero. Activando dx=1.")
         params["dx"] = 1
     return params
 
@@ -53,9 +58,13 @@ def validate_filter_params(filter_name: str, params: dict) -> dict:
                 value = int(value)
             elif expected_type == "float_slider":
                 value = float(value)
+            elif expected_type == "text":
+                value = "" if value is None else str(value)
         except (ValueError, TypeError):
-            print(
-                f"⚠️ Parámetro inválido '{param_name}' en '{filter_name}', usando valor por defecto."
+            log.warning(
+                "Parámetro inválido '%s' en '%s', usando valor por defecto.",
+                param_name,
+                filter_name,
             )
             value = param_info.get("default")
 
@@ -73,7 +82,9 @@ def validate_filter_params(filter_name: str, params: dict) -> dict:
     # Undefined parameters warning
     for key in params:
         if key not in param_defs:
-            print(f"⚠️ Parámetro '{key}' no reconocido para el filtro '{filter_name}'.")
+            log.warning(
+                "Parámetro '%s' no reconocido para el filtro '%s'.", key, filter_name
+            )
 
     # Extended validation if applies
     if filter_name in EXTENDED_VALIDATORS:
@@ -0,0 +1,205 @@
+# processing/video_pipeline.py
+
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional
+import cv2
+import numpy as np
+from processing.image_processor import ImageProcessor
+
+# Frames que caben en cada cola entre hilos: absorben picos sin acumular
+# memoria (8 frames 1080p ~ 50 MB por cola).
+VIDEO_QUEUE_SIZE = 8
+_FOURCC_BY_EXTENSION = {".mp4": "mp4v", ".m4v": "mp4v", ".avi": "MJPG", ".mkv": "XVID"}
+_END = object()
+
+
+@dataclass
+class VideoStats:
+    """
+    Resumen de una ejecución: frames, tiempo total, tiempo ocupado por hilo y
+    tiempo de cada etapa compilada de la pipeline (dentro de "procesar").
+    """
+
+    frames: int = 0
+    elapsed_s: float = 0.0
+    busy_s: Dict[str, float] = field(
+        default_factory=lambda: {"decodificar": 0.0, "procesar": 0.0, "codificar": 0.0}
+    )
+    stage_s: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed_s if self.elapsed_s else 0.0
+
+    def summary(self) -> str:
+        per_frame = " | ".join(
+            f"{name} {1000.0 * busy / max(1, self.frames):.1f} ms/frame"
+            for name, busy in self.busy_s.items()
+        )
+        lines = [
+            f"{self.frames} frames en {self.elapsed_s:.1f} s ({self.fps:.1f} FPS) | "
+            f"{per_frame}"
+        ]
+        total = sum(self.stage_s.values())
+        for name, busy in sorted(self.stage_s.items(), key=lambda item: -item[1]):
+            lines.append(
+                f"  etapa {name}: {1000.0 * busy / max(1, self.frames):.2f} ms/frame "
+                f"({100.0 * busy / total if total else 0.0:.0f} %)"
+            )
+        return "\n".join(lines)
+
+
+class _Stage(threading.Thread):
+    """Hilo de una fase; guarda la excepción para relanzarla al terminar."""
+
+    def __init__(self, name, target, stop: threading.Event):
+        super().__init__(name=name, daemon=True)
+        self._target_fn = target
+        self._stop_event = stop
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        try:
+            self._target_fn()
+        except BaseException as e:
+            self.error = e
+            self._stop_event.set()
+
+
+def _put(q: queue.Queue, item, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _END
+
+
+def process_video(
+    input_path: str,
+    output_path: str,
+    processor: ImageProcessor,
+    live: bool = False,
+    queue_size: int = VIDEO_QUEUE_SIZE,
+    max_frames: Optional[int] = None,
+) -> VideoStats:
+    """
+    Procesa un vídeo con la pipeline de `processor` en tres hilos solapados
+    (decodificar -> procesar -> codificar) unidos por colas acotadas.
+
+    Por defecto cada frame se procesa con la calidad de process_still (sin
+    estado entre frames, vía process_batch); con live=True se usa la pipeline
+    en vivo (denoise temporal, optimizador con tolerancia), más rápida.
+    Lanza IOError si no se puede abrir la entrada o crear la salida.
+    """
+    capture = cv2.VideoCapture(input_path)
+    if not capture.isOpened():
+        raise IOError(f"No se pudo abrir el vídeo '{input_path}'.")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 30.0
+    extension = os.path.splitext(output_path)[1].lower()
+    fourcc = cv2.VideoWriter_fourcc(*_FOURCC_BY_EXTENSION.get(extension, "mp4v"))
+
+    stats = VideoStats()
+    previous_timings = processor.stage_timings
+    processor.set_stage_timings(stats.stage_s)
+    stop = threading.Event()
+    decoded: queue.Queue = queue.Queue(queue_size)
+    processed: queue.Queue = queue.Queue(queue_size)
+
+    def decode():
+        try:
+            while max_frames is None or stats.frames < max_frames:
+                start = time.perf_counter()
+                ok, frame = capture.read()
+                stats.busy_s["decodificar"] += time.perf_counter() - start
+                if not ok:
+                    break
+                stats.frames += 1
+                _put(decoded, frame, stop)
+                if stop.is_set():
+                    break
+        finally:
+            capture.release()
+            _put(decoded, _END, stop)
+
+    def incoming() -> Iterator[np.ndarray]:
+        while True:
+            frame = _get(decoded, stop)
+            if frame is _END:
+                return
+            yield frame
+
+    def process():
+        results = (
+            (processor.process_frame(frame) for frame in incoming())
+            if live
+            else processor.process_batch(incoming(), chunk_size=1, workers=1)
+        )
+        iterator = iter(results)
+        while True:
+            # Solo cuenta el trabajo: la espera en las colas va aparte.
+            waited = time.perf_counter()
+            try:
+                result = next(iterator)
+            except StopIteration:
+                break
+            stats.busy_s["procesar"] += time.perf_counter() - waited
+            _put(processed, result, stop)
+        _put(processed, _END, stop)
+
+    # Con el salto de frames estáticos el mismo frame puede ir varias veces
+    # en la cola: entonces no se devuelve al pool.
+    recycle = live and not processor.skip_static_frames
+
+    def encode():
+        writer = None
+        try:
+            while True:
+                frame = _get(processed, stop)
+                if frame is _END:
+                    break
+                start = time.perf_counter()
+                if writer is None:
+                    size = (frame.shape[1], frame.shape[0])
+                    writer = cv2.VideoWriter(
+                        output_path, fourcc, fps, size, isColor=frame.ndim == 3
+                    )
+                    if not writer.isOpened():
+                        raise IOError(f"No se pudo crear el vídeo '{output_path}'.")
+                writer.write(frame)
+                if recycle:
+                    processor.release_frame(frame)
+                stats.busy_s["codificar"] += time.perf_counter() - start
+        finally:
+            if writer is not None:
+                writer.release()
+
+    started = time.perf_counter()
+    threads = [
+        _Stage("decodificar", decode, stop),
+        _Stage("procesar", process, stop),
+        _Stage("codificar", encode, stop),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats.elapsed_s = time.perf_counter() - started
+    processor.set_stage_timings(previous_timings)
+    for thread in threads:
+        if thread.error is not None:
+            raise thread.error
+    return stats
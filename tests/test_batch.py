@@ -0,0 +1,75 @@
+# test_batch.py
+import numpy as np
+import pytest
+from processing.batch import process_batch, split_stackable
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+
+def stage(name, **params):
+    return {"name": name, "params": params}
+
+
+PIPELINE = [
+    stage("adjust_brightness_contrast", alpha=1.1, beta=4),
+    stage("sepia_tint", strength=0.4),
+    stage("adjust_saturation", factor=1.3),
+    stage("apply_gaussian_blur", ksize=5),
+    stage("invert_colors"),
+    stage("equalize_histogram"),
+]
+
+
+def make_stack(count=11, shape=(24, 32, 3)):
+    rng = np.random.default_rng(3)
+    return rng.integers(0, 256, size=(count,) + shape, dtype=np.uint8)
+
+
+def test_split_stackable_groups_per_pixel_stages():
+    stages = compile_pipeline(PIPELINE)
+    segments = split_stackable(stages)
+    assert [stackable for stackable, _ in segments] == [True, False, True, False]
+    assert [len(run) for _, run in segments] == [3, 1, 1, 1]
+
+
+@pytest.mark.parametrize("chunk_size, workers", [(1, 1), (4, 2), (16, 3)])
+def test_batch_matches_frame_by_frame(chunk_size, workers):
+    stages = compile_pipeline(PIPELINE)
+    stack = make_stack()
+    results = list(process_batch(stages, stack, chunk_size, workers))
+    assert len(results) == len(stack)
+    for frame, result in zip(stack, results):
+        np.testing.assert_array_equal(result, run_compiled(stages, frame.copy()))
+
+
+def test_generator_input_is_consumed_lazily_and_shapes_may_change():
+    stages = compile_pipeline([stage("convert_to_grayscale"), stage("invert_colors")])
+    consumed = []
+
+    def frames():
+        for i, frame in enumerate(make_stack(6)):
+            consumed.append(i)
+            yield frame
+        yield make_stack(1, (10, 12, 3))[0]
+
+    results = process_batch(stages, frames(), chunk_size=2, workers=1, prefetch=0)
+    first = next(results)
+    assert first.shape == (24, 32) and len(consumed) < 6
+    rest = list(results)
+    assert len(rest) == 6 and rest[-1].shape == (10, 12)
+
+
+def test_input_stack_is_never_returned():
+    stack = make_stack(3)
+    results = list(process_batch((), stack))
+    assert not any(np.shares_memory(result, stack) for result in results)
+    np.testing.assert_array_equal(np.stack(results), stack)
+
+
+def test_processor_process_batch_uses_still_pipeline():
+    processor = ImageProcessor()
+    processor.set_pipeline([dict(e, params=dict(e["params"])) for e in PIPELINE])
+    stack = make_stack(5)
+    results = list(processor.process_batch(stack, chunk_size=2))
+    for frame, result in zip(stack, results):
+        np.testing.assert_array_equal(result, processor.process_still(frame))
@@ -0,0 +1,47 @@
+# test_bokeh.py
+import cv2
+import numpy as np
+from processing import filters
+
+
+def make_image(shape=(120, 160, 3)):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def test_hard_edge_keeps_focus_and_blurs_background():
+    image = make_image()
+    out = filters.apply_bokeh_effect(image, 9, 0.5, 0.5, 0.2, feather=0.0)
+    blurred = cv2.GaussianBlur(image, (9, 9), 0)
+    # Centro del círculo: original; esquinas: fondo desenfocado (kernel pequeño,
+    # resolución completa).
+    np.testing.assert_array_equal(out[55:65, 75:85], image[55:65, 75:85])
+    np.testing.assert_array_equal(out[:10, :10], blurred[:10, :10])
+
+
+def test_feathered_edge_is_monotonic():
+    roi, w_focus, w_blur = filters._bokeh_mask((100, 100), (50, 50), 30, 10)
+    row = w_focus[w_focus.shape[0] // 2]
+    center = row.size // 2
+    assert row[center] == 1.0 and row[0] == 0.0
+    assert np.all(np.diff(row[center:]) <= 0)
+    np.testing.assert_allclose(w_focus + w_blur, 1.0)
+
+
+def test_mask_cached_and_input_untouched():
+    filters._bokeh_mask.cache_clear()
+    image = make_image()
+    before = image.copy()
+    for _ in range(3):
+        out = filters.apply_bokeh_effect(image, 41, 0.3, 0.6, 0.25)
+    assert out.shape == image.shape
+    np.testing.assert_array_equal(image, before)
+    info = filters._bokeh_mask.cache_info()
+    assert info.misses == 1 and info.hits == 2
+
+
+def test_circle_outside_frame_and_gray_input():
+    image = make_image()[:, :, 0].copy()
+    out = filters.apply_bokeh_effect(image, 5, 5.0, 5.0, 0.1)
+    np.testing.assert_array_equal(out, cv2.GaussianBlur(image, (5, 5), 0))
+    assert filters.apply_bokeh_effect(image, 21).shape == image.shape
@@ -0,0 +1,141 @@
+# test_buffer_pool.py
+import numpy as np
+import pytest
+from processing import filters
+from processing.buffer_pool import BufferPool
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+PIPELINE = [
+    {"name": "apply_gaussian_blur", "params": {"ksize": 5}},
+    {"name": "sepia_tint", "params": {"strength": 0.6}},
+    {"name": "apply_median_blur", "params": {"ksize": 3}},
+    {"name": "invert_colors", "params": {}},
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 4}},
+]
+
+
+def make_image(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+
+
+def make_processor():
+    processor = ImageProcessor()
+    processor.set_pipeline([dict(e, params=dict(e["params"])) for e in PIPELINE])
+    return processor
+
+
+def test_steady_state_does_not_allocate():
+    processor = make_processor()
+    for seed in range(3):
+        processor.release_frame(processor.process_frame(make_image(seed)))
+    warm = processor.buffer_pool.allocations
+    for seed in range(20):
+        processor.release_frame(processor.process_frame(make_image(seed)))
+    assert processor.buffer_pool.allocations == warm <= 3
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"name": "apply_gaussian_blur", "params": {"ksize": 31}},
+        {"name": "apply_median_blur", "params": {"ksize": 25}},
+        {"name": "bokeh_effect", "params": {"blur_strength": 31}},
+    ],
+)
+def test_unused_dst_goes_back_to_the_pool(entry):
+    processor = ImageProcessor()
+    processor.set_pipeline([entry, {"name": "invert_colors", "params": {}}])
+    for seed in range(3):
+        processor.release_frame(processor.process_frame(make_image(seed)))
+    warm = processor.buffer_pool.allocations
+    for seed in range(10):
+        processor.release_frame(processor.process_frame(make_image(seed)))
+    assert processor.buffer_pool.allocations == warm <= 3
+
+
+def test_frames_still_referenced_are_never_overwritten():
+    processor = make_processor()
+    kept, expected = [], []
+    for seed in range(6):
+        image = make_image(seed)
+        kept.append(processor.process_frame(image))
+        expected.append(run_compiled(compile_pipeline(PIPELINE), image.copy()))
+    for out, ref in zip(kept, expected):
+        np.testing.assert_array_equal(out, ref)
+    assert len({id(out) for out in kept}) == len(kept)
+
+
+def test_frames_seen_through_a_view_are_never_overwritten():
+    processor = make_processor()
+    image = make_image(7)
+    view = processor.process_frame(image)[8:24]  # p. ej. una QImage sin copia
+    expected = view.copy()
+    for seed in range(5):
+        processor.release_frame(processor.process_frame(make_image(seed)))
+    np.testing.assert_array_equal(view, expected)
+
+
+def test_inputs_kept_by_a_stage_are_not_recycled():
+    kept = []
+
+    def remember(image):
+        kept.append(image)  # sin FILTER_METADATA: puede guardar su entrada
+        return image
+
+    available = {n: info["function"] for n, info in filters.FILTER_METADATA.items()}
+    available["remember"] = remember
+    stages = compile_pipeline(
+        [{"name": "invert_colors"}, {"name": "remember"}, {"name": "invert_colors"}],
+        available,
+    )
+    assert stages[1].stateful
+    pool = BufferPool()
+    for seed in range(3):
+        image = make_image(seed)
+        out = run_compiled(stages, pool.copy_of(image), pool=pool, owns_input=True)
+        np.testing.assert_array_equal(out, image)
+    for seed, image in enumerate(kept):
+        np.testing.assert_array_equal(image, 255 - make_image(seed))
+
+
+def test_pool_reuses_only_released_buffers():
+    pool = BufferPool()
+    first = pool.acquire((4, 5, 3))
+    second = pool.acquire((4, 5, 3))
+    assert second is not first
+    del second
+    assert pool.acquire((4, 5, 3)) is not first
+    assert pool.allocations == 3
+    pool.release(first)
+    pool.release(first[1:])  # las vistas no se aceptan
+    pool.release(first)
+    assert pool.acquire((4, 5, 3)) is first
+    assert pool.acquire((4, 5, 3)) is not first
+    gray = pool.acquire((4, 5), np.uint8)
+    assert gray.shape == (4, 5) and pool.allocations == 5
+
+
+@pytest.mark.parametrize(
+    "name, params",
+    [
+        ("invert_colors", {}),
+        ("apply_gaussian_blur", {"ksize": 3}),
+        ("apply_median_blur", {"ksize": 3}),
+        ("adjust_brightness_contrast", {"alpha": 1.1, "beta": 3}),
+        ("sepia_tint", {}),
+        ("adjust_saturation", {"factor": 1.4}),
+        ("adjust_saturation", {"factor": 1.4, "preserve_hue": 0}),
+        ("equalize_histogram", {}),
+        ("bokeh_effect", {"blur_strength": 5}),
+    ],
+)
+def test_dst_contract(name, params):
+    image = make_image()
+    func = filters.FILTER_METADATA[name]["function"]
+    assert filters.FILTER_METADATA[name].get("supports_dst")
+    dst = np.empty_like(image)
+    out = func(image, dst=dst, **params)
+    assert out is dst
+    np.testing.assert_array_equal(out, func(image, **params))
@@ -0,0 +1,101 @@
+# test_channel_layout.py
+import cv2
+import numpy as np
+import pytest
+from processing.buffer_pool import BufferPool
+from processing.filters import FILTER_METADATA
+from processing.frame_context import FrameContext
+from processing.pipeline_compiler import _default_functions, compile_pipeline, run_compiled
+
+
+def make_image(channels=3):
+    rng = np.random.default_rng(3)
+    gray = cv2.GaussianBlur(rng.integers(0, 256, (60, 80), dtype=np.uint8), (5, 5), 0)
+    if channels == 1:
+        return gray
+    return rng.integers(0, 256, size=(60, 80, 3), dtype=np.uint8)
+
+
+def stage(name, **params):
+    return {"name": name, "params": params}
+
+
+PIPELINES = [
+    [
+        stage("apply_sobel_edge_detection", dx=1, dy=1),
+        stage("apply_gaussian_blur", ksize=5),
+        stage("apply_laplacian_sharpen", kernel_size=3, scale=0.5),
+        stage("invert_colors"),
+        stage("adjust_brightness_contrast", alpha=1.2, beta=3),
+    ],
+    [stage("apply_lowpass_fft", cutoff=0.2), stage("sepia_tint", strength=0.5)],
+    [stage("apply_laplacian_sharpen"), stage("adjust_saturation", factor=1.3)],
+    [stage("apply_highpass_fft", cutoff=0.05), stage("equalize_histogram")],
+    [stage("apply_sobel_edge_detection"), stage("apply_canny_edge_detection")],
+    [stage("apply_canny_edge_detection"), stage("apply_median_blur", ksize=3)],
+    [stage("apply_bandpass_fft", per_channel=1), stage("bokeh_effect", blur_strength=5)],
+    [stage("apply_sobel_edge_detection")],
+]
+
+
+@pytest.mark.parametrize("channels", [3, 1])
+@pytest.mark.parametrize("pipeline", PIPELINES)
+def test_layout_tracking_matches_legacy_output(pipeline, channels):
+    image = make_image(channels)
+    legacy = run_compiled(compile_pipeline(pipeline, track_layout=False), image.copy())
+    stages = compile_pipeline(pipeline)
+    tracked = run_compiled(stages, image.copy())
+    assert tracked.shape == legacy.shape
+    np.testing.assert_array_equal(tracked, legacy)
+
+    context = FrameContext(image.copy())
+    pooled = run_compiled(stages, context.image, context, BufferPool())
+    np.testing.assert_array_equal(pooled, legacy)
+    assert context.image is pooled
+
+
+def test_gray_chain_is_expanded_only_at_the_output():
+    seen = []
+    functions = dict(_default_functions())
+    blur = functions["apply_gaussian_blur"]
+
+    def spy(image, **params):
+        seen.append(image.shape)
+        return blur(image, **params)
+
+    functions["apply_gaussian_blur"] = spy
+    pipeline = [
+        stage("apply_sobel_edge_detection"),
+        stage("apply_gaussian_blur", ksize=3),
+        stage("sepia_tint"),
+        stage("apply_gaussian_blur", ksize=3),
+    ]
+    output = run_compiled(compile_pipeline(pipeline, functions), make_image())
+    assert seen == [(60, 80), (60, 80, 3)]
+    assert output.shape == (60, 80, 3)
+
+
+def test_final_gray_is_seeded_in_context():
+    context = FrameContext(make_image())
+    stages = compile_pipeline([stage("apply_sobel_edge_detection"), stage("invert_colors")])
+    output = run_compiled(stages, context.image, context)
+    assert output.ndim == 3
+    gray = context.gray()
+    np.testing.assert_array_equal(gray, output[:, :, 0])
+    assert context._derived[cv2.COLOR_BGR2GRAY] is gray
+
+
+@pytest.mark.parametrize(
+    "name", [n for n, info in FILTER_METADATA.items() if info.get("accepts_gray")]
+)
+def test_accepts_gray_contract(name):
+    gray = make_image(1)
+    func = FILTER_METADATA[name]["function"]
+    from_gray = func(gray.copy())
+    from_bgr = func(cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR))
+    if from_bgr.ndim == 3:
+        assert all(np.array_equal(from_bgr[..., 0], from_bgr[..., c]) for c in (1, 2))
+        from_bgr = from_bgr[..., 0]
+    if from_gray.ndim == 3:
+        from_gray = from_gray[..., 0]
+    np.testing.assert_array_equal(from_gray, from_bgr)
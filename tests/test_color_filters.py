@@ -0,0 +1,61 @@
+# test_color_filters.py
+import cv2
+import numpy as np
+import pytest
+from processing import filters
+
+
+def sepia_tint_float(image, strength):
+    """Implementación float32 anterior, como referencia."""
+    final_matrix = (1.0 - strength) * np.eye(3) + strength * filters._SEPIA_MATRIX
+    tinted = cv2.transform(image.astype(np.float32) / 255.0, final_matrix)
+    return (np.clip(tinted, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+def make_image():
+    rng = np.random.default_rng(2)
+    return rng.integers(0, 256, size=(64, 80, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("strength", [0.0, 0.25, 0.8, 1.0])
+def test_sepia_fixed_point_within_one_lsb(strength):
+    image = make_image()
+    fast = filters.sepia_tint(image, strength)
+    reference = sepia_tint_float(image, strength)
+    assert fast.dtype == np.uint8
+    assert np.abs(fast.astype(int) - reference).max() <= 1
+
+
+def test_sepia_zero_strength_is_identity_and_gray_input_expands():
+    image = make_image()
+    np.testing.assert_array_equal(filters.sepia_tint(image, 0.0), image)
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    assert filters.sepia_tint(gray, 0.5).shape == image.shape
+
+
+def adjust_saturation_split_merge(image, factor):
+    """Implementación anterior (split/merge en float64), como referencia."""
+    h, s, v = cv2.split(cv2.cvtColor(image, cv2.COLOR_BGR2HSV))
+    s = np.clip(s * factor, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(cv2.merge([h, s, v]), cv2.COLOR_HSV2BGR)
+
+
+@pytest.mark.parametrize("factor", [0.0, 0.5, 1.0, 1.37, 3.0])
+def test_saturation_lut_bit_identical(factor):
+    image = make_image()
+    np.testing.assert_array_equal(
+        filters.adjust_saturation(image, factor),
+        adjust_saturation_split_merge(image, factor),
+    )
+
+
+def test_saturation_matrix_preserves_luma():
+    image = make_image()
+    out = filters.adjust_saturation(image, 1.8, preserve_hue=0)
+    gray_in = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY).astype(int)
+    gray_out = cv2.cvtColor(out, cv2.COLOR_BGR2GRAY).astype(int)
+    # Solo difieren donde la saturación recorta algún canal.
+    unclipped = (out > 0).all(axis=2) & (out < 255).all(axis=2)
+    assert np.abs(gray_in - gray_out)[unclipped].max() <= 1
+    desaturated = filters.adjust_saturation(image, 0.0, preserve_hue=0)
+    assert np.abs(desaturated.astype(int).max(axis=2) - desaturated.min(axis=2)).max() <= 1
@@ -0,0 +1,124 @@
+# test_directory_batch.py
+import json
+import os
+import cv2
+import numpy as np
+import pytest
+import process_images
+from processing.directory_batch import (
+    MANIFEST_NAME,
+    find_images,
+    pipeline_digest,
+    process_directory,
+)
+
+INVERT = [{"name": "invert_colors", "params": {}}]
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "fotos"
+    (root / "sub").mkdir(parents=True)
+    rng = np.random.default_rng(0)
+    for name in ("a.png", "b.png", "sub/c.png"):
+        image = rng.integers(0, 256, (24, 32, 3), dtype=np.uint8)
+        cv2.imwrite(str(root / name), image)
+    (root / "notas.txt").write_text("no es una imagen")
+    return root
+
+
+def test_find_images_is_recursive_and_sorted(folder):
+    assert find_images(str(folder)) == ["a.png", "b.png", os.path.join("sub", "c.png")]
+
+
+def test_pipeline_digest_depends_on_params():
+    name = "adjust_brightness_contrast"
+    other = [{"name": name, "params": {"alpha": 1.0, "beta": 10}}]
+    changed = [{"name": name, "params": {"alpha": 1.0, "beta": 11}}]
+    assert pipeline_digest(INVERT) == pipeline_digest([dict(INVERT[0])])
+    assert pipeline_digest(other) != pipeline_digest(changed)
+
+
+def test_processes_every_image_and_logs(folder, tmp_path):
+    output, log = tmp_path / "salida", tmp_path / "lote.jsonl"
+    seen = []
+    counts = process_directory(
+        str(folder),
+        str(output),
+        INVERT,
+        workers=2,
+        files_per_task=1,
+        log_path=str(log),
+        progress=lambda done, total, record: seen.append((done, total)),
+    )
+    assert counts == {"ok": 3, "skipped": 0, "error": 0}
+    assert seen[-1] == (3, 3)
+    source = cv2.imread(str(folder / "sub" / "c.png"))
+    result = cv2.imread(str(output / "sub" / "c.png"))
+    assert np.array_equal(result, 255 - source)
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert sorted(r["file"] for r in records) == find_images(str(folder))
+    assert all(r["status"] == "ok" and r["ms"] >= 0 for r in records)
+
+
+@pytest.mark.parametrize("check", ["mtime", "hash"])
+def test_second_run_skips_up_to_date_outputs(folder, tmp_path, check):
+    output = tmp_path / "salida"
+    process_directory(str(folder), str(output), INVERT, workers=1, check=check)
+    assert (output / MANIFEST_NAME).exists()
+    image = cv2.imread(str(folder / "b.png"))
+    cv2.imwrite(str(folder / "b.png"), 255 - image)
+    os.utime(folder / "b.png", (1, 1))
+
+    counts = process_directory(str(folder), str(output), INVERT, workers=1, check=check)
+    assert counts == {"ok": 1, "skipped": 2, "error": 0}
+    assert np.array_equal(cv2.imread(str(output / "b.png")), image)
+
+
+def test_changed_pipeline_or_missing_output_reprocesses(folder, tmp_path):
+    output = tmp_path / "salida"
+    process_directory(str(folder), str(output), INVERT, workers=1)
+    (output / "a.png").unlink()
+    counts = process_directory(str(folder), str(output), INVERT, workers=1)
+    assert counts == {"ok": 1, "skipped": 2, "error": 0}
+
+    sepia = [{"name": "sepia_tint", "params": {}}]
+    counts = process_directory(str(folder), str(output), sepia, workers=1)
+    assert counts["ok"] == 3
+
+
+def test_output_inside_input_is_not_reprocessed(folder):
+    output = folder / "procesadas"
+    process_directory(str(folder), str(output), INVERT, workers=1)
+    expected = ["a.png", "b.png", os.path.join("sub", "c.png")]
+    assert find_images(str(folder), exclude=str(output)) == expected
+    assert len(find_images(str(folder))) == 6
+    counts = process_directory(str(folder), str(output), INVERT, workers=1)
+    assert counts == {"ok": 0, "skipped": 3, "error": 0}
+    assert not (output / "procesadas").exists()
+
+
+def test_invalid_pipeline_is_reported_per_file(folder, tmp_path):
+    graph = {"nodes": [{"id": "a", "name": "blend", "inputs": ["input"]}]}
+    counts = process_directory(str(folder), str(tmp_path / "salida"), graph, workers=1)
+    assert counts == {"ok": 0, "skipped": 0, "error": 3}
+
+
+def test_unreadable_image_is_reported_and_retried(folder, tmp_path):
+    (folder / "rota.png").write_bytes(b"no es un png")
+    output = tmp_path / "salida"
+    counts = process_directory(str(folder), str(output), INVERT, workers=1)
+    assert counts == {"ok": 3, "skipped": 0, "error": 1}
+    counts = process_directory(str(folder), str(output), INVERT, workers=1)
+    assert counts == {"ok": 0, "skipped": 3, "error": 1}
+
+
+def test_cli_converts_extension(folder, tmp_path, capsys):
+    output, pipeline = tmp_path / "salida", tmp_path / "pipeline.json"
+    pipeline.write_text(json.dumps(INVERT))
+    code = process_images.main(
+        [str(folder), str(output), "--pipeline", str(pipeline), "--ext", ".jpg"]
+    )
+    assert code == 0
+    assert (output / "sub" / "c.jpg").exists()
+    assert "3 procesadas" in capsys.readouterr().out
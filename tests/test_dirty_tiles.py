@@ -0,0 +1,97 @@
+# test_dirty_tiles.py
+import numpy as np
+from processing.dirty_tiles import DirtyTileRunner, pipeline_radius
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+
+def stage(name, **params):
+    return {"name": name, "params": params}
+
+
+LOCAL = [
+    stage("apply_gaussian_blur", ksize=9),
+    stage("apply_laplacian_sharpen"),
+    stage("sepia_tint", strength=0.5),
+    stage("adjust_brightness_contrast", alpha=1.2, beta=5),
+    stage("apply_median_blur", ksize=5),
+]
+
+
+def make_image(shape=(200, 330, 3), seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def test_radii_come_from_metadata():
+    stages = compile_pipeline(LOCAL)
+    assert [s.radius for s in stages] == [4, 1, 0, 0, 2]
+    assert pipeline_radius(stages) == 7
+    for name in ("apply_lowpass_fft", "equalize_histogram", "non_local_means_denoising"):
+        assert pipeline_radius(compile_pipeline(LOCAL + [stage(name)])) is None
+    pyramid = compile_pipeline([stage("apply_gaussian_blur", ksize=31)])
+    assert pipeline_radius(pyramid) is None
+
+
+def test_partial_change_matches_full_run_and_recomputes_few_tiles():
+    stages = compile_pipeline(LOCAL)
+    runner = DirtyTileRunner(tile_size=32)
+    frame = make_image()
+    first = runner.run(stages, frame)
+    np.testing.assert_array_equal(first, run_compiled(stages, frame.copy()))
+
+    for y, x in ((10, 20), (150, 300), (0, 0), (196, 326)):
+        frame = frame.copy()
+        frame[y : y + 4, x : x + 4] = 255 - frame[y : y + 4, x : x + 4]
+        out = runner.run(stages, frame)
+        np.testing.assert_array_equal(out, run_compiled(stages, frame.copy()))
+        assert runner.last_dirty_fraction < 0.5
+    assert runner.full_runs == 1 and runner.tiled_runs == 4
+    assert not out.flags.writeable
+
+
+def test_unchanged_frame_reuses_output_and_gray_pipelines_work():
+    stages = compile_pipeline(
+        [stage("apply_sobel_edge_detection"), stage("invert_colors")]
+    )
+    runner = DirtyTileRunner()
+    frame = make_image()
+    out = runner.run(stages, frame)
+    assert runner.run(stages, frame.copy()) is out
+    frame[50:60, 50:60] = 0
+    np.testing.assert_array_equal(
+        runner.run(stages, frame), run_compiled(stages, frame.copy())
+    )
+
+
+def test_non_local_pipeline_and_big_changes_run_full_frame():
+    runner = DirtyTileRunner()
+    frame = make_image()
+    stages = compile_pipeline([stage("equalize_histogram")])
+    runner.run(stages, frame)
+    runner.run(stages, frame)
+    assert runner.full_runs == 2 and runner.tiled_runs == 0
+
+    local = compile_pipeline(LOCAL)
+    runner.run(local, frame)
+    runner.run(local, make_image(seed=1))
+    assert runner.full_runs == 4
+
+
+def test_caller_frame_is_not_frozen():
+    runner = DirtyTileRunner()
+    frame = make_image()
+    out = runner.run((), frame)
+    assert frame.flags.writeable and not np.shares_memory(out, frame)
+
+
+def test_processor_tiled_mode():
+    processor = ImageProcessor()
+    processor.set_pipeline([dict(e, params=dict(e["params"])) for e in LOCAL])
+    processor.set_tiled_mode(True, tile_size=32)
+    frame = make_image()
+    processor.process_frame(frame)
+    frame[100:110, 100:110] = 7
+    out = processor.process_frame(frame)
+    assert processor.tile_runner.tiled_runs == 1
+    np.testing.assert_array_equal(out, run_compiled(processor._compiled, frame.copy()))
@@ -0,0 +1,109 @@
+# test_filter_capabilities.py
+import numpy as np
+import pytest
+from processing import filters
+from processing.filter_capabilities import (
+    CAPABILITY_SCHEMA,
+    cost_class,
+    validate_filter_metadata,
+)
+from processing.filters import FILTER_METADATA, estimate_filter_cost, filters_with
+from processing.image_processor import ImageProcessor
+
+
+def make_image():
+    rng = np.random.default_rng(5)
+    return rng.integers(0, 256, size=(40, 56, 3), dtype=np.uint8)
+
+
+def entry(**capabilities):
+    info = {"function": lambda image: image, "description": "", "params": {}}
+    info.update(capabilities)
+    return info
+
+
+def test_registered_filters_declare_every_capability_and_cost():
+    validate_filter_metadata(FILTER_METADATA)
+    for name in FILTER_METADATA:
+        caps = filters.get_filter_capabilities(name)
+        assert set(caps) == set(CAPABILITY_SCHEMA)
+        assert estimate_filter_cost(name) > 0
+    assert filters.get_filter_capabilities("filtro_inexistente") is None
+
+
+@pytest.mark.parametrize(
+    "info, message",
+    [
+        (entry(cost=1.0, suports_dst=True), "capacidad desconocida 'suports_dst'"),
+        (entry(cost=1.0, in_place="yes"), "'in_place' tiene un tipo no válido"),
+        (entry(), "falta 'cost'"),
+        (entry(cost=1.0, emits="rgb"), "'emits' debe ser uno de"),
+        (entry(cost=1.0, point_op=True), "también es 'color_only'"),
+        (entry(cost=1.0, in_place=True), "'in_place' requiere 'supports_dst'"),
+        (entry(cost=1.0, separable=True), "'separable' requiere 'linear'"),
+        (
+            entry(cost=1.0, point_op=True, color_only=True, radius=2),
+            "'point_op' tiene 'radius' 0",
+        ),
+        (
+            entry(cost=1.0, params={"k": {"type": "int_slider", "range": (1, 3, 1)}}),
+            "falta 'default'",
+        ),
+    ],
+)
+def test_validation_rejects_malformed_declarations(info, message):
+    with pytest.raises(ValueError, match=message):
+        validate_filter_metadata({"f": info})
+
+
+def test_cost_models_follow_parameters():
+    assert estimate_filter_cost(
+        "apply_median_blur", {"ksize": 9, "pyramid_threshold": 0}
+    ) > 10 * estimate_filter_cost(
+        "apply_median_blur", {"ksize": 9, "pyramid_threshold": 9}
+    )
+    nlm = {"realtime": 1}
+    assert estimate_filter_cost(
+        "non_local_means_denoising", nlm, live=True
+    ) < estimate_filter_cost("non_local_means_denoising", nlm) / 10
+    assert estimate_filter_cost("invert_colors", shape=(2160, 3840)) == pytest.approx(
+        4 * estimate_filter_cost("invert_colors", shape=(1080, 1920))
+    )
+    assert cost_class(0.5) == "bajo" and cost_class(5000) == "muy alto"
+
+
+def test_pipeline_cost_estimate():
+    processor = ImageProcessor()
+    processor.set_pipeline(
+        [
+            {"name": "invert_colors", "params": {}},
+            {"name": "apply_gaussian_blur", "params": {"ksize": 9}, "enabled": False},
+            {"name": "sepia_tint", "params": {}},
+        ]
+    )
+    expected = estimate_filter_cost("invert_colors") + estimate_filter_cost("sepia_tint")
+    assert processor.estimate_cost_ms() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("name", filters_with("in_place"))
+def test_in_place_contract(name):
+    image = make_image()
+    func = FILTER_METADATA[name]["function"]
+    expected = func(image.copy())
+    out = func(image, dst=image)
+    assert out is image
+    np.testing.assert_array_equal(out, expected)
+
+
+@pytest.mark.parametrize("name", filters_with("involutive"))
+def test_involutive_contract(name):
+    image = make_image()
+    func = FILTER_METADATA[name]["function"]
+    np.testing.assert_array_equal(func(func(image)), image)
+
+
+@pytest.mark.parametrize("name", filters_with("idempotent"))
+def test_idempotent_contract(name):
+    func = FILTER_METADATA[name]["function"]
+    once = func(make_image())
+    np.testing.assert_array_equal(func(once), once)
@@ -0,0 +1,74 @@
+# test_frame_context.py
+import cv2
+import numpy as np
+import pytest
+from processing.frame_context import FrameContext
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+
+def make_image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+
+
+def test_conversions_memoized_until_image_changes():
+    image = make_image()
+    context = FrameContext(image)
+    gray = context.gray()
+    assert context.gray() is gray
+    np.testing.assert_array_equal(gray, cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+    writable = context.convert(cv2.COLOR_BGR2HSV, writable=True)
+    assert writable is not context.hsv()
+    context.update(image.copy())
+    assert context.gray() is not gray
+
+
+def test_gray_to_bgr_output_seeds_exact_gray():
+    image = make_image()
+    stages = compile_pipeline([{"name": "apply_sobel_edge_detection", "params": {}}])
+    context = FrameContext(image)
+    out = run_compiled(stages, image, context)
+    assert context.image is out
+    assert cv2.COLOR_BGR2GRAY in context._derived
+    np.testing.assert_array_equal(context.gray(), cv2.cvtColor(out, cv2.COLOR_BGR2GRAY))
+
+
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        [
+            {"name": "apply_sobel_edge_detection", "params": {}},
+            {"name": "apply_canny_edge_detection", "params": {}},
+        ],
+        [
+            {"name": "apply_laplacian_sharpen", "params": {}},
+            {"name": "equalize_histogram", "params": {}},
+            {"name": "adjust_saturation", "params": {"factor": 1.7}},
+            {"name": "apply_lowpass_fft", "params": {"cutoff": 0.2}},
+            {"name": "convert_to_grayscale", "params": {}},
+        ],
+    ],
+)
+def test_results_identical_with_and_without_context(pipeline):
+    image = make_image()
+    stages = compile_pipeline(pipeline, fuse=False)
+    expected = run_compiled(stages, image.copy())
+    context = FrameContext(image.copy())
+    np.testing.assert_array_equal(run_compiled(stages, context.image, context), expected)
+
+
+def test_process_frame_context_matches_process_frame():
+    processor = ImageProcessor()
+    processor.set_pipeline(
+        [
+            {"name": "equalize_histogram", "params": {}},
+            {"name": "adjust_saturation", "params": {"factor": 1.2}},
+        ]
+    )
+    image = make_image()
+    context = processor.process_frame_context(image)
+    np.testing.assert_array_equal(context.image, processor.process_frame(image))
+    np.testing.assert_array_equal(
+        context.gray(), cv2.cvtColor(context.image, cv2.COLOR_BGR2GRAY)
+    )
@@ -0,0 +1,82 @@
+# test_frequency_filters.py
+import cv2
+import numpy as np
+import pytest
+from processing import filters
+from processing.frequency_filters import (
+    _lowpass_response,
+    frequency_mask,
+    optimal_dft_shape,
+)
+
+
+def make_image(shape=(48, 64, 3)):
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def lowpass_fft_reference(image, cutoff):
+    """Implementación anterior (fft2 compleja + fftshift + círculo por frame)."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    fshift = np.fft.fftshift(np.fft.fft2(gray))
+    rows, cols = gray.shape
+    mask = np.zeros_like(gray, dtype=np.uint8)
+    cv2.circle(mask, (cols // 2, rows // 2), int(min(rows, cols) * cutoff), 1, -1)
+    back = np.abs(np.fft.ifft2(np.fft.ifftshift(fshift * mask)))
+    return np.clip(back, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("shape", [(30, 40), (31, 45), (32, 27), (25, 25)])
+@pytest.mark.parametrize("kind", ["lowpass", "highpass", "bandpass"])
+@pytest.mark.parametrize("profile", ["ideal", "gaussian", "butterworth"])
+def test_packed_mask_matches_full_spectrum(shape, kind, profile):
+    rng = np.random.default_rng(1)
+    plane = (rng.random(shape) * 255).astype(np.float32)
+    mask = frequency_mask(shape, shape, kind, 0.21, 0.37, profile)
+    spectrum = cv2.dft(plane) * mask
+    got = cv2.dft(spectrum, flags=cv2.DFT_INVERSE | cv2.DFT_SCALE | cv2.DFT_REAL_OUTPUT)
+
+    rows, cols = shape
+    ky = np.minimum(np.arange(rows), rows - np.arange(rows))
+    kx = np.minimum(np.arange(cols), cols - np.arange(cols))
+    distance = np.hypot(ky[:, None], kx[None, :])
+    base = min(rows, cols)
+    low = _lowpass_response(distance, base * 0.21, profile)
+    full = {
+        "lowpass": low,
+        "highpass": 1.0 - low,
+        "bandpass": _lowpass_response(distance, base * 0.37, profile) * (1.0 - low),
+    }[kind]
+    expected = np.real(np.fft.ifft2(np.fft.fft2(plane) * full))
+    assert np.abs(got - expected).max() < 1e-2
+
+
+def test_lowpass_close_to_previous_implementation():
+    image = cv2.GaussianBlur(make_image((64, 80, 3)), (0, 0), 2)
+    out = filters.apply_lowpass_fft(image, cutoff=0.2)
+    assert out.shape == image.shape
+    diff = np.abs(out[:, :, 0].astype(int) - lowpass_fft_reference(image, 0.2))
+    # Solo cambian los bordes (relleno por reflexión en vez de envolvente).
+    assert diff[8:-8, 8:-8].mean() < 1.0
+
+
+def test_channel_handling():
+    image = make_image()
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    assert filters.apply_lowpass_fft(gray).ndim == 2
+    color = filters.apply_lowpass_fft(image, cutoff=0.3, per_channel=1)
+    assert color.shape == image.shape
+    for c in range(3):
+        np.testing.assert_array_equal(
+            color[:, :, c], filters.apply_lowpass_fft(image[:, :, c], cutoff=0.3)
+        )
+
+
+def test_mask_cached_per_geometry_and_params():
+    frequency_mask.cache_clear()
+    image = make_image((61, 97, 3))
+    for _ in range(3):
+        filters.apply_bandpass_fft(image, 0.05, 0.2, profile=2)
+    info = frequency_mask.cache_info()
+    assert info.misses == 1 and info.hits == 2
+    assert optimal_dft_shape(61, 97) == (64, 100)
@@ -0,0 +1,94 @@
+# test_logging_config.py
+import logging
+import numpy as np
+import pytest
+from config import logging_config
+from config.logging_config import RateLimitedLogger, RateLimiter, get_logger
+from processing.pipeline_compiler import CompiledStage, run_compiled
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate_limit_per_key_and_reports_suppressed():
+    clock = FakeClock()
+    limit = RateLimiter(interval=10.0, burst=2, clock=clock)
+    assert [limit.admit("a") for _ in range(5)] == [0, 0, None, None, None]
+    assert limit.admit("b") == 0
+    assert limit.suppressed == {"a": 3}
+
+    clock.now = 10.0
+    assert limit.admit("a") == 3
+    assert limit.admit("a") == 0
+
+
+def test_logger_keys_on_template_unless_given_a_key():
+    limit = RateLimiter(interval=10.0, burst=1, clock=FakeClock())
+    log = RateLimitedLogger(logging.getLogger("pdi.Test.claves"), limit)
+    for i in range(3):
+        log.warning("Error en '%s'", i)
+        log.warning("Error: %s", i, extra={"key": "b"})
+    assert limit.suppressed == {("pdi.Test.claves", "Error en '%s'"): 2, "b": 2}
+
+
+def test_info_without_key_is_not_rate_limited():
+    limit = RateLimiter(interval=10.0, burst=1, clock=FakeClock())
+    log = RateLimitedLogger(logging.getLogger("pdi.Test.info"), limit)
+    for name in ("a", "b", "c", "d"):
+        log.info("Filtro '%s' añadido.", name)
+    log.info("Frame %d", 1, extra={"key": "frames"})
+    log.info("Frame %d", 2, extra={"key": "frames"})
+    assert limit.suppressed == {"frames": 1}
+
+
+class Unprintable:
+    def __repr__(self):
+        raise AssertionError("no debería formatearse")
+
+    __str__ = __repr__
+
+
+def test_formatting_is_lazy_below_level():
+    log = get_logger("Test")
+    previous = logging.getLogger(logging_config.ROOT_LOGGER).level
+    logging_config.configure_logging("INFO")
+    try:
+        log.debug("Pipeline: %s", Unprintable())
+    finally:
+        logging_config.configure_logging(previous)
+
+
+def test_console_output_keeps_repo_format(capsys):
+    log = get_logger("Test")
+    log.info("hola %d", 1)
+    log.warning("aviso único %s", "x")
+    out = capsys.readouterr().out
+    assert "[Test] hola 1" in out and "[⚠️] aviso único x" in out
+
+
+@pytest.fixture
+def broken_stage():
+    def broken(image):
+        raise RuntimeError("roto")
+
+    return CompiledStage("roto", broken, {})
+
+
+def test_per_frame_filter_errors_are_rate_limited(broken_stage, capsys):
+    logging_config.configure_logging(interval=60.0, burst=3)
+    before = logging_config.suppressed_counts().get("roto", 0)
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    for _ in range(20):
+        np.testing.assert_array_equal(run_compiled((broken_stage,), frame), frame)
+    lines = [l for l in capsys.readouterr().out.splitlines() if "roto" in l]
+    assert len(lines) <= 3
+    assert logging_config.suppressed_counts()["roto"] - before >= 17
+    logging_config.configure_logging(
+        interval=logging_config.RATE_LIMIT_INTERVAL,
+        burst=logging_config.RATE_LIMIT_BURST,
+    )
@@ -0,0 +1,65 @@
+# test_lut3d.py
+import numpy as np
+from processing import filters
+from processing.lut3d import apply_lut3d, bake_lut3d, load_cube_file
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+
+def make_image():
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 256, size=(40, 50, 3), dtype=np.uint8)
+
+
+def test_identity_bake_is_lossless_within_one_level():
+    image = make_image()
+    table = bake_lut3d(lambda x: x, 17)
+    diff = np.abs(apply_lut3d(image, table).astype(int) - image)
+    assert diff.max() <= 1
+
+
+def test_baked_color_run_close_to_exact_chain():
+    pipeline = [
+        {"name": "sepia_tint", "params": {"strength": 0.6}},
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 1.1, "beta": 5}},
+        {"name": "invert_colors", "params": {}},
+    ]
+    image = make_image()
+    baked = compile_pipeline(pipeline, bake_luts=True)
+    assert len(baked) == 1 and baked[0].name.startswith("baked_lut3d(")
+    exact = run_compiled(compile_pipeline(pipeline), image)
+    diff = np.abs(run_compiled(baked, image).astype(int) - exact)
+    assert diff.max() <= 3
+
+
+def test_baked_run_ending_in_grayscale_and_gray_input_fallback():
+    pipeline = [
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 0}},
+        {"name": "convert_to_grayscale", "params": {}},
+    ]
+    stages = compile_pipeline(pipeline, bake_luts=True)
+    image = make_image()
+    assert run_compiled(stages, image).ndim == 2
+    gray = image[:, :, 0].copy()
+    np.testing.assert_array_equal(
+        run_compiled(stages, gray), run_compiled(compile_pipeline(pipeline), gray)
+    )
+
+
+def test_cube_file_roundtrip(tmp_path):
+    size = 5
+    grid = np.linspace(0.0, 1.0, size)
+    lines = ["TITLE \"swap\"", f"LUT_3D_SIZE {size}"]
+    for b in grid:
+        for g in grid:
+            for r in grid:
+                # Intercambia rojo y azul.
+                lines.append(f"{b:.6f} {g:.6f} {r:.6f}")
+    path = tmp_path / "swap.cube"
+    path.write_text("\n".join(lines))
+
+    assert load_cube_file(str(path)) is not None
+    image = make_image()
+    graded = filters.apply_cube_lut(image, lut_path=str(path))
+    diff = np.abs(graded.astype(int) - image[:, :, ::-1])
+    assert diff.max() <= 1
+    np.testing.assert_array_equal(filters.apply_cube_lut(image, lut_path=""), image)
@@ -0,0 +1,100 @@
+# test_parallel_strips.py
+import numpy as np
+import pytest
+from processing.buffer_pool import BufferPool
+from processing.frame_context import FrameContext
+from processing.image_processor import ImageProcessor
+from processing.parallel_strips import StripRunner
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+
+def stage(name, **params):
+    return {"name": name, "params": params}
+
+
+def make_image(shape=(301, 200, 3), seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=shape, dtype=np.uint8)
+
+
+@pytest.fixture
+def runner():
+    runner = StripRunner(workers=4, min_rows=16)
+    yield runner
+    runner.shutdown()
+
+
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        [stage("apply_gaussian_blur", ksize=7), stage("sepia_tint", strength=0.7)],
+        [stage("apply_laplacian_sharpen"), stage("apply_median_blur", ksize=5)],
+        [stage("apply_sobel_edge_detection", ksize=5), stage("invert_colors")],
+        [stage("convert_to_grayscale"), stage("apply_gaussian_blur", ksize=3)],
+    ],
+)
+def test_strips_match_a_single_pass(runner, pipeline):
+    stages = compile_pipeline(pipeline)
+    frame = make_image()
+    assert len(runner.strips(frame.shape[0], 8)) == 4
+    np.testing.assert_array_equal(
+        runner.run(stages, frame), run_compiled(stages, frame.copy())
+    )
+
+
+def test_strip_bounds_cover_the_frame(runner):
+    strips = runner.strips(301, 2)
+    assert strips[0][0] == 0 and strips[-1][1] == 301
+    assert all(a[1] == b[0] for a, b in zip(strips, strips[1:]))
+    # Con un halo grande las franjas serían demasiado finas: se reparten menos.
+    assert len(runner.strips(301, 30)) == 2
+    assert len(runner.strips(40, 2)) == 2
+
+
+def test_output_comes_from_the_pool_and_context_follows(runner):
+    stages = compile_pipeline([stage("apply_gaussian_blur", ksize=5)])
+    pool = BufferPool()
+    frame = make_image()
+    context = FrameContext(frame)
+    out = runner.run(stages, frame, context, pool)
+    assert pool.allocations == 1 and context.image is out
+
+
+@pytest.mark.parametrize(
+    "last", [stage("sepia_tint", strength=0.7), stage("invert_colors")]
+)
+def test_point_last_stage_writes_into_the_output(runner, last):
+    stages = compile_pipeline([stage("apply_gaussian_blur", ksize=5), last])
+    targets = []
+
+    def spy(image, dst=None, **params):
+        targets.append(dst)
+        return stages[-1].func(image, dst=dst, **params)
+
+    spied = stages[:-1] + (stages[-1]._replace(func=spy),)
+    frame = make_image()
+    out = runner.run(spied, frame)
+    np.testing.assert_array_equal(out, run_compiled(stages, frame.copy()))
+    assert len(targets) == 4
+    assert all(t is not None and np.shares_memory(t, out) for t in targets)
+
+
+def test_non_local_pipelines_run_whole(runner):
+    stages = compile_pipeline([stage("equalize_histogram")])
+    frame = make_image()
+    np.testing.assert_array_equal(
+        runner.run(stages, frame.copy()), run_compiled(stages, frame.copy())
+    )
+
+
+def test_processor_parallel_strips():
+    processor = ImageProcessor()
+    processor.set_pipeline([stage("apply_gaussian_blur", ksize=9)])
+    frame = make_image((480, 320, 3))
+    expected = processor.process_frame(frame)
+    processor.set_parallel_strips(True, workers=3)
+    try:
+        np.testing.assert_array_equal(processor.process_frame(frame), expected)
+    finally:
+        processor.set_parallel_strips(False)
+    assert processor.strip_runner is None
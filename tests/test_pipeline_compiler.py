@@ -0,0 +1,103 @@
+# test_pipeline_compiler.py
+import numpy as np
+import pytest
+from processing import pipeline_compiler
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+
+
+def make_image():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+
+
+PIPELINE = [
+    {"name": "invert_colors", "params": {}},
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.3, "beta": 5}},
+    {"name": "apply_gaussian_blur", "params": {"ksize": 5}, "enabled": False},
+    {"name": "filtro_inexistente", "params": {}},
+    {"name": "sepia_tint", "params": {"strength": 0.4}},
+]
+
+
+def test_compile_skips_disabled_and_unknown():
+    stages = compile_pipeline(PIPELINE, fuse=False)
+    assert [s.name for s in stages] == [
+        "invert_colors",
+        "adjust_brightness_contrast",
+        "sepia_tint",
+    ]
+    assert isinstance(stages, tuple)
+    with pytest.raises(TypeError):
+        stages[1].params["alpha"] = 2.0
+
+
+def test_validation_runs_once_per_compile(monkeypatch):
+    calls = []
+    original = pipeline_compiler.validate_filter_params
+
+    def counting(name, params):
+        calls.append(name)
+        return original(name, params)
+
+    monkeypatch.setattr(pipeline_compiler, "validate_filter_params", counting)
+    processor = ImageProcessor()
+    processor.set_pipeline([dict(e, params=dict(e["params"])) for e in PIPELINE])
+    compiled_calls = len(calls)
+    image = make_image()
+    for _ in range(5):
+        processor.process_frame(image)
+    assert len(calls) == compiled_calls == 3
+
+
+def test_compiled_matches_direct_calls():
+    image = make_image()
+    stages = compile_pipeline(PIPELINE)
+    expected = image
+    for stage in stages:
+        expected = stage.func(expected, **stage.params)
+    np.testing.assert_array_equal(run_compiled(stages, image), expected)
+
+
+@pytest.mark.parametrize(
+    "run, kind",
+    [
+        (
+            [
+                {"name": "invert_colors", "params": {}},
+                {"name": "adjust_brightness_contrast", "params": {"alpha": 1.5, "beta": 30}},
+            ],
+            "fused_affine(",
+        ),
+        (
+            [
+                {"name": "adjust_brightness_contrast", "params": {"alpha": 2.0, "beta": 0}},
+                {"name": "invert_colors", "params": {}},
+                {"name": "adjust_brightness_contrast", "params": {"alpha": 0.7, "beta": 9}},
+            ],
+            "fused_lut(",
+        ),
+    ],
+)
+def test_point_op_runs_fused_bit_identical(run, kind):
+    pipeline = run + [{"name": "apply_gaussian_blur", "params": {"ksize": 3}}]
+    fused = compile_pipeline(pipeline)
+    plain = compile_pipeline(pipeline, fuse=False)
+    assert len(fused) == 2
+    assert fused[0].name.startswith(kind)
+    for image in (make_image(), make_image()[:, :, 0].copy()):
+        np.testing.assert_array_equal(
+            run_compiled(fused, image), run_compiled(plain, image)
+        )
+
+
+def test_point_op_lut_cached_per_params():
+    pipeline_compiler._point_op_lut.cache_clear()
+    pipeline = [
+        {"name": "invert_colors", "params": {}},
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 1.1, "beta": 3}},
+    ]
+    compile_pipeline(pipeline)
+    compile_pipeline(pipeline)
+    info = pipeline_compiler._point_op_lut.cache_info()
+    assert info.misses == 2 and info.hits == 2
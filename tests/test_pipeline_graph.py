@@ -0,0 +1,183 @@
+# test_pipeline_graph.py
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.pipeline_graph import (
+    GraphBlend,
+    GraphRunner,
+    GraphSegment,
+    blend_images,
+    compile_graph,
+    run_graph,
+)
+from processing.predefined_pipelines import resolve_pipeline
+
+LINEAR = [
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.2, "beta": 10}},
+    {"name": "apply_gaussian_blur", "params": {"ksize": 5}},
+    {"name": "invert_colors", "params": {}},
+]
+
+EDGES_OVER_COLOR = {
+    "nodes": [
+        {"id": "sat", "name": "adjust_saturation", "params": {"factor": 1.6}},
+        {
+            "id": "bordes",
+            "name": "apply_canny_edge_detection",
+            "params": {"low_threshold": 50, "high_threshold": 150},
+            "inputs": ["input"],
+        },
+        {
+            "id": "out",
+            "name": "blend",
+            "inputs": ["sat", "bordes"],
+            "params": {"mode": "lighten", "alpha": 1.0},
+        },
+    ],
+    "output": "out",
+}
+
+
+def make_frame(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (48, 64, 3), dtype=np.uint8)
+
+
+def test_linear_pipeline_is_a_single_path_graph():
+    frame = make_frame()
+    graph = compile_graph(LINEAR)
+    assert len(graph.steps) == 1 and isinstance(graph.steps[0], GraphSegment)
+    expected = run_compiled(compile_pipeline(LINEAR), frame)
+    np.testing.assert_array_equal(run_graph(graph, frame), expected)
+
+
+def test_branches_match_between_threads_and_sequential():
+    frame = make_frame(1)
+    graph = compile_graph(EDGES_OVER_COLOR)
+    assert isinstance(graph.steps[-1], GraphBlend)
+    sequential = run_graph(graph, frame)
+    with ThreadPoolExecutor(3) as executor:
+        threaded = run_graph(graph, frame, executor)
+    np.testing.assert_array_equal(threaded, sequential)
+    saturated = run_compiled(compile_pipeline(EDGES_OVER_COLOR["nodes"][:1]), frame)
+    assert sequential.shape == frame.shape
+    assert np.all(sequential >= saturated)
+
+
+def test_common_prefix_is_computed_once():
+    prefix = [
+        {"name": "adjust_brightness_contrast", "params": {"alpha": 1.1, "beta": 5}},
+        {"name": "apply_gaussian_blur", "params": {"ksize": 5}},
+    ]
+    variant_a = {"name": "invert_colors", "params": {}}
+    variant_b = {"name": "convert_to_grayscale", "params": {}}
+    nodes = [
+        dict(prefix[0], id="a0", inputs=["input"]),
+        dict(prefix[1], id="a1", inputs=["a0"]),
+        dict(variant_a, id="a", inputs=["a1"]),
+        dict(prefix[0], id="b0", inputs=["input"]),
+        dict(prefix[1], id="b1", inputs=["b0"]),
+        dict(variant_b, id="b", inputs=["b1"]),
+    ]
+    graph = compile_graph({"nodes": nodes, "output": ["a", "b"]})
+    assert graph.shared == 2
+    assert len(graph.stages) < 6
+
+    frame = make_frame(2)
+    results = run_graph(graph, frame)
+    assert set(results) == {"a", "b"}
+    for name, variant in (("a", variant_a), ("b", variant_b)):
+        expected = run_compiled(compile_pipeline(prefix + [variant]), frame)
+        np.testing.assert_array_equal(results[name], expected)
+
+
+def test_output_never_aliases_the_input():
+    frame = make_frame()
+    graph = compile_graph([{"name": "invert_colors", "enabled": False}])
+    result = run_graph(graph, frame)
+    np.testing.assert_array_equal(result, frame)
+    assert not np.may_share_memory(result, frame)
+
+
+@pytest.mark.parametrize(
+    "config, message",
+    [
+        (
+            {
+                "nodes": [
+                    {"id": "a", "name": "invert_colors", "inputs": ["b"]},
+                    {"id": "b", "name": "invert_colors", "inputs": ["a"]},
+                ]
+            },
+            "ciclo",
+        ),
+        (
+            {"nodes": [{"id": "a", "name": "invert_colors", "inputs": ["x"]}]},
+            "inexistente",
+        ),
+        (
+            {
+                "nodes": [
+                    {"id": "a", "name": "invert_colors"},
+                    {
+                        "id": "b",
+                        "name": "blend",
+                        "inputs": ["input", "a"],
+                        "params": {"mode": "overlay"},
+                    },
+                ]
+            },
+            "modo de mezcla",
+        ),
+        (
+            {"nodes": [{"id": "a", "name": "blend", "inputs": ["input"]}]},
+            "2 entrada",
+        ),
+    ],
+)
+def test_invalid_graphs_are_rejected(config, message):
+    with pytest.raises(ValueError, match=message):
+        compile_graph(config)
+
+
+def test_blend_expands_gray_and_resizes():
+    base = make_frame()
+    layer = np.full((24, 32), 255, np.uint8)
+    result = blend_images(base, layer, "mix", 0.5)
+    assert result.shape == base.shape
+    np.testing.assert_allclose(result, base / 2 + 127.5, atol=1)
+
+
+def test_image_processor_runs_graphs():
+    processor = ImageProcessor()
+    processor.set_pipeline(LINEAR)
+    version = processor.pipeline_version
+    frame = make_frame(3)
+
+    processor.set_pipeline(EDGES_OVER_COLOR)
+    assert processor.pipeline_version == version + 1
+    expected = run_graph(compile_graph(EDGES_OVER_COLOR), frame)
+    context = processor.process_frame_context(frame)
+    np.testing.assert_array_equal(context.image, expected)
+    np.testing.assert_array_equal(processor.process_still(frame), expected)
+    assert processor.get_pipeline()["output"] == ["out"]
+
+    processor.add_filter("invert_colors")  # el editor lineal no toca grafos
+    assert processor.pipeline_version == version + 1
+
+    processor.set_pipeline({"nodes": [{"id": "a", "name": "blend"}]})
+    assert processor.pipeline_version == version + 1
+
+    processor.graph_runner = GraphRunner(workers=2)
+    runner = processor.graph_runner
+    np.testing.assert_array_equal(processor.process_frame(frame), expected)
+    processor.shutdown()
+    assert processor.graph_runner is None and runner._executor is None
+
+
+def test_presets_accept_graphs():
+    text = json.dumps(EDGES_OVER_COLOR)
+    assert resolve_pipeline(pipeline=text) == EDGES_OVER_COLOR
@@ -0,0 +1,200 @@
+# test_pipeline_optimizer.py
+import numpy as np
+import pytest
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.pipeline_optimizer import optimize_stages
+
+
+def make_image():
+    rng = np.random.default_rng(7)
+    return rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+
+
+def stage(name, **params):
+    return {"name": name, "params": params}
+
+
+def optimized(pipeline, tolerance=0, input_layout="bgr"):
+    stages = compile_pipeline(pipeline, fuse=False)
+    return optimize_stages(stages, tolerance, input_layout)
+
+
+def names(stages):
+    return [s.name for s in stages]
+
+
+@pytest.mark.parametrize(
+    "pipeline, kept, action",
+    [
+        (
+            [stage("adjust_brightness_contrast", alpha=1.0, beta=0), stage("invert_colors")],
+            ["invert_colors"],
+            "noop",
+        ),
+        ([stage("sepia_tint", strength=0.0), stage("invert_colors")], ["invert_colors"], "noop"),
+        ([stage("adjust_saturation", factor=1.0, preserve_hue=0)], [], "noop"),
+        ([stage("apply_gaussian_blur", ksize=1)], [], "noop"),
+        (
+            [stage("convert_to_grayscale"), stage("convert_to_grayscale")],
+            ["convert_to_grayscale"],
+            "duplicate",
+        ),
+        ([stage("invert_colors"), stage("invert_colors")], [], "involution"),
+        (
+            [stage("convert_to_grayscale"), stage("apply_canny_edge_detection")],
+            ["apply_canny_edge_detection"],
+            "dead",
+        ),
+    ],
+)
+def test_exact_rewrites(pipeline, kept, action):
+    stages, steps = optimized(pipeline)
+    assert names(stages) == kept
+    assert steps[0].action == action and steps[0].max_error == 0
+    image = make_image()
+    expected = run_compiled(compile_pipeline(pipeline, fuse=False), image.copy())
+    np.testing.assert_array_equal(run_compiled(stages, image.copy()), expected)
+
+
+def test_rewrites_cascade_until_nothing_is_left():
+    pipeline = [
+        stage("invert_colors"),
+        stage("sepia_tint", strength=0.0),
+        stage("invert_colors"),
+        stage("apply_median_blur", ksize=1),
+    ]
+    stages, steps = optimized(pipeline)
+    assert stages == ()
+    assert [s.action for s in steps] == ["noop", "involution", "noop"]
+
+
+@pytest.mark.parametrize(
+    "pipeline",
+    [
+        [stage("sepia_tint", strength=0.5), stage("convert_to_grayscale")],
+        [stage("adjust_saturation", factor=2.0, preserve_hue=0), stage("convert_to_grayscale")],
+        [stage("adjust_saturation", factor=0.5), stage("apply_sobel_edge_detection")],
+        [stage("convert_to_grayscale"), stage("apply_laplacian_sharpen")],
+        [stage("invert_colors"), stage("apply_gaussian_blur", ksize=3)],
+        [stage("adjust_saturation", factor=1.0)],
+    ],
+)
+def test_no_rewrite_without_a_declared_guarantee(pipeline):
+    stages, steps = optimized(pipeline)
+    assert steps == [] and len(stages) == len(pipeline)
+
+
+def test_approximate_rewrites_respect_the_tolerance():
+    image = make_image()
+    noop = [stage("adjust_saturation", factor=1.0, preserve_hue=1)]
+    assert optimized(noop, tolerance=5)[1] == []
+    stages, steps = optimized(noop, tolerance=6)
+    assert stages == () and steps[0].max_error == 6
+    exact = run_compiled(compile_pipeline(noop), image.copy())
+    assert np.abs(exact.astype(int) - image).max() <= 6
+
+    dead = [
+        stage("adjust_saturation", factor=0.5, preserve_hue=0),
+        stage("convert_to_grayscale"),
+    ]
+    assert optimized(dead)[1] == []
+    stages, steps = optimized(dead, tolerance=1)
+    assert names(stages) == ["convert_to_grayscale"] and steps[0].action == "dead"
+    exact = run_compiled(compile_pipeline(dead), image.copy())
+    fast = run_compiled(stages, image.copy())
+    assert np.abs(exact.astype(int) - fast).max() <= 1
+
+
+@pytest.mark.parametrize(
+    "following",
+    [
+        stage("adjust_brightness_contrast", alpha=3.0, beta=-100),
+        stage("apply_canny_edge_detection"),
+        stage("equalize_histogram"),
+    ],
+)
+def test_approximate_noop_is_kept_before_amplifying_stages(following):
+    pipeline = [stage("adjust_saturation", factor=1.0, preserve_hue=1), following]
+    stages, steps = optimized(pipeline, tolerance=8)
+    assert steps == [] and len(stages) == 2
+
+
+def test_tolerance_holds_at_the_pipeline_output():
+    image = make_image()
+    pipeline = [
+        stage("adjust_saturation", factor=1.0, preserve_hue=1),
+        stage("apply_gaussian_blur", ksize=5),
+        stage("adjust_brightness_contrast", alpha=1.25, beta=-10),
+        stage("adjust_saturation", factor=1.0, preserve_hue=1),
+        stage("adjust_brightness_contrast", alpha=1.2, beta=0),
+    ]
+    for tolerance in (8, 10, 16, 30):
+        stages, steps = optimized(pipeline, tolerance=tolerance)
+        total = sum(step.max_error for step in steps)
+        assert total <= tolerance
+        exact = run_compiled(compile_pipeline(pipeline, fuse=False), image.copy())
+        fast = run_compiled(stages, image.copy())
+        assert np.abs(exact.astype(int) - fast).max() <= total
+    # 6 * 1.25 * 1.2 -> 10 para la primera y 6 * 1.2 -> 8 para la segunda.
+    assert len(optimized(pipeline, tolerance=9)[1]) == 1
+    assert len(optimized(pipeline, tolerance=18)[1]) == 2
+
+
+def test_layout_changing_noop_is_kept_for_gray_input():
+    pipeline = [stage("sepia_tint", strength=0.0)]
+    assert optimized(pipeline, input_layout="gray")[0] != ()
+    assert optimized(pipeline, input_layout="bgr")[0] == ()
+
+
+def test_set_pipeline_optimizes_and_explains():
+    processor = ImageProcessor()
+    processor.set_pipeline(
+        [
+            stage("adjust_saturation", factor=1.0),
+            stage("convert_to_grayscale"),
+            stage("convert_to_grayscale"),
+        ]
+    )
+    lines = processor.explain_optimization()
+    assert len(lines) == 2 and "adjust_saturation" in lines[0]
+    assert processor.has_live_stages  # la reescritura de saturación es aproximada
+    image = make_image()
+    exact = run_compiled(compile_pipeline(processor.pipeline), image.copy())
+    np.testing.assert_array_equal(processor.process_still(image), exact)
+
+    processor.set_optimizer_tolerance(0)
+    assert len(processor.explain_optimization()) == 1
+    assert not processor.has_live_stages
+    processor.set_optimizer_tolerance(None)
+    assert processor.explain_optimization() == []
+
+
+CANDIDATES = [
+    stage("invert_colors"),
+    stage("adjust_brightness_contrast", alpha=1.0, beta=0),
+    stage("adjust_brightness_contrast", alpha=1.2, beta=5),
+    stage("sepia_tint", strength=0.0),
+    stage("sepia_tint", strength=0.7),
+    stage("adjust_saturation", factor=1.0, preserve_hue=0),
+    stage("adjust_saturation", factor=0.5, preserve_hue=0),
+    stage("convert_to_grayscale"),
+    stage("apply_canny_edge_detection"),
+    stage("apply_sobel_edge_detection"),
+    stage("apply_laplacian_sharpen"),
+    stage("apply_gaussian_blur", ksize=1),
+    stage("apply_lowpass_fft", cutoff=0.2),
+]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_pipelines_are_bit_identical_at_zero_tolerance(seed):
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(CANDIDATES), size=rng.integers(1, 6))
+    pipeline = [CANDIDATES[i] for i in picks]
+    image = make_image()
+    stages = compile_pipeline(pipeline)
+    expected = run_compiled(stages, image.copy())
+    fast = run_compiled(compile_pipeline(pipeline, tolerance=0), image.copy())
+    assert fast.shape == expected.shape
+    np.testing.assert_array_equal(fast, expected)
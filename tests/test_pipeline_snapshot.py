@@ -0,0 +1,96 @@
+# test_pipeline_snapshot.py
+import threading
+import numpy as np
+import pytest
+from processing.image_processor import ImageProcessor
+
+INVERT = [{"name": "invert_colors", "params": {}}]
+BRIGHTER = [
+    {"name": "adjust_brightness_contrast", "params": {"alpha": 1.0, "beta": 40}}
+]
+
+
+def make_frame(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 200, (48, 64, 3), dtype=np.uint8)
+
+
+def test_every_change_publishes_a_new_version():
+    processor = ImageProcessor()
+    assert processor.pipeline_version == 0
+    processor.set_pipeline(INVERT)
+    processor.add_filter("convert_to_grayscale")
+    processor.reorder_filter(0, 1)
+    processor.remove_filter(0)
+    assert processor.pipeline_version == 4
+    processor.remove_filter(5)  # fuera de rango: no publica nada
+    assert processor.pipeline_version == 4
+    assert [entry["name"] for entry in processor.pipeline] == ["invert_colors"]
+
+
+def test_snapshot_is_isolated_from_callers():
+    processor = ImageProcessor()
+    config = [{"name": "invert_colors", "params": {}}]
+    processor.set_pipeline(config)
+    snapshot = processor.snapshot()
+    config.append({"name": "convert_to_grayscale", "params": {}})
+    processor.get_pipeline()[0]["name"] = "convert_to_grayscale"
+    processor.add_filter("convert_to_grayscale")
+    assert [entry["name"] for entry in snapshot.pipeline] == ["invert_colors"]
+    assert len(snapshot.compiled) == 1
+    assert processor.snapshot() is not snapshot
+
+
+def test_published_entries_are_read_only():
+    processor = ImageProcessor()
+    processor.set_pipeline(BRIGHTER)
+    snapshot = processor.snapshot()
+    entry = processor.pipeline[0]
+    with pytest.raises(TypeError):
+        entry["params"]["beta"] = 0
+    with pytest.raises(TypeError):
+        snapshot.pipeline[0]["name"] = "invert_colors"
+    copy = processor.get_pipeline()
+    copy[0]["params"]["beta"] = 0
+    assert snapshot.pipeline[0]["params"]["beta"] == 40
+    assert copy[0]["params"]["beta"] == 0
+
+
+def test_frames_report_the_version_they_ran_with():
+    processor = ImageProcessor()
+    frame = make_frame()
+    processor.set_pipeline(INVERT)
+    context = processor.process_frame_context(frame)
+    assert context.pipeline_version == processor.pipeline_version
+    np.testing.assert_array_equal(context.image, 255 - frame)
+
+    processor.set_pipeline(BRIGHTER)
+    context = processor.process_frame_context(frame)
+    assert context.pipeline_version == processor.pipeline_version
+    np.testing.assert_array_equal(context.image, frame + 40)
+    np.testing.assert_array_equal(processor.process_still(frame), frame + 40)
+
+
+def test_concurrent_swaps_never_mix_versions():
+    processor = ImageProcessor()
+    processor.set_pipeline(INVERT)
+    configs = {processor.pipeline_version: 0}
+    frame = make_frame()
+    expected = (255 - frame, frame + 40)
+    done = threading.Event()
+
+    def writer():
+        for i in range(200):
+            processor.set_pipeline(BRIGHTER if i % 2 == 0 else INVERT)
+            configs[processor.pipeline_version] = (i + 1) % 2
+        done.set()
+
+    thread = threading.Thread(target=writer)
+    results = []
+    thread.start()
+    while not done.is_set() or len(results) < 20:
+        context = processor.process_frame_context(frame)
+        results.append((context.pipeline_version, context.image.copy()))
+    thread.join()
+    for version, image in results:
+        np.testing.assert_array_equal(image, expected[configs[version]])
@@ -0,0 +1,109 @@
+# test_process_pipeline.py
+import time
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import pytest
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.process_pipeline import ProcessPipeline, split_stage_groups
+
+
+def stage(name, **params):
+    return {"name": name, "params": params}
+
+
+PIPELINE = [
+    stage("apply_gaussian_blur", ksize=9),
+    stage("apply_laplacian_sharpen"),
+    stage("sepia_tint", strength=0.5),
+    stage("invert_colors"),
+]
+
+
+def frames(count, shape=(60, 80, 3)):
+    return [
+        np.random.default_rng(i).integers(0, 256, shape, dtype=np.uint8)
+        for i in range(count)
+    ]
+
+
+def collect(pipeline, inputs, deadline=60.0):
+    """Envía todos los frames (reintentando si la cadena está llena)."""
+    results, pending = [], list(enumerate(inputs))
+    start = time.monotonic()
+    while len(results) < len(inputs) and time.monotonic() - start < deadline:
+        if pending and pipeline.submit(pending[0][1], tag=pending[0][0]) is not None:
+            pending.pop(0)
+        results.extend(pipeline.results(timeout=0.01))
+    return results
+
+
+def test_split_balances_declared_cost():
+    groups = split_stage_groups(
+        [stage("non_local_means_denoising")] + PIPELINE, 2, live=False
+    )
+    assert [e["name"] for e in groups[0]] == ["non_local_means_denoising"]
+    assert len(groups[1]) == 4
+    few = split_stage_groups(PIPELINE[:1], 3)
+    assert len(few) == 3 and sum(len(g) for g in few) == 1
+
+
+def test_ordered_results_match_a_single_process():
+    inputs = frames(12)
+    with ProcessPipeline(PIPELINE, groups=2, max_in_flight=3) as pipeline:
+        results = collect(pipeline, inputs)
+        assert pipeline.in_flight == 0
+    stages = compile_pipeline(PIPELINE, live=True)
+    assert [tag for tag, _ in results] == list(range(12))
+    for tag, result in results:
+        np.testing.assert_array_equal(result, run_compiled(stages, inputs[tag].copy()))
+
+
+def test_in_flight_frames_are_bounded_and_memory_released():
+    pipeline = ProcessPipeline(PIPELINE, groups=2, max_in_flight=2)
+    inputs = frames(4)
+    accepted = [pipeline.submit(frame) for frame in inputs]
+    assert accepted[:2] == [0, 1] and accepted[2:] == [None, None]
+    assert pipeline.dropped == 2
+    names = [shm.name for shm in pipeline._slots]
+    pipeline.close()
+    assert not pipeline.running
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_pipeline_change_follows_queued_frames():
+    inputs = frames(2)
+    with ProcessPipeline(PIPELINE[:1], groups=2) as pipeline:
+        first = collect(pipeline, inputs[:1])
+        pipeline.set_pipeline([stage("convert_to_grayscale")])
+        second = collect(pipeline, inputs[1:])
+    assert first[0][1].ndim == 3
+    assert second[0][1].shape == inputs[1].shape[:2]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        [
+            stage("adjust_saturation", factor=1.0, preserve_hue=1),
+            stage("adjust_brightness_contrast", alpha=3.0, beta=0),
+        ],
+        [
+            stage("apply_canny_edge_detection"),
+            stage("non_local_means_denoising", realtime=0),
+            stage("sepia_tint", strength=0.0),
+        ],
+    ],
+)
+def test_groups_match_the_whole_pipeline_with_tolerance(config):
+    options = {"live": True, "tolerance": 8}
+    inputs = frames(2, (120, 160, 3))
+    with ProcessPipeline(config, groups=2, compile_options=options) as pipeline:
+        results = collect(pipeline, inputs)
+    stages = compile_pipeline(config, **options)
+    assert len(results) == 2
+    for tag, result in results:
+        expected = run_compiled(stages, inputs[tag].copy())
+        assert result.shape == expected.shape
+        np.testing.assert_array_equal(result, expected)
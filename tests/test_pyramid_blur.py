@@ -0,0 +1,75 @@
+# test_pyramid_blur.py
+import cv2
+import numpy as np
+import pytest
+from processing import filters
+from processing.validation import validate_filter_params
+
+
+def make_image(shape=(240, 320, 3)):
+    # Imagen suave con algo de ruido: el caso típico de una cámara.
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[0 : shape[0], 0 : shape[1]]
+    base = 128 + 60 * np.sin(xx / 17.0) * np.cos(yy / 23.0)
+    noise = rng.normal(0, 8, size=shape)
+    return np.clip(base[..., None] + noise, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("ksize", [21, 31, 51, 99])
+def test_pyramid_gaussian_close_to_exact(ksize):
+    image = make_image()
+    exact = cv2.GaussianBlur(image, (ksize, ksize), 0)
+    approx = filters.apply_gaussian_blur(image, ksize)
+    assert approx.shape == image.shape
+    assert np.abs(approx.astype(int) - exact).mean() < 1.0
+
+
+@pytest.mark.parametrize("ksize", [7, 15, 31])
+def test_pyramid_median_close_to_exact(ksize):
+    image = make_image()
+    exact = cv2.medianBlur(image, ksize)
+    approx = filters.apply_median_blur(image, ksize, pyramid_threshold=1)
+    assert approx.shape == image.shape
+    assert np.abs(approx.astype(int) - exact).mean() < 3.0
+
+
+def test_pyramid_median_removes_impulse_noise():
+    # Sal y pimienta al 10 %: la reducción no debe repartir los impulsos.
+    clean = make_image()
+    rng = np.random.default_rng(1)
+    mask = rng.random(clean.shape[:2])
+    noisy = clean.copy()
+    noisy[mask < 0.05] = 0
+    noisy[mask > 0.95] = 255
+    approx = filters.apply_median_blur(noisy, 21, pyramid_threshold=1)
+    assert np.abs(approx.astype(int) - cv2.medianBlur(clean, 21)).mean() < 2.0
+
+
+def test_threshold_zero_and_small_kernels_stay_exact():
+    image = make_image()
+    np.testing.assert_array_equal(
+        filters.apply_gaussian_blur(image, 51, pyramid_threshold=0),
+        cv2.GaussianBlur(image, (51, 51), 0),
+    )
+    for ksize in (5, 7, 15):
+        np.testing.assert_array_equal(
+            filters.apply_median_blur(image, ksize), cv2.medianBlur(image, ksize)
+        )
+    default = filters.apply_bokeh_effect(image, feather=0.0)
+    exact = cv2.GaussianBlur(image, (15, 15), 0)
+    outside = np.ones(image.shape[:2], bool)
+    outside[60:180, 100:220] = False
+    np.testing.assert_array_equal(default[outside], exact[outside])
+
+
+def test_odd_sizes_and_small_frames():
+    image = make_image((37, 53, 3))
+    assert filters.apply_gaussian_blur(image, 99).shape == image.shape
+    assert filters.apply_median_blur(image[:, :, 0].copy(), 31).shape == (37, 53)
+
+
+def test_threshold_is_a_stage_parameter():
+    params = validate_filter_params("apply_gaussian_blur", {"ksize": 31})
+    assert params["pyramid_threshold"] == filters.GAUSSIAN_PYRAMID_THRESHOLD
+    params = validate_filter_params("apply_median_blur", {"pyramid_threshold": 0})
+    assert params["pyramid_threshold"] == 0
@@ -0,0 +1,65 @@
+# test_scene_change.py
+import numpy as np
+from processing.image_processor import ImageProcessor
+from processing.scene_change import StaticSceneDetector
+
+
+def scene(shape=(120, 160, 3)):
+    yy, xx = np.mgrid[0 : shape[0], 0 : shape[1]]
+    base = 128 + 60 * np.sin(xx / 7.0) * np.cos(yy / 9.0)
+    return np.repeat(base[..., None], shape[2], axis=2).astype(np.uint8)
+
+
+def noisy(image, seed, sigma=4):
+    rng = np.random.default_rng(seed)
+    return np.clip(image + rng.normal(0, sigma, image.shape), 0, 255).astype(np.uint8)
+
+
+def test_sensor_noise_is_static_but_motion_is_not():
+    detector = StaticSceneDetector(settle_frames=2, width=40)
+    base = scene()
+    decisions = [detector.should_skip(noisy(base, seed)) for seed in range(6)]
+    assert decisions == [False, False, False, True, True, True]
+
+    moved = base.copy()
+    moved[40:60, 60:80] = 255 - moved[40:60, 60:80]  # objeto pequeño
+    assert not detector.should_skip(moved)
+    assert detector.skipped == 3
+
+
+def test_slow_drift_is_measured_against_last_processed_frame():
+    detector = StaticSceneDetector(settle_frames=0, width=40)
+    base = scene().astype(np.int16)
+    assert not detector.should_skip(base.astype(np.uint8))
+    skipped = [
+        detector.should_skip(np.clip(base + step, 0, 255).astype(np.uint8))
+        for step in range(1, 6)
+    ]
+    # Cada paso es de 1 nivel, pero la diferencia se acumula hasta superar 1.5.
+    assert skipped[0] and not all(skipped)
+
+
+def test_processor_reuses_context_and_resets_on_pipeline_change():
+    processor = ImageProcessor()
+    processor.set_pipeline([{"name": "apply_gaussian_blur", "params": {"ksize": 5}}])
+    processor.set_static_frame_skipping(True)
+    processor.scene_detector.settle_frames = 1
+    processor.scene_detector.width = 40
+    base = scene()
+    contexts = [processor.process_frame_context(noisy(base, s)) for s in range(5)]
+    assert contexts[3] is contexts[2] and contexts[4] is contexts[2]
+    assert processor.scene_detector.skipped == 2
+    assert processor.scene_detector.saved_ms >= 0
+    assert "2/5" in processor.scene_detector.summary()
+
+    processor.set_pipeline([{"name": "invert_colors", "params": {}}])
+    fresh = processor.process_frame_context(noisy(base, 9))
+    assert fresh is not contexts[2]
+
+
+def test_skipping_is_off_by_default():
+    processor = ImageProcessor()
+    frame = scene()
+    assert processor.process_frame_context(frame) is not processor.process_frame_context(
+        frame
+    )
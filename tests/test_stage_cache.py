@@ -0,0 +1,107 @@
+# test_stage_cache.py
+import numpy as np
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline, run_compiled
+from processing.stage_cache import StageCache, frame_fingerprint, prefix_keys
+
+
+def make_image(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+
+
+def stage(name, **params):
+    return {"name": name, "params": params}
+
+
+PIPELINE = [
+    stage("apply_median_blur", ksize=5),
+    stage("sepia_tint", strength=0.5),
+    stage("bokeh_effect", blur_strength=9),
+]
+
+
+def counting_processor(calls):
+    processor = ImageProcessor()
+    for name, func in list(processor.available_filters.items()):
+
+        def counted(image, __name=name, __func=func, **params):
+            calls.append(__name)
+            return __func(image, **params)
+
+        processor.available_filters[name] = counted
+    return processor
+
+
+def test_changing_stage_k_recomputes_only_k_to_n():
+    calls = []
+    processor = counting_processor(calls)
+    processor.set_pipeline([dict(e, params=dict(e["params"])) for e in PIPELINE])
+    image = make_image()
+    first = processor.process_still(image, frame_id=1)
+    assert calls == ["apply_median_blur", "sepia_tint", "bokeh_effect"]
+
+    calls.clear()
+    assert processor.process_still(image, frame_id=1) is first
+    assert calls == []
+
+    tuned = [dict(e, params=dict(e["params"])) for e in PIPELINE]
+    tuned[2]["params"]["blur_strength"] = 13
+    processor.set_pipeline(tuned)
+    result = processor.process_still(image, frame_id=1)
+    assert calls == ["bokeh_effect"]
+    expected = run_compiled(compile_pipeline(tuned), image.copy())
+    np.testing.assert_array_equal(result, expected)
+
+    calls.clear()
+    tuned[1]["params"]["strength"] = 0.9
+    processor.set_pipeline(tuned)
+    processor.process_still(image, frame_id=1)
+    assert calls == ["sepia_tint", "bokeh_effect"]
+
+    calls.clear()
+    processor.process_still(make_image(1), frame_id=2)
+    assert len(calls) == 3
+
+
+def test_prefix_keys_only_change_from_the_edited_stage():
+    base = compile_pipeline(PIPELINE, fuse=False)
+    edited = [dict(e, params=dict(e["params"])) for e in PIPELINE]
+    edited[1]["params"]["strength"] = 0.6
+    a, b = prefix_keys(base), prefix_keys(compile_pipeline(edited, fuse=False))
+    assert a[0] == b[0] and a[1] != b[1] and a[2] != b[2]
+
+
+def test_lru_budget():
+    cache = StageCache(max_bytes=3 * 1000)
+    arrays = [np.zeros(1000, dtype=np.uint8) for _ in range(4)]
+    for i, array in enumerate(arrays):
+        cache.put(("f", i), array)
+    assert cache.nbytes == 3000 and len(cache) == 3
+    assert cache.get(("f", 0)) is None
+    assert cache.get(("f", 1)) is arrays[1]
+    cache.put(("f", 4), np.zeros(1000, dtype=np.uint8))
+    assert cache.get(("f", 1)) is not None and cache.get(("f", 2)) is None
+    assert not arrays[1].flags.writeable
+    cache.put(("f", 5), np.zeros(5000, dtype=np.uint8))  # mayor que el presupuesto
+    assert cache.get(("f", 5)) is None
+    cache.set_budget(0)
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_callers_frame_is_never_frozen_or_shared():
+    processor = ImageProcessor()
+    processor.set_pipeline([stage("apply_cube_lut", lut_path="")])
+    image = make_image()
+    result = processor.process_still(image)
+    assert image.flags.writeable
+    assert not np.shares_memory(result, image)
+    np.testing.assert_array_equal(result, image)
+
+
+def test_fingerprint_depends_on_content():
+    image = make_image()
+    assert frame_fingerprint(image) == frame_fingerprint(image.copy())
+    other = image.copy()
+    other[0, 0, 0] ^= 1
+    assert frame_fingerprint(other) != frame_fingerprint(image)
@@ -0,0 +1,81 @@
+# test_temporal_denoise.py
+import cv2
+import numpy as np
+from processing import filters
+from processing.image_processor import ImageProcessor
+from processing.pipeline_compiler import compile_pipeline
+from processing.temporal_denoise import TemporalDenoiser
+
+NLM_PARAMS = {"h": 10, "h_color": 10, "template_window_size": 5, "search_window_size": 11}
+
+
+def clean_scene(shape=(72, 96, 3)):
+    yy, xx = np.mgrid[0 : shape[0], 0 : shape[1]]
+    base = 128 + 70 * np.sin(xx / 9.0) * np.cos(yy / 11.0)
+    return np.repeat(base[..., None], shape[2], axis=2).astype(np.uint8)
+
+
+def noisy(scene, seed):
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(0, 12, size=scene.shape)
+    return np.clip(scene + noise, 0, 255).astype(np.uint8)
+
+
+def error(image, scene):
+    return np.abs(image.astype(float) - scene).mean()
+
+
+def test_static_scene_converges_below_input_noise():
+    scene = clean_scene()
+    denoiser = TemporalDenoiser(filters.apply_denoising_nlm, asynchronous=False)
+    for seed in range(12):
+        frame = noisy(scene, seed)
+        out = denoiser(frame, **NLM_PARAMS, refresh_interval=5)
+    assert out.shape == frame.shape
+    assert error(out, scene) < 0.6 * error(frame, scene)
+
+
+def test_multi_frame_refresh_and_motion_compensation():
+    scene = clean_scene((72, 120, 3))
+    denoiser = TemporalDenoiser(filters.apply_denoising_nlm, asynchronous=False)
+    for step in range(10):
+        moved = np.roll(scene, 2 * step, axis=1)
+        out = denoiser(
+            noisy(moved, step), **NLM_PARAMS, refresh_interval=3, temporal_window=3
+        )
+    # La salida sigue al frame actual (no queda un fantasma de la posición
+    # inicial) y sigue estando más limpia que la entrada.
+    assert error(out[:, 24:-24], moved[:, 24:-24]) < error(
+        noisy(moved, 99)[:, 24:-24], moved[:, 24:-24]
+    )
+
+
+def test_async_refresh_does_not_block_and_resets_on_resize():
+    denoiser = TemporalDenoiser(filters.apply_denoising_nlm)
+    first = noisy(clean_scene(), 0)
+    np.testing.assert_array_equal(denoiser(first, **NLM_PARAMS), first)
+    denoiser.wait()
+    assert denoiser(noisy(clean_scene(), 1), **NLM_PARAMS).shape == first.shape
+    small = noisy(clean_scene((40, 48, 3)), 2)
+    np.testing.assert_array_equal(denoiser(small, **NLM_PARAMS), small)
+    denoiser.wait()
+
+
+def test_live_compile_only_for_live_pipelines():
+    pipeline = [{"name": "non_local_means_denoising", "params": dict(NLM_PARAMS)}]
+    live = compile_pipeline(pipeline, live=True)
+    still = compile_pipeline(pipeline)
+    assert isinstance(live[0].func, TemporalDenoiser)
+    assert still[0].func is filters.apply_denoising_nlm
+
+
+def test_process_still_uses_full_quality_path():
+    processor = ImageProcessor()
+    processor.set_pipeline(
+        [{"name": "non_local_means_denoising", "params": dict(NLM_PARAMS)}]
+    )
+    assert processor.has_live_stages
+    frame = noisy(clean_scene(), 3)
+    expected = cv2.fastNlMeansDenoisingColored(frame, None, 10, 10, 5, 11)
+    processor.process_frame(frame)
+    np.testing.assert_array_equal(processor.process_still(frame), expected)
@@ -0,0 +1,100 @@
+# test_video_pipeline.py
+import json
+import sys
+import cv2
+import numpy as np
+import pytest
+import process_video
+from processing.image_processor import ImageProcessor
+from processing.predefined_pipelines import resolve_pipeline
+from processing.video_pipeline import process_video as run_video
+
+
+def write_video(path, count=12, size=(64, 48)):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 25, size)
+    for i in range(count):
+        frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+        frame[:, : (i + 1) * 4] = (40, 120, 200)
+        writer.write(frame)
+    writer.release()
+
+
+def read_video(path):
+    capture = cv2.VideoCapture(str(path))
+    frames = []
+    while True:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(frame)
+    capture.release()
+    return frames
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "entrada.avi"
+    write_video(path)
+    return path
+
+
+def test_cli_applies_inline_pipeline(video, tmp_path):
+    output = tmp_path / "salida.avi"
+    pipeline = json.dumps([{"name": "invert_colors", "params": {}}])
+    assert process_video.main([str(video), str(output), "--pipeline", pipeline]) == 0
+    original, inverted = read_video(video), read_video(output)
+    assert len(inverted) == len(original) == 12
+    # MJPG tiene pérdidas: se compara la media.
+    assert abs(float(inverted[5].mean()) - (255 - float(original[5].mean()))) < 4
+    assert "PyQt6" not in sys.modules
+
+
+def test_presets_are_looked_up_in_file_then_predefined(tmp_path):
+    presets = tmp_path / "presets.json"
+    presets.write_text(json.dumps({"mio": [{"name": "invert_colors", "params": {}}]}))
+    mine = resolve_pipeline("mio", presets_file=str(presets))
+    assert mine[0]["name"] == "invert_colors"
+    sepia = resolve_pipeline("tono sepia", presets_file=str(presets))
+    assert sepia[0]["name"] == "sepia_tint"
+    with pytest.raises(ValueError):
+        resolve_pipeline("no existe", presets_file=str(presets))
+    with pytest.raises(ValueError):
+        resolve_pipeline(pipeline='{"name": "invert_colors"}')
+
+
+def test_stats_gray_output_and_live_mode(video, tmp_path):
+    processor = ImageProcessor()
+    processor.set_pipeline([{"name": "convert_to_grayscale", "params": {}}])
+    output = tmp_path / "gris.avi"
+    stats = run_video(str(video), str(output), processor, live=True, max_frames=7)
+    assert stats.frames == 7 and stats.fps > 0
+    assert set(stats.busy_s) == {"decodificar", "procesar", "codificar"}
+    assert "FPS" in stats.summary()
+    assert len(read_video(output)) == 7
+
+
+@pytest.mark.parametrize("live", [False, True])
+def test_stats_time_each_compiled_stage(video, tmp_path, live):
+    processor = ImageProcessor()
+    processor.set_pipeline(
+        [
+            {"name": "apply_gaussian_blur", "params": {"ksize": 5}},
+            {"name": "apply_canny_edge_detection", "params": {}},
+        ]
+    )
+    stats = run_video(str(video), str(tmp_path / "bordes.avi"), processor, live=live)
+    assert set(stats.stage_s) == {"apply_gaussian_blur", "apply_canny_edge_detection"}
+    assert all(seconds > 0 for seconds in stats.stage_s.values())
+    assert sum(stats.stage_s.values()) <= stats.busy_s["procesar"]
+    assert "etapa apply_canny_edge_detection" in stats.summary()
+    assert processor.stage_timings is None
+
+
+def test_errors_are_reported(video, tmp_path):
+    missing = tmp_path / "no_existe.avi"
+    args = [str(missing), str(tmp_path / "x.avi"), "--preset", "tono sepia"]
+    assert process_video.main(args) == 1
+    bad_output = tmp_path / "no" / "existe" / "x.avi"
+    processor = ImageProcessor()
+    with pytest.raises(IOError):
+        run_video(str(video), str(bad_output), processor)
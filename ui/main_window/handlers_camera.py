@@ -33,6 +33,13 @@ def _capture_frame(main_window):
     if frame is None:
         main_window.show_status_message("⚠️ No hay fotogramas para capturar.")
         return
+    processor = main_window.image_processor
+    if processor.has_live_stages and main_window.current_raw_frame is not None:
+        # Las etapas en vivo (p. ej. denoise temporal) priorizan la fluidez:
+        # la captura se reprocesa con la calidad completa.
+        frame = processor.process_still(
+            main_window.current_raw_frame, main_window.current_raw_frame_id
+        )
 
     timestamp = QDateTime.currentDateTime().toString("yyyyMMdd_hhmmsszzz")
     default_filename = f"capture_{timestamp}.png"
@@ -12,10 +12,16 @@ def setup_pipeline_handlers(main_window):
         lambda name, pipeline: _apply_preset(main_window, name, pipeline)
     )
     main_window.pipeline_manager.pipeline_updated.connect(
-        lambda config: main_window.image_processor.set_pipeline(config)
+        lambda config: _on_pipeline_updated(main_window, config)
     )
 
 
+def _on_pipeline_updated(main_window, config):
+    main_window.image_processor.set_pipeline(config)
+    main_window.sync_process_pipeline()
+    main_window.refresh_paused_frame()
+
+
 def _add_filter_to_pipeline(main_window, filter_name):
     main_window.pipeline_manager.add_filter_to_pipeline(filter_name)
     main_window.show_status_message(f"Filtro '{filter_name}' añadido.")
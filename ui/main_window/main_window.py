@@ -12,9 +12,17 @@ from ui.main_window.handlers_pipeline import setup_pipeline_handlers
 from ui.main_window.utils import convert_frame_to_qimage
 from setup_launcher import launch_setup_gui
 from ui.widgets.histogram_dockable_panel import HistogramDockablePanel
+from config.logging_config import get_logger, suppressed_summary
 from config.settings import SettingsManager
 from video_capture.camera_feed import CameraFeed
 from processing.image_processor import ImageProcessor
+from processing.process_pipeline_worker import ProcessPipelineWorker
+
+log = get_logger("MainWindow")
+
+# Salidas en vivo ya sustituidas en pantalla que se guardan a la espera de
+# que el histograma las suelte; las que sobran quedan para el recolector.
+_MAX_RETIRED_FRAMES = 4
 
 
 class MainWindow(QMainWindow):
@@ -29,8 +37,18 @@ class MainWindow(QMainWindow):
         self.camera_feed.start()
 
         self.image_processor = ImageProcessor()
+        self.image_processor.set_static_frame_skipping(True)
         self.camera_is_running = True
         self.current_processed_frame = None
+        self.current_raw_frame = None
+        # Identifica current_raw_frame en la caché de etapas del procesador.
+        self.current_raw_frame_id = 0
+        self._shown_context = None
+        # Salida en vivo mostrada (del BufferPool) y las anteriores aún en uso.
+        self._live_output = None
+        self._retired_frames = []
+        # Cadena de procesos por tramos (None = procesado en este hilo).
+        self.process_worker = None
 
         self.histogram_dock = HistogramDockablePanel(self.image_processor, self)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.histogram_dock)
@@ -57,10 +75,93 @@ class MainWindow(QMainWindow):
         self.refresh_all()
 
     def _on_frame_ready(self, frame):
-        self.current_processed_frame = self.image_processor.process_frame(frame)
-        qimage = convert_frame_to_qimage(self.current_processed_frame)
+        self.current_raw_frame = frame
+        self.current_raw_frame_id += 1
+        if self.process_worker is not None:
+            self.process_worker.enqueue_frame(frame)
+            return
+        context = self.image_processor.process_frame_context(frame)
+        if context is self._shown_context:
+            # Escena estática: la imagen, el histograma y el SSIM ya mostrados
+            # siguen valiendo.
+            return
+        self._shown_context = context
+        self._show_processed(frame, context.image, context)
+        previous, self._live_output = self._live_output, context.image
+        if previous is not None and previous is not context.image:
+            self._retired_frames.append(previous)
+        self._release_retired_frames()
+
+    def _release_retired_frames(self):
+        """
+        Devuelve al BufferPool las salidas en vivo ya sustituidas en pantalla
+        (QPixmap.fromImage copia los píxeles) que el histograma ya no usa.
+        """
+        panel = self.histogram_dock.panel
+        kept = []
+        for frame in self._retired_frames:
+            if panel.holds(frame):
+                kept.append(frame)
+            else:
+                self.image_processor.release_frame(frame)
+        self._retired_frames = kept[-_MAX_RETIRED_FRAMES:]
+
+    def _on_process_result(self, original, processed):
+        self._shown_context = None
+        self._show_processed(original, processed)
+
+    def set_process_pipeline(self, enabled: bool):
+        """
+        Activa el procesado en vivo por tramos en procesos separados (ver
+        processing/process_pipeline.py) o vuelve al de este hilo.
+        """
+        if self.process_worker is not None:
+            self.process_worker.stop()
+            self.process_worker = None
+        if not enabled:
+            return
+        processor = self.image_processor
+        if processor.snapshot().graph is not None:
+            self.show_status_message("⚠️ Los grafos no se reparten entre procesos.")
+            return
+        options = {
+            "live": True,
+            "tolerance": processor.optimizer_tolerance,
+            "bake_luts": processor.bake_color_luts,
+            "lut_size": processor.lut3d_size,
+        }
+        self.process_worker = ProcessPipelineWorker(
+            processor.get_pipeline(), compile_options=options, parent=self
+        )
+        self.process_worker.processed_frame_ready.connect(self._on_process_result)
+        self.process_worker.start()
+
+    def sync_process_pipeline(self):
+        """Lleva la pipeline actual a la cadena de procesos, si está activa."""
+        if self.process_worker is not None:
+            if self.image_processor.snapshot().graph is not None:
+                self.set_process_pipeline(False)
+                return
+            self.process_worker.set_pipeline_config(self.image_processor.get_pipeline())
+
+    def refresh_paused_frame(self):
+        """
+        Con la cámara en pausa, vuelve a procesar el último frame tras un
+        cambio en la pipeline. Usa la caché de etapas: mover un slider de la
+        etapa k solo recalcula k..n.
+        """
+        if self.camera_is_running or self.current_raw_frame is None:
+            return
+        processed = self.image_processor.process_still(
+            self.current_raw_frame, self.current_raw_frame_id
+        )
+        self._show_processed(self.current_raw_frame, processed)
+
+    def _show_processed(self, frame, processed, context=None):
+        self.current_processed_frame = processed
+        qimage = convert_frame_to_qimage(processed)
         self.video_label.setPixmap(QPixmap.fromImage(qimage))
-        self.histogram_dock.update_with_frame(frame, self.current_processed_frame)
+        self.histogram_dock.update_with_frame(frame, processed, context)
 
     def _build_status_bar(self):
         self.status_bar = self.statusBar()
@@ -91,12 +192,42 @@ class MainWindow(QMainWindow):
         )
         view_menu.addAction(toggle_histogram_action)
 
+        skip_static_action = QAction("Saltar frames sin cambios", self)
+        skip_static_action.setCheckable(True)
+        skip_static_action.setChecked(self.image_processor.skip_static_frames)
+        skip_static_action.toggled.connect(
+            self.image_processor.set_static_frame_skipping
+        )
+        view_menu.addAction(skip_static_action)
+        tiled_action = QAction("Recalcular solo teselas con cambios", self)
+        tiled_action.setCheckable(True)
+        tiled_action.setChecked(self.image_processor.tiled_mode)
+        tiled_action.toggled.connect(self.image_processor.set_tiled_mode)
+        view_menu.addAction(tiled_action)
+        strips_action = QAction("Procesar en franjas paralelas", self)
+        strips_action.setCheckable(True)
+        strips_action.setChecked(self.image_processor.strip_runner is not None)
+        strips_action.toggled.connect(self.image_processor.set_parallel_strips)
+        view_menu.addAction(strips_action)
+        processes_action = QAction("Procesar por tramos en varios procesos", self)
+        processes_action.setCheckable(True)
+        processes_action.toggled.connect(self.set_process_pipeline)
+        view_menu.addAction(processes_action)
+        static_stats_action = QAction("Estadísticas de escena estática", self)
+        static_stats_action.triggered.connect(
+            lambda: self.show_status_message(
+                self.image_processor.scene_detector.summary(), 10000
+            )
+        )
+        view_menu.addAction(static_stats_action)
+
     def _apply_preset_from_selector(self, name: str, pipeline: list):
         if not pipeline or not isinstance(pipeline, list):
             self.show_status_message(f"⚠️ Preset '{name}' inválido o vacío.")
             return
         self.pipeline_manager.set_pipeline_from_config(pipeline)
         self.image_processor.set_pipeline(pipeline)
+        self.sync_process_pipeline()
         self.show_status_message(f"✅ Preset '{name}' aplicado.")
 
     def _apply_pipeline_from_preview(self):
@@ -112,22 +243,32 @@ class MainWindow(QMainWindow):
     def refresh_all(self):
         self.preset_selector.refresh()
         self.favorites_tab.refresh()
-        self.pipeline_manager.set_pipeline_from_config(
-            self.image_processor.get_pipeline()
-        )
+        pipeline = self.image_processor.get_pipeline()
+        # El editor es lineal: de un grafo muestra sus nodos de filtro.
+        if isinstance(pipeline, dict):
+            pipeline = pipeline["nodes"]
+        self.pipeline_manager.set_pipeline_from_config(pipeline)
         self.show_status_message("🔄 Interfaz sincronizada.")
 
     def closeEvent(self, event):
         if hasattr(self, "camera_feed") and self.camera_feed.isRunning():
-            print("[MainWindow] 🔻 Deteniendo hilo de cámara...")
+            log.info("🔻 Deteniendo hilo de cámara...")
             self.camera_feed.stop()
             self.camera_feed.wait()
 
+        if getattr(self, "process_worker", None) is not None:
+            log.info("🔻 Deteniendo procesos de la pipeline...")
+            self.set_process_pipeline(False)
+
         if hasattr(self, "histogram_dock"):
             thread = getattr(self.histogram_dock.panel, "_active_thread", None)
             if thread and thread.isRunning():
-                print("[MainWindow] 🔻 Deteniendo hilo de histograma...")
+                log.info("🔻 Deteniendo hilo de histograma...")
                 thread.quit()
                 thread.wait()
 
+        # Hilos de franjas y de ramas de grafos: no deben sobrevivir a la ventana.
+        self.image_processor.shutdown()
+        log.info("%s", self.image_processor.scene_detector.summary())
+        log.info("Registro: %s", suppressed_summary())
         event.accept()
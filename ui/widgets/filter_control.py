@@ -11,10 +11,12 @@ from PyQt6.QtWidgets import (
     QDoubleSpinBox,
     QGroupBox,
     QMenu,
+    QLineEdit,
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPalette, QColor
-from processing.filters import FILTER_METADATA
+from processing.filter_capabilities import cost_class
+from processing.filters import FILTER_METADATA, estimate_filter_cost
 from processing.validation import validate_filter_params
 
 
@@ -43,6 +45,7 @@ class FilterControl(QGroupBox):
 
         self.param_widgets = {}
         self._build_param_controls()
+        self._update_cost_tooltip()
 
         # Botones de acción
         btn_layout = QHBoxLayout()
@@ -145,6 +148,15 @@ class FilterControl(QGroupBox):
                 row.addWidget(slider)
                 row.addWidget(spinbox)
                 self.param_widgets[param_name] = (slider, spinbox)
+            elif param_type == "text":
+                line_edit = QLineEdit(str(default or ""))
+                line_edit.editingFinished.connect(
+                    lambda p=param_name, le=line_edit: self._on_text_param_changed(
+                        p, le.text()
+                    )
+                )
+                row.addWidget(line_edit)
+                self.param_widgets[param_name] = (line_edit,)
             self.layout.addLayout(row)
 
     def _on_param_changed(self, param_name: str, value):
@@ -186,8 +198,27 @@ class FilterControl(QGroupBox):
             return
 
         self.current_params[param_name] = value
+        self._update_cost_tooltip()
         self.params_changed.emit(self.filter_name, self.current_params, self._index)
 
+    def _on_text_param_changed(self, param_name: str, value: str):
+        value = value.strip()
+        if self.current_params.get(param_name) == value:
+            return
+        self.current_params[param_name] = value
+        self._update_cost_tooltip()
+        self.params_changed.emit(self.filter_name, self.current_params, self._index)
+
+    def _update_cost_tooltip(self):
+        """Descripción del filtro y su coste estimado con los parámetros actuales."""
+        ms = estimate_filter_cost(self.filter_name, self.current_params, live=True)
+        megapixels = 1920 * 1080 / 1e6
+        self.setToolTip(
+            f"{self.filter_metadata.get('description', '')}\n"
+            f"Coste estimado: {ms:.1f} ms por frame 1080p"
+            f" ({cost_class(ms / megapixels)})"
+        )
+
     def _on_enabled_toggled(self, state):
         self.enabled_toggled.emit(
             self.filter_name, state == Qt.CheckState.Checked, self._index
@@ -20,5 +20,5 @@ class HistogramDockablePanel(QDockWidget):
         self.panel = HistogramPanel(image_processor)
         self.setWidget(self.panel)
 
-    def update_with_frame(self, original_frame, processed_frame):
-        self.panel.update_with_frame(original_frame, processed_frame)
+    def update_with_frame(self, original_frame, processed_frame, context=None):
+        self.panel.update_with_frame(original_frame, processed_frame, context)
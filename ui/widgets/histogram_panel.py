@@ -32,6 +32,7 @@ class HistogramPanel(QWidget):
         self.thread_pool = QThreadPool.globalInstance()
         self._pending_frame = None
         self._task_running = False
+        self._active_frame = None
 
         self._build_ui()
 
@@ -87,21 +88,37 @@ class HistogramPanel(QWidget):
         export_layout.addWidget(export_csv_btn)
         layout.addLayout(export_layout)
 
-    def update_with_frame(self, original_frame, processed_frame):
+    def update_with_frame(self, original_frame, processed_frame, context=None):
+        """
+        context: FrameContext opcional de processed_frame; si se pasa, el
+        histograma reutiliza el gris que ya calculó la pipeline.
+        """
         if not self.auto_update:
-            self._pending_frame = (original_frame, processed_frame)
+            self._pending_frame = (original_frame, processed_frame, context)
             return
 
         if self._task_running:
-            self._pending_frame = (original_frame, processed_frame)
+            self._pending_frame = (original_frame, processed_frame, context)
             return
 
-        self._start_task(original_frame, processed_frame)
+        self._start_task(original_frame, processed_frame, context)
 
-    def _start_task(self, original, processed):
+    def holds(self, frame) -> bool:
+        """Si la tarea en curso, la pendiente o la vista de diferencia usan frame."""
+        frames = [self.processed_frame, self._active_frame]
+        if self._pending_frame:
+            frames.append(self._pending_frame[1])
+        return any(held is frame for held in frames)
+
+    def _start_task(self, original, processed, context=None):
         self._task_running = True
+        self._active_frame = processed
         task = HistogramTask(
-            original, processed, self.histogram_mode, callback=self._on_task_finished
+            original,
+            processed,
+            self.histogram_mode,
+            callback=self._on_task_finished,
+            context=context,
         )
         self.status_label.setText("Estado: Procesando...")
         self.thread_pool.start(task)
@@ -114,11 +131,12 @@ class HistogramPanel(QWidget):
             f"SSIM: {metrics_dict['ssim']:.3f}, Δabs: {metrics_dict['diff']:.1f}"
         )
         self._task_running = False
+        self._active_frame = None
         self.status_label.setText("Estado: Listo")
         if self._pending_frame:
-            next_original, next_processed = self._pending_frame
+            next_original, next_processed, next_context = self._pending_frame
             self._pending_frame = None
-            self._start_task(next_original, next_processed)
+            self._start_task(next_original, next_processed, next_context)
         if self.diff_view_enabled:
             diff_img = np.abs(
                 self.original_frame.astype(np.int16)
@@ -131,9 +149,9 @@ class HistogramPanel(QWidget):
 
     def _manual_update(self):
         if self._pending_frame:
-            original, processed = self._pending_frame
+            original, processed, context = self._pending_frame
             self._pending_frame = None
-            self._start_task(original, processed)
+            self._start_task(original, processed, context)
         elif self.original_frame is not None and self.processed_frame is not None:
             self._start_task(self.original_frame, self.processed_frame)
 
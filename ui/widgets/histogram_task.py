@@ -10,11 +10,14 @@ class HistogramResult(QObject):
 
 
 class HistogramTask(QRunnable):
-    def __init__(self, original, processed, mode="grayscale", callback=None):
+    def __init__(
+        self, original, processed, mode="grayscale", callback=None, context=None
+    ):
         super().__init__()
         self.original = original
         self.processed = processed
         self.mode = mode
+        self.context = context
         self.callback = callback
         self.signals = HistogramResult()
         if callback:
@@ -23,7 +26,11 @@ class HistogramTask(QRunnable):
     def run(self):
         try:
             if self.mode == "grayscale":
-                gray = np.mean(self.processed, axis=2).astype(np.uint8)
+                if self.context is not None:
+                    # Gris memoizado por la pipeline (o calculado una vez aquí).
+                    gray = self.context.gray()
+                else:
+                    gray = np.mean(self.processed, axis=2).astype(np.uint8)
                 hist, _ = np.histogram(gray, bins=256, range=(0, 256))
             else:
                 hist = np.zeros((3, 256), dtype=int)
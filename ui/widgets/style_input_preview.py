@@ -25,6 +25,9 @@ class StyleInputPreview(QWidget):
         self.pipeline_generator = PipelineGenerator()
         self.pipeline = None
         self.prompt = ""
+        # Procesador propio: su caché de etapas reutiliza el prefijo común al
+        # probar varias pipelines sobre el mismo frame.
+        self.processor = ImageProcessor()
 
         self._build_ui()
 
@@ -93,8 +96,7 @@ class StyleInputPreview(QWidget):
             QMessageBox.warning(self, "Error", "No se pudo obtener el frame actual.")
             return
 
-        processor = ImageProcessor()
-        result_frame = processor.apply_custom_pipeline(latest_frame, self.pipeline)
+        result_frame = self.processor.apply_custom_pipeline(latest_frame, self.pipeline)
 
         # Guardar como preset
         preset_name = self.prompt.lower().replace(" ", "_")[:40]
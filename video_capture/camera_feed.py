@@ -3,6 +3,9 @@
 import cv2
 import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal, QMutex, QWaitCondition
+from config.logging_config import get_logger
+
+log = get_logger("CameraFeed")
 
 
 class CameraFeed(QThread):
@@ -29,14 +32,14 @@ class CameraFeed(QThread):
 
             cap = cv2.VideoCapture(self.camera_index)
             if not cap.isOpened():
-                print(
-                    f"[CameraFeed] ❌ No se pudo abrir la cámara {self.camera_index}. Reintentando..."
+                log.error(
+                    "No se pudo abrir la cámara %s. Reintentando...", self.camera_index
                 )
                 retry_count += 1
                 self.msleep(500)
                 continue
 
-            print(f"[CameraFeed] ✅ Cámara {self.camera_index} abierta correctamente.")
+            log.info("✅ Cámara %s abierta correctamente.", self.camera_index)
             retry_count = 0  # Reset if correctly opened
 
             while self._running:
@@ -49,9 +52,7 @@ class CameraFeed(QThread):
 
                 ret, frame = cap.read()
                 if not ret or frame is None:
-                    print(
-                        "[CameraFeed] ⚠️ Fallo al leer frame. Intentando reconectar..."
-                    )
+                    log.warning("Fallo al leer frame. Intentando reconectar...")
                     break
 
                 self._mutex.lock()
@@ -64,11 +65,10 @@ class CameraFeed(QThread):
             cap.release()
             self.msleep(100)
 
-        print(
-            "[CameraFeed] 🛑 Finalizado por máximo reintentos."
-            if retry_count >= self.max_retries
-            else "[CameraFeed] 🧩 Detenido por usuario."
-        )
+        if retry_count >= self.max_retries:
+            log.warning("🛑 Finalizado por máximo reintentos.")
+        else:
+            log.info("🧩 Detenido por usuario.")
 
     def stop(self):
         self._mutex.lock()
@@ -88,7 +88,7 @@ class CameraFeed(QThread):
         self._mutex.unlock()
 
     def switch_camera(self, new_index: int):
-        print(f"[CameraFeed] 🔄 Cambiando a cámara {new_index}")
+        log.info("🔄 Cambiando a cámara %s", new_index)
         self.pause()
         self.camera_index = new_index
         self.resume()
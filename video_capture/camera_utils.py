@@ -1,7 +1,9 @@
 # video_capture/camera_utils.py
 
 import cv2
-# import logging
+from config.logging_config import get_logger
+
+log = get_logger("CameraUtils")
 
 
 def list_available_cameras(
@@ -27,25 +29,23 @@ def list_available_cameras(
             )
             if not cap.isOpened():
                 if verbose:
-                    print(f"[CameraUtils] Cámara {index} no se pudo abrir.")
+                    log.info("Cámara %d no se pudo abrir.", index)
                 continue
 
             if require_frame:
                 ret, _ = cap.read()
                 if not ret:
                     if verbose:
-                        print(
-                            f"[CameraUtils] Cámara {index} abierta pero no devuelve frame."
-                        )
+                        log.info("Cámara %d abierta pero no devuelve frame.", index)
                     cap.release()
                     continue
 
             available.append(index)
             if verbose:
-                print(f"[CameraUtils] Cámara {index} disponible.")
+                log.info("Cámara %d disponible.", index)
             cap.release()
 
         except Exception as e:
-            print(f"[CameraUtils] ❌ Error probando cámara {index}: {str(e)}")
+            log.error("Error probando cámara %d: %s", index, e)
 
     return available